@@ -0,0 +1,58 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+import os
+import sys
+import time
+import json
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+import filemanager
+from worldmanager import WorldManager
+from benchworlds import build_world
+
+# Binary Format Benchmark
+# round trips worlds of growing size through json and binary saves
+# reporting save time, load time and file size
+# pass sizes in kilobytes to override the defaults, e.g. "1 1024"
+
+DEFAULT_SIZES_KB = [ 1, 1024, 50 * 1024 ]
+
+def round_trip(file_path, world):
+    start = time.perf_counter()
+    filemanager._write_object(file_path, world)
+    save_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    loaded = filemanager._read_object(file_path, WorldManager.World)
+    load_time = time.perf_counter() - start
+
+    if vars(loaded) != json.loads(json.dumps(vars(world))):
+        raise ValueError("round trip changed the world")
+    
+    return save_time, load_time, os.path.getsize(file_path)
+
+def main():
+    sizes = DEFAULT_SIZES_KB
+    if len(sys.argv) > 1:
+        sizes = [ int(size) for size in sys.argv[1:] ]
+
+    # no need to flush to disk when timing encoders
+    filemanager.set_durability(filemanager.DURABILITY_NONE)
+
+    print(f"{'world':>8} {'format':>7} {'save (ms)':>11} {'load (ms)':>11} {'size (bytes)':>14}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size_kb in sizes:
+            world = build_world(size_kb * 1024)
+            for save_format in filemanager.SAVE_FORMATS:
+                file_path = os.path.join(directory, "bench-save")
+                if save_format == filemanager.FORMAT_BINARY:
+                    file_path += filemanager.BINARY_EXTENSION
+                save_time, load_time, size = round_trip(file_path, world)
+                print(f"{size_kb:>6}KB {save_format:>7} {save_time * 1e3:>11.2f} {load_time * 1e3:>11.2f} {size:>14}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+import filemanager
+from worldmanager import WorldManager
+from benchworlds import build_world
+
+# Compression Benchmark
+# saves and loads one world with every compression method and level
+# reporting the compression ratio and the cpu time spent saving and loading
+# pass a world size in kilobytes to override the default
+
+DEFAULT_SIZE_KB = 4096
+SETTINGS = [ (filemanager.COMPRESSION_NONE, 0) ]
+SETTINGS += [ (filemanager.COMPRESSION_ZLIB, level) for level in [ 1, 3, 6, 9 ] ]
+SETTINGS += [ (filemanager.COMPRESSION_LZMA, level) for level in [ 0, 3, 6, 9 ] ]
+
+def main():
+    size_kb = DEFAULT_SIZE_KB
+    if len(sys.argv) > 1:
+        size_kb = int(sys.argv[1])
+    world = build_world(size_kb * 1024)
+
+    # no need to flush to disk when timing compressors
+    filemanager.set_durability(filemanager.DURABILITY_NONE)
+
+    print(f"world of about {size_kb}KB")
+    print(f"{'format':>7} {'method':>6} {'level':>6} {'ratio':>7} {'save cpu (ms)':>14} {'load cpu (ms)':>14} {'size (bytes)':>13}")
+    with tempfile.TemporaryDirectory() as project_root:
+        filemanager.PROJECT_ROOT = project_root
+        saves_path = os.path.join(project_root, filemanager.DATA_PATH, filemanager.SAVES_PATH)
+        os.makedirs(saves_path)
+        file_path = os.path.join(saves_path, "bench-save")
+
+        for save_format in filemanager.SAVE_FORMATS:
+            filemanager.set_save_format(save_format)
+            raw_size = None
+            for compression, level in SETTINGS:
+                filemanager.set_compression(compression, level)
+
+                start = time.process_time()
+                filemanager._write_object(file_path, world)
+                save_time = time.process_time() - start
+
+                start = time.process_time()
+                filemanager._read_object(file_path, WorldManager.World)
+                load_time = time.process_time() - start
+
+                size = os.path.getsize(file_path)
+                if raw_size == None:
+                    raw_size = size
+                print(f"{save_format:>7} {compression:>6} {level:>6} {raw_size / size:>7.2f} {save_time * 1e3:>14.1f} {load_time * 1e3:>14.1f} {size:>13}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+import filemanager
+
+# Durability Benchmark
+# measures write latency of each durability level, next to the old in place write
+# run it inside the data folder's file system to choose a setting for that disk
+
+WRITES = 100
+PAYLOAD_SIZES = [ 1024, 64 * 1024, 1024 * 1024 ]
+
+LEVEL_NAMES = {
+    filemanager.DURABILITY_NONE : "none",
+    filemanager.DURABILITY_FILE : "fsync file",
+    filemanager.DURABILITY_DIRECTORY : "fsync file+dir" }
+
+def write_in_place(file_path, chunks):
+    with open(file_path, 'wb') as file:
+        for chunk in chunks:
+            file.write(chunk)
+
+def time_writes(funct, file_path, data_bytes):
+    latencies = []
+    for i in range(WRITES):
+        start = time.perf_counter()
+        funct(file_path, data_bytes)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99) - 1]
+
+def main():
+    target_dir = sys.argv[1] if len(sys.argv) > 1 else None
+
+    print(f"{'payload':>10} {'level':>16} {'median (ms)':>12} {'p99 (ms)':>10}")
+    with tempfile.TemporaryDirectory(dir=target_dir) as directory:
+        file_path = os.path.join(directory, "bench-save")
+        for size in PAYLOAD_SIZES:
+            data_bytes = [ os.urandom(size) ]
+
+            median, p99 = time_writes(write_in_place, file_path, data_bytes)
+            print(f"{size:>10} {'in place (old)':>16} {median * 1e3:>12.3f} {p99 * 1e3:>10.3f}")
+
+            for level in filemanager.DURABILITY_LEVELS:
+                filemanager.set_durability(level)
+                median, p99 = time_writes(filemanager._write_atomic, file_path, data_bytes)
+                print(f"{size:>10} {LEVEL_NAMES[level]:>16} {median * 1e3:>12.3f} {p99 * 1e3:>10.3f}")
+
+if __name__ == '__main__':
+    main()
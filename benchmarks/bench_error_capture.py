@@ -0,0 +1,106 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+import os
+import sys
+import time
+import json
+import inspect
+import tempfile
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+import filemanager
+import errormanager
+
+# Error Capture Benchmark
+# per call cost of log_error, comparing the old eager capture
+# (inspect frame, f_locals lookup, datetime string, report string) with the structured error record
+# capture and writing are timed apart: the background writer is held back,
+# and each batch of errors is written once the error log would have woken it
+
+CALL_COUNT = 100000
+
+# the old capture, sending its report to a list so only capture is measured
+legacy_reports = []
+
+def legacy_log_error(exception_reported):
+    if isinstance(exception_reported, Exception) == False:
+        exception_reported = Exception("log-error requires an exception as input")
+
+    current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    caller_frame = inspect.currentframe().f_back
+
+    filename = caller_frame.f_code.co_filename
+    caller_class = caller_frame.f_locals.get('self', None).__class__.__name__
+    function_name = caller_frame.f_code.co_filename
+    line_number = caller_frame.f_lineno
+
+    source = f"{filename}/{caller_class}: {function_name} line {line_number}"
+
+    error_type = type(exception_reported).__name__
+
+    error_report = f"ERROR\nfrom source {source} at time {current_time}.\n"
+    error_report += f"Reported as {error_type}: {str(exception_reported)}.\n"
+
+    legacy_reports.append(error_report)
+
+class Handler():
+    def legacy_handle(self, index):
+        legacy_log_error(ValueError("handler fired in a loop"))
+
+    def handle(self, index):
+        errormanager.log_error(ValueError("handler fired in a loop"))
+
+    def handle_distinct(self, index):
+        errormanager.log_error(ValueError(f"handler fired on item {index}"))
+
+def time_calls(name, funct, write_funct):
+    capture = 0
+    write = 0
+    for batch_start in range(0, CALL_COUNT, errormanager.FLUSH_RECORDS):
+        start = time.perf_counter()
+        for index in range(batch_start, min(batch_start + errormanager.FLUSH_RECORDS, CALL_COUNT)):
+            funct(index)
+        capture += time.perf_counter() - start
+
+        start = time.perf_counter()
+        write_funct()
+        write += time.perf_counter() - start
+
+    capture /= CALL_COUNT
+    write /= CALL_COUNT
+
+    print(f"{name:>30}: {capture * 1e6:8.2f} us capture {write * 1e6:8.2f} us write {(capture + write) * 1e6:8.2f} us total")
+    return capture + write
+
+# writes the old reports as lines of json, the way a buffered log would
+def legacy_write():
+    log_path = os.path.join(filemanager.PROJECT_ROOT, filemanager.DATA_PATH, "legacy.log")
+    with open(log_path, 'ab') as file:
+        file.write("".join(json.dumps(error_report) + "\n" for error_report in legacy_reports).encode('utf-8'))
+    legacy_reports.clear()
+
+def main():
+    with tempfile.TemporaryDirectory() as project_root:
+        filemanager.PROJECT_ROOT = project_root
+        os.makedirs(os.path.join(project_root, filemanager.DATA_PATH))
+        errormanager.LOG_BACKUPS = 100
+        errormanager._error_log = errormanager.ErrorLog(flush_interval=3600, flush_records=CALL_COUNT + 1, max_pending=CALL_COUNT + 1)
+        handler = Handler()
+
+        legacy = time_calls("old capture", handler.legacy_handle, legacy_write)
+        repeated = time_calls("error record, repeated error", handler.handle, errormanager.flush_errors)
+        distinct = time_calls("error record, distinct errors", handler.handle_distinct, errormanager.flush_errors)
+
+        print(f"{'speedup, repeated':>30}: {legacy / repeated:8.1f}x")
+        print(f"{'speedup, distinct':>30}: {legacy / distinct:8.1f}x")
+
+        lines = sum(1 for record in errormanager.read_errors())
+        print(f"{'lines written':>30}: {lines} for {2 * CALL_COUNT} errors")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+import os
+import sys
+import json
+import time
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+import filemanager
+import errormanager
+
+# Error Log Benchmark
+# floods the error log from a tight loop, as a buggy handler would,
+# comparing one file open per error with the buffered error log
+
+FLOOD_SIZE = 100000
+LEGACY_SAMPLE = 5000 # one open per error is too slow to run the whole flood
+
+# the old add_log, with its file path fixed so it can run
+def legacy_add_log(error_report):
+    found_path = os.path.join(filemanager.PROJECT_ROOT, filemanager.DATA_PATH, "legacy.log")
+    json_bytes = json.dumps(error_report).encode('utf-8')
+    with open(found_path, 'ab') as file:
+        file.write(json_bytes)
+
+class Handler():
+    def legacy_handle(self):
+        error = ValueError("handler fired in a loop")
+        legacy_add_log(f"ERROR\nfrom source {__file__}/Handler: handle line 0.\nReported as ValueError: {error}.\n")
+
+    def handle(self):
+        errormanager.log_error(ValueError("handler fired in a loop"))
+
+def main():
+    with tempfile.TemporaryDirectory() as project_root:
+        filemanager.PROJECT_ROOT = project_root
+        os.makedirs(os.path.join(project_root, filemanager.DATA_PATH))
+        handler = Handler()
+
+        start = time.perf_counter()
+        for i in range(LEGACY_SAMPLE):
+            handler.legacy_handle()
+        legacy = (time.perf_counter() - start) / LEGACY_SAMPLE
+        print(f"{'file open per error':>24}: {legacy * 1e6:8.2f} us per error")
+
+        # written error logs are rotated, keep them all so the whole flood can be counted
+        errormanager.LOG_BACKUPS = 100
+        errormanager.MAX_PENDING_RECORDS = FLOOD_SIZE
+        start = time.perf_counter()
+        for i in range(FLOOD_SIZE):
+            handler.handle()
+        buffered = (time.perf_counter() - start) / FLOOD_SIZE
+        print(f"{'buffered error log':>24}: {buffered * 1e6:8.2f} us per error")
+
+        start = time.perf_counter()
+        errormanager.flush_errors()
+        print(f"{'final flush':>24}: {(time.perf_counter() - start) * 1000:8.2f} ms")
+        print(f"{'speedup':>24}: {legacy / buffered:8.1f}x")
+
+        start = time.perf_counter()
+        lines = 0
+        count = 0
+        for error_record in errormanager.read_errors():
+            lines += 1
+            count += error_record.count
+        print(f"{'stream back':>24}: {(time.perf_counter() - start) * 1000:8.2f} ms for {lines} lines holding {count} errors")
+
+if __name__ == '__main__':
+    main()
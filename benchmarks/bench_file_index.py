@@ -0,0 +1,73 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+import filemanager
+
+# File Index Benchmark
+# compares locate_file against a full os.walk per lookup
+# as the number of files in the saves folder grows
+
+SAVE_COUNTS = [ 10, 100, 1000, 5000 ]
+LOOKUPS = 200
+
+# the lookup locate_file used to perform on every call
+def walk_locate(file_name):
+    matches = []
+    for root, dirs, files in os.walk(filemanager.PROJECT_ROOT):
+        if filemanager.SOURCE_PATH in dirs:
+            dirs.remove(filemanager.SOURCE_PATH)
+        if file_name in files and file_name not in filemanager.FILE_DEPENDENCIES:
+            file_path = os.path.join(root, file_name)
+            if os.path.isfile(file_path):
+                matches.append(file_path)
+    if len(matches) != 1:
+        return None
+    return matches[0]
+
+# fill a fresh project root with save_count empty saves
+def build_tree(project_root, save_count):
+    saves_path = os.path.join(project_root, filemanager.DATA_PATH, filemanager.SAVES_PATH)
+    os.makedirs(saves_path)
+    names = []
+    for i in range(save_count):
+        name = f"player-{i}"
+        with open(os.path.join(saves_path, name), 'wb') as file:
+            file.write(b"{}")
+        names.append(name)
+    return names
+
+def time_lookups(funct, names, lookups):
+    step = max(1, len(names) // lookups)
+    targets = names[::step][:lookups]
+    start = time.perf_counter()
+    for name in targets:
+        funct(name)
+    return (time.perf_counter() - start) / len(targets)
+
+def main():
+    print(f"{'saves':>8} {'os.walk (us)':>14} {'index (us)':>12} {'rescan (ms)':>12}")
+    for save_count in SAVE_COUNTS:
+        with tempfile.TemporaryDirectory() as project_root:
+            filemanager.PROJECT_ROOT = project_root
+            names = build_tree(project_root, save_count)
+
+            start = time.perf_counter()
+            filemanager.rescan_files()
+            rescan_time = time.perf_counter() - start
+
+            # walking is slow, so fewer lookups are sampled on large trees
+            walk_time = time_lookups(walk_locate, names, max(5, LOOKUPS * 10 // save_count))
+            index_time = time_lookups(filemanager.locate_file, names, LOOKUPS)
+
+            print(f"{save_count:>8} {walk_time * 1e6:>14.1f} {index_time * 1e6:>12.2f} {rescan_time * 1e3:>12.2f}")
+
+if __name__ == '__main__':
+    main()
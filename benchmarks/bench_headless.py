@@ -0,0 +1,64 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+import filemanager
+import outputchannel
+import headless
+
+# Headless Benchmark
+# times how many commands a second a headless game plays
+# test/test_headless.py checks it shows the same text as a windowed one
+
+TIMED_ROUNDS = 2000
+
+# a game in a fresh copy of the project, so its saves and settings start over
+def fresh_root():
+    root = tempfile.mkdtemp()
+    source = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+    shutil.copytree(os.path.join(source, filemanager.SOURCE_PATH), os.path.join(root, filemanager.SOURCE_PATH))
+    shutil.copy(os.path.join(source, filemanager.MAIN_SHELL), root)
+    os.makedirs(os.path.join(root, filemanager.DATA_PATH, filemanager.SAVES_PATH))
+    filemanager.PROJECT_ROOT = root
+    filemanager.rescan_files()
+    return root
+
+def main():
+    root = fresh_root()
+    rounds = [ "look", "look box", "lok bx", "push cow", "help", "help box", "options", "back" ]
+    lines = [ "new", "bob", "yes" ] + rounds * TIMED_ROUNDS + [ "quit", "yes", "quit" ]
+    output = outputchannel.CapturedOutput()
+    token = outputchannel.set_output(output)
+    start = time.perf_counter()
+    headless.run_lines(lines)
+    elapsed = time.perf_counter() - start
+    outputchannel.reset_output(token)
+    shown = len(output.take_text())
+    shutil.rmtree(root)
+    print(f"{len(lines)} commands in {elapsed:.2f} s: {len(lines) / elapsed:10.0f} commands per second, {shown} characters shown")
+
+    # and the python api, one command at a time
+    root = fresh_root()
+    game = headless.HeadlessGame()
+    game.start()
+    for line in [ "new", "bob", "yes" ]:
+        game.send(line)
+    calls = len(rounds) * TIMED_ROUNDS // 4
+    start = time.perf_counter()
+    for call in range(calls):
+        game.send(rounds[call % len(rounds)])
+    elapsed = time.perf_counter() - start
+    game.close()
+    shutil.rmtree(root)
+    print(f"{calls} commands sent in {elapsed:.2f} s: {calls / elapsed:10.0f} commands per second")
+
+if __name__ == '__main__':
+    main()
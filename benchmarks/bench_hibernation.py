@@ -0,0 +1,158 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+import os
+import gc
+import sys
+import time
+import shutil
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+import filemanager
+import headless
+import hibernation
+
+# Hibernation Benchmark
+# checks games woken from hibernation carry on as if they never slept, then holds 10k idle sessions,
+# reporting the memory they take held in memory and hibernated, and how long a hibernating game takes to wake
+
+SESSIONS = 10000
+SAMPLES = 1000
+OPENING = [ "new", "bob", "yes", "push cow" ]
+SCRIPT = [ "look", "push cow", "options", "set welcome no", "back", "push cow", "look cow", "help push",
+    "quit", "no", "push cow", "options", "set welcome yes", "back", "quit", "yes", "look", "quit" ]
+
+def fresh_root():
+    root = tempfile.mkdtemp()
+    source = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+    shutil.copytree(os.path.join(source, filemanager.SOURCE_PATH), os.path.join(root, filemanager.SOURCE_PATH))
+    shutil.copy(os.path.join(source, filemanager.MAIN_SHELL), root)
+    os.makedirs(os.path.join(root, filemanager.DATA_PATH, filemanager.SAVES_PATH))
+    filemanager.PROJECT_ROOT = root
+    filemanager.rescan_files()
+    return root
+
+def headless_turns(lines):
+    game = headless.HeadlessGame()
+    turns = [ game.start() ]
+    for line in lines:
+        turns.append(game.send(line))
+    game.close()
+    return turns
+
+# resident set size of this process in bytes
+def resident_bytes():
+    with open("/proc/self/statm", "r") as file:
+        return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+def folder_bytes(path):
+    total = 0
+    for root, dirs, files in os.walk(path):
+        for file_name in files:
+            total += os.path.getsize(os.path.join(root, file_name))
+    return total
+
+def percentile(times, fraction):
+    times = sorted(times)
+    return times[min(len(times) - 1, int(len(times) * fraction))]
+
+def check_hibernation():
+    headless_turns([]) # the first game is welcomed differently
+    expected = headless_turns(OPENING + SCRIPT)
+
+    # with room for one game, playing two in turn hibernates each between its commands
+    store = hibernation.SessionStore(max_resident=1)
+    shown = { "first" : [ store.start("first") ], "second" : [ store.start("second") ] }
+    for line in OPENING + SCRIPT:
+        for session_id in shown.keys():
+            shown[session_id].append(store.send(session_id, line))
+    for turns in shown.values():
+        if turns != expected:
+            raise AssertionError("a game woken from hibernation showed different text from one that never slept")
+    if store.restores < len(OPENING + SCRIPT):
+        raise AssertionError("games were not hibernated past the resident limit")
+    store.close_all()
+
+    # games idle past the timeout hibernate, except one partway through a question
+    clock = [ 0.0 ]
+    store = hibernation.SessionStore(idle_timeout=60.0, clock=lambda: clock[0])
+    for session_id in [ "idle", "asking", "recent" ]:
+        store.start(session_id)
+        for line in OPENING:
+            store.send(session_id, line)
+    store.send("asking", "quit")
+    clock[0] = 30.0
+    store.send("recent", "look")
+    clock[0] = 61.0
+    if store.hibernate_idle() != [ "idle" ] or store.is_resident("asking") == False or store.is_resident("recent") == False:
+        raise AssertionError("the wrong games hibernated when idle")
+    if store.send("idle", "look") != expected[len(OPENING) + 1]:
+        raise AssertionError("an idle game woke up somewhere else")
+    store.close_all()
+    print(f"games woken from hibernation show the same text over {len(OPENING + SCRIPT)} commands, and only idle games hibernate")
+
+def measure_sessions():
+    print(f"{SESSIONS} idle sessions, each {len(OPENING)} commands into a game")
+    gc.collect()
+    tracemalloc.start()
+    base_traced = tracemalloc.get_traced_memory()[0]
+    base_resident = resident_bytes()
+
+    store = hibernation.SessionStore(max_resident=SESSIONS, idle_timeout=hibernation.IDLE_TIMEOUT)
+    session_ids = [ f"session {number}" for number in range(SESSIONS) ]
+    for session_id in session_ids:
+        store.start(session_id)
+        for line in OPENING:
+            store.send(session_id, line)
+    gc.collect()
+    awake_traced = tracemalloc.get_traced_memory()[0] - base_traced
+    awake_resident = resident_bytes() - base_resident
+
+    start = time.perf_counter()
+    store.idle_timeout = 0.0
+    hibernated = len(store.hibernate_idle())
+    elapsed = time.perf_counter() - start
+    store.idle_timeout = hibernation.IDLE_TIMEOUT
+    gc.collect()
+    asleep_traced = tracemalloc.get_traced_memory()[0] - base_traced
+    asleep_resident = resident_bytes() - base_resident
+    tracemalloc.stop()
+
+    spill_bytes = folder_bytes(os.path.join(filemanager.PROJECT_ROOT, filemanager.DATA_PATH, filemanager.SESSIONS_PATH))
+    if hibernated != SESSIONS or store.resident_count() != 0:
+        raise AssertionError("idle sessions were left in memory")
+
+    print(f"{'held in memory':>16}: {awake_traced / SESSIONS:8.0f} bytes allocated per session, {awake_resident / 2 ** 20:7.1f} MiB resident")
+    print(f"{'hibernated':>16}: {asleep_traced / SESSIONS:8.0f} bytes allocated per session, {asleep_resident / 2 ** 20:7.1f} MiB resident"
+        + f" (the allocator keeps some freed pages), {spill_bytes / SESSIONS:6.0f} bytes spilled per session")
+    print(f"{'hibernating':>16}: {elapsed * 1000000 / SESSIONS:8.0f} us per session")
+
+    # waking each game with its next command, then playing one more while it is awake
+    sample = session_ids[::SESSIONS // SAMPLES]
+    waking = []
+    awake = []
+    for session_id in sample:
+        start = time.perf_counter()
+        store.send(session_id, "look")
+        waking.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        store.send(session_id, "look")
+        awake.append(time.perf_counter() - start)
+    for name, times in [ ("waking", waking), ("already awake", awake) ]:
+        print(f"{name:>16}: p50 {percentile(times, 0.5) * 1000:6.2f} ms, p99 {percentile(times, 0.99) * 1000:6.2f} ms per command")
+    store.close_all()
+
+def main():
+    root = fresh_root()
+    try:
+        check_hibernation()
+        measure_sessions()
+    finally:
+        shutil.rmtree(root)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+import filemanager
+from worldmanager import WorldManager
+from benchworlds import build_world
+
+# Journal Benchmark
+# compares the cost of saving one small change as a full rewrite and as a journal entry
+# as the world grows, along with the cost of loading a save with a full journal
+
+SIZES_KB = [ 1, 64, 1024, 8192 ]
+SAVES = 20
+
+def main():
+    # no need to flush to disk when timing save work
+    filemanager.set_durability(filemanager.DURABILITY_NONE)
+
+    print(f"{'world':>8} {'full save (ms)':>15} {'journal save (ms)':>18} {'load + replay (ms)':>19}")
+    with tempfile.TemporaryDirectory() as project_root:
+        filemanager.PROJECT_ROOT = project_root
+        os.makedirs(os.path.join(project_root, filemanager.DATA_PATH, filemanager.SAVES_PATH))
+
+        for size_kb in SIZES_KB:
+            world_state = WorldManager()
+            world_state.load(build_world(size_kb * 1024))
+            file_name = f"bench-{size_kb}"
+            filemanager.write_save(file_name, world_state.get_world_data())
+
+            # full rewrite of the world on every save
+            start = time.perf_counter()
+            for i in range(SAVES):
+                world_state.world.cow_push_count += 1
+                filemanager.write_save(file_name, world_state.get_world_data())
+            full_time = (time.perf_counter() - start) / SAVES
+
+            # only the changed member variables on every save, which journal saves track
+            world_state.track_changes(True)
+            world_state.get_world_changes()
+            start = time.perf_counter()
+            for i in range(SAVES):
+                world_state.world.cow_push_count += 1
+                filemanager.append_journal(file_name, world_state.get_world_changes())
+            journal_time = (time.perf_counter() - start) / SAVES
+
+            start = time.perf_counter()
+            loaded = filemanager.read_save(file_name, WorldManager.World)
+            load_time = time.perf_counter() - start
+
+            if loaded.cow_push_count != world_state.world.cow_push_count:
+                raise ValueError("journal replay lost changes")
+
+            print(f"{size_kb:>6}KB {full_time * 1e3:>15.3f} {journal_time * 1e3:>18.3f} {load_time * 1e3:>19.3f}")
+
+if __name__ == '__main__':
+    main()
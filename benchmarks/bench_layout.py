@@ -0,0 +1,120 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+import textmanager
+from mode import Mode
+
+# Layout Benchmark
+# times a repeated "look" in a room with hundreds of objects, with the layout engine and a copy of the old display_text
+# test/test_layout.py checks they lay text out the same
+
+ROOM_SIZE = 500
+REPEATS = 2000
+
+# the old display_text, returning the text it would print
+def legacy_render(text, strip_tags=False, line_width=textmanager.DEFAULT_LINE_WIDTH):
+    text_lines = None
+    if isinstance(text, list):
+        text_lines = []
+        new_length = len(text)
+        current_index = 0
+
+        if new_length < line_width:
+            new_line = ""
+            for i in range(new_length):
+                new_line += f"{text[i]}, "
+            text_lines.append(new_line[:-2])
+        else:
+            while new_length - line_width > line_width:
+                line = ""
+                for i in range(line_width):
+                    line += f"{text[current_index + i]}, "
+                text_lines.append(line)
+                current_index += line_width
+                new_length -= line_width
+
+            if new_length % line_width != 0:
+                new_length = new_length // 2
+                if new_length % 2 != 0:
+                    new_length += 1
+                line = ""
+                for i in range(new_length + 1):
+                    line += f"{text[current_index + i]}, "
+                text_lines.append(line)
+                current_index += new_length + 1
+
+            line = ""
+            for i in range(len(text) - current_index):
+                line += f"{text[current_index + i]}, "
+            text_lines.append(line[:-2])
+    elif isinstance(text, dict):
+        text_lines = []
+        for key, line in text.items():
+            text_lines.append(f"{key}: {line}")
+    elif isinstance(text, str):
+        text_lines = text.split('\n')
+    else:
+        text_lines = [text]
+
+    result = ""
+    if strip_tags == False:
+        for line in text_lines:
+            result += f"{textmanager.TERMINAL_TAG}{line}\n"
+    else:
+        for line in text_lines:
+            result += f"{line}\n"
+    return result
+
+# the old look listing
+def legacy_look(objects):
+    results = []
+    for key_string in objects.keys():
+        if key_string != Mode.ALL_OBJECTS:
+            results.append(key_string)
+    return results
+
+def random_word(generator):
+    return "".join(generator.choice("abcdefghijklmnopqrstuvwxyz") for i in range(generator.randint(1, 12)))
+
+def main():
+    # a large room
+    generator = random.Random(15)
+    room = Mode("A crowded room.")
+    objects = { Mode.ALL_OBJECTS : None }
+    for i in range(ROOM_SIZE):
+        name = f"{random_word(generator)}{i}"
+        room.add_object(name, "Something in the way.")
+        objects[name] = "Something in the way."
+
+    print(f"repeated look in a room of {ROOM_SIZE} objects")
+    start = time.perf_counter()
+    for repeat in range(REPEATS):
+        legacy_render(legacy_look(objects))
+    legacy = (time.perf_counter() - start) / REPEATS
+    print(f"{'old listing and layout':>28}: {legacy * 1e6:10.2f} us per look")
+
+    start = time.perf_counter()
+    for repeat in range(REPEATS):
+        textmanager.render_text(room.run_command(Mode.LOOK_COMMAND))
+    cached = (time.perf_counter() - start) / REPEATS
+    print(f"{'cached listing and layout':>28}: {cached * 1e6:10.2f} us per look")
+    print(f"{'speedup':>28}: {legacy / cached:10.1f}x")
+
+    # a change to the room lays it out once more
+    start = time.perf_counter()
+    for repeat in range(REPEATS // 10):
+        room.add_object("newcomer", "Just arrived.")
+        textmanager.render_text(room.run_command(Mode.LOOK_COMMAND))
+    changed = (time.perf_counter() - start) / (REPEATS // 10)
+    print(f"{'look after each change':>28}: {changed * 1e6:10.2f} us per look")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+from mode import Mode
+
+# Look and Help Benchmark
+# times the keyed look and help, and copies of the old scanning ones, on modes with 10, 1k and 100k objects
+# test/test_look.py checks they answer the same
+
+MODE_SIZES = [ 10, 1000, 100000 ]
+TIMED_CALLS = 200000 # spread over the calls made for each mode size
+
+# the old look and help, over the old dicts with their dummy "all" object
+def legacy_look(objects, targets=None):
+    if targets:
+        if targets[0] == Mode.ALL_OBJECTS and len(objects.keys()) == 1:
+            return "There is nothing here..."
+        results = {}
+        for key_string in objects.keys():
+            if (key_string in targets or targets[0] == Mode.ALL_OBJECTS) and key_string != Mode.ALL_OBJECTS:
+                results[key_string] = objects[key_string]
+        for target in targets:
+            if target not in results.keys() and targets[0] != Mode.ALL_OBJECTS:
+                results[target] = None
+        return results
+    else:
+        results = []
+        if len(objects.keys()) == 1:
+            return "There is nothing here..."
+        for key_string in objects.keys():
+            if key_string != Mode.ALL_OBJECTS:
+                results.append(key_string)
+        return results
+
+def legacy_help(objects, commands, hints, targets=None):
+    if targets:
+        results = {}
+        for key_string in objects.keys():
+            if (key_string in targets or targets[0] == Mode.ALL_OBJECTS) and key_string != Mode.ALL_OBJECTS:
+                hint_text = hints[key_string]
+                if hint_text != None:
+                    results[key_string] = hint_text
+        for key_string in commands.keys():
+            if (key_string in targets or targets[0] == Mode.ALL_OBJECTS) and key_string != Mode.ALL_OBJECTS:
+                hint_text = hints[key_string]
+                if hint_text != None:
+                    results[key_string] = hint_text
+        for target in targets:
+            if target not in results.keys() and targets[0] != Mode.ALL_OBJECTS:
+                results[target] = None
+        return results
+    else:
+        results = []
+        for key_string in commands.keys():
+            results.append(key_string)
+        return results
+
+class Room():
+    def __init__(self, object_count, generator):
+        self.mode = Mode("A room.")
+        self.objects = { Mode.ALL_OBJECTS : "Every target that you can possibly command." }
+        self.commands = {}
+        self.hints = { Mode.ALL_OBJECTS : "Easy shortcut for targetting everything." }
+        for command in self.mode.run_command(Mode.HELP_COMMAND):
+            self.commands[command] = None
+            self.hints[command] = self.mode.run_command(Mode.HELP_COMMAND, [command])[command]
+        for command in [ "open", "push", "attack" ]:
+            self.commands[command] = None
+        self.mode.add_command("open", None, "Open something.")
+        self.mode.add_command("push", None, None)
+        self.mode.add_command("attack", None, "Hit something.")
+        self.hints["open"] = "Open something."
+        self.hints["push"] = None
+        self.hints["attack"] = "Hit something."
+
+        for i in range(object_count):
+            name = f"thing{i}"
+            hint_text = None
+            if generator.random() < 0.5:
+                hint_text = f"A hint for {name}."
+            self.add(name, f"It is {name}.", hint_text)
+
+    def add(self, name, description, hint_text=None):
+        self.mode.add_object(name, description, hint_text)
+        self.objects[name] = description
+        self.hints[name] = hint_text
+
+    def delete(self, name):
+        self.mode.delete_object(name)
+        if name in self.objects:
+            del self.objects[name]
+
+    def random_targets(self, generator):
+        names = list(self.objects.keys())[1:] + list(self.commands.keys()) + [ "nothing", Mode.ALL_OBJECTS ]
+        return generator.choice([ None, [ generator.choice(names) for i in range(generator.randint(1, 4)) ] ])
+
+def time_calls(name, funct, calls):
+    start = time.perf_counter()
+    for call in range(calls):
+        funct()
+    elapsed = (time.perf_counter() - start) / calls
+    return elapsed
+
+def main():
+    generator = random.Random(18)
+    for object_count in MODE_SIZES:
+        room = Room(object_count, generator)
+        calls = max(5, TIMED_CALLS // (object_count * 10))
+        targets = [ f"thing{object_count // 2}", f"thing{object_count - 1}", "nothing" ]
+        print(f"{object_count} objects")
+        cases = [
+            ("look", None),
+            ("look all", [ Mode.ALL_OBJECTS ]),
+            ("look three targets", targets),
+            ("help three targets", targets),
+            ("help all", [ Mode.ALL_OBJECTS ]) ]
+        for name, case_targets in cases:
+            command = Mode.LOOK_COMMAND
+            legacy_funct = lambda: legacy_look(room.objects, case_targets)
+            if name.startswith("help"):
+                command = Mode.HELP_COMMAND
+                legacy_funct = lambda: legacy_help(room.objects, room.commands, room.hints, case_targets)
+            legacy = time_calls(name, legacy_funct, calls)
+            # the first call fills the listings that later calls reuse
+            start = time.perf_counter()
+            room.mode.run_command(command, case_targets)
+            first = time.perf_counter() - start
+            keyed = time_calls(name, lambda: room.mode.run_command(command, case_targets), calls * 10)
+            print(f"{name:>20}: {legacy * 1e6:10.2f} us old, {first * 1e6:10.2f} us first keyed, {keyed * 1e6:8.2f} us keyed, {legacy / keyed:8.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+import os
+import sys
+import json
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+from mode import Mode
+
+# Mode Memory Benchmark
+# builds the modes of a generated world, as loaded from json, with the old parallel dict layout and with entries,
+# measuring the memory each holds with tracemalloc
+
+MODE_COUNT = 2000
+OBJECTS_PER_MODE = 50
+COMMANDS_PER_MODE = 6
+
+# the old Mode storage: commands, hints and objects in parallel dicts, with an order dict each
+# and the built in commands bound to every mode
+class LegacyMode():
+    def _back_funct(self, targets=None):
+        return None
+
+    def _quit_funct(self, targets=None):
+        return None
+
+    def _look_funct(self, targets=None):
+        return None
+
+    def _help_funct(self, targets=None):
+        return None
+
+    def __init__(self, prompt):
+        self.prompt = prompt
+        self.__commands = {}
+        self.__hints = {}
+        self.__objects = {}
+        self.__object_order = {}
+        self.__command_order = {}
+        self.__next_position = 0
+        self.__object_listing = None
+        self.__object_details = None
+        self.__command_listing = None
+        self.__hint_listing = None
+        self.__command_words = None
+        self.__object_words = None
+        self.add_command(Mode.HELP_COMMAND, self._help_funct, "List commands, or get a hint on any object or command.")
+        self.add_command(Mode.LOOK_COMMAND, self._look_funct, "List objects, or get some details on any object.")
+        self.add_command(Mode.BACK_COMMAND, self._back_funct, "Return to previous menu, or close menu.")
+        self.add_command(Mode.QUIT_COMMAND, self._quit_funct, "Quit to main menu or desktop.")
+
+    def add_object(self, key_string, description, hint_text=None):
+        if key_string not in self.__objects:
+            self.__object_order[key_string] = self.__next_position
+            self.__next_position += 1
+        self.__objects[key_string] = description
+        self.__hints[key_string] = hint_text
+
+    def add_command(self, key_string, funct, hint_text=None):
+        if key_string not in self.__commands:
+            self.__command_order[key_string] = self.__next_position
+            self.__next_position += 1
+        self.__commands[key_string] = funct
+        self.__hints[key_string] = hint_text
+
+class World():
+    def command_funct(self, objects, targets=None):
+        return "Done."
+
+# a world description as a generator would write it: rooms drawing on shared object and command kinds
+def world_json():
+    rooms = []
+    for room in range(MODE_COUNT):
+        objects = []
+        for i in range(OBJECTS_PER_MODE):
+            kind = (room * 7 + i * 13) % 300
+            objects.append([ f"thing{kind}", f"A thing of kind {kind}, much like the others.", f"Things of kind {kind} can be pushed." ])
+        commands = []
+        for i in range(COMMANDS_PER_MODE):
+            kind = (room + i) % 20
+            commands.append([ f"verb{kind}", f"Do the {kind} thing to something." ])
+        rooms.append({ "prompt" : f"ROOM {room % 50}\n => Look around", "objects" : objects, "commands" : commands })
+    return json.dumps(rooms)
+
+def build_modes(mode_type, rooms, world):
+    modes = []
+    for room in rooms:
+        mode = mode_type(room["prompt"])
+        for key_string, description, hint_text in room["objects"]:
+            mode.add_object(key_string, description, hint_text)
+        for key_string, hint_text in room["commands"]:
+            mode.add_command(key_string, world.command_funct, hint_text)
+        modes.append(mode)
+    return modes
+
+def measure(name, mode_type, text):
+    world = World()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    # every room is loaded with its own copy of every string, as json gives them
+    rooms = json.loads(text)
+    start = time.perf_counter()
+    modes = build_modes(mode_type, rooms, world)
+    elapsed = time.perf_counter() - start
+    # the loaded description is dropped once the modes are built, keeping only what the modes hold
+    del rooms
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    print(f"{name:>28}: {used / 1024 / 1024:8.2f} MiB, {used / len(modes):10.0f} bytes per mode, built in {elapsed * 1000:8.2f} ms")
+    return modes, used
+
+def main():
+    text = world_json()
+    print(f"{MODE_COUNT} modes with {OBJECTS_PER_MODE} objects and {COMMANDS_PER_MODE} commands each")
+    legacy_modes, legacy = measure("parallel dicts", LegacyMode, text)
+    modes, compact = measure("slotted entries, interned", Mode, text)
+    print(f"{'saved':>28}: {(1 - compact / legacy) * 100:8.1f}%")
+
+    # the compact modes still answer look and help
+    first = modes[0]
+    if first.run_command(Mode.LOOK_COMMAND)[0] != "thing0" or Mode.HELP_COMMAND not in first.run_command(Mode.HELP_COMMAND):
+        raise AssertionError("compact modes lost their objects or commands")
+
+if __name__ == '__main__':
+    main()
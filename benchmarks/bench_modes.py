@@ -0,0 +1,105 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+import os
+import gc
+import sys
+import time
+import shutil
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+import filemanager
+import headless
+from mode import Mode
+from gamemanager import GameManager
+from worldmanager import WorldManager
+
+# Mode Benchmark
+# measures the memory each of 1000 sessions holds with its modes built the old way, and made from shared templates
+# test/test_modes.py checks both answer the same
+
+SESSIONS = 1000
+
+def fresh_root():
+    root = tempfile.mkdtemp()
+    source = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+    shutil.copytree(os.path.join(source, filemanager.SOURCE_PATH), os.path.join(root, filemanager.SOURCE_PATH))
+    shutil.copy(os.path.join(source, filemanager.MAIN_SHELL), root)
+    os.makedirs(os.path.join(root, filemanager.DATA_PATH, filemanager.SAVES_PATH))
+    filemanager.PROJECT_ROOT = root
+    filemanager.rescan_files()
+    return root
+
+# the old way to build a mode: a new table of bound methods, hints and objects for every owner
+def built_mode(template, owner):
+    mode = Mode(template.prompt)
+    for key_string, entry in template.commands.items():
+        if key_string not in Mode.RESERVE_WORDS:
+            mode.add_command(key_string, entry.funct.__get__(owner), entry.hint_text)
+    for key_string, entry in template.objects.items():
+        mode.add_object(key_string, entry.description, entry.hint_text)
+    return mode
+
+# gives a game manager and its world modes built the old way
+def build_modes(game):
+    game.modes[GameManager.MAIN_MENU_MODE] = built_mode(GameManager.MAIN_MENU, game)
+    load_menu = built_mode(GameManager.LOAD_MENU, game)
+    for file, record in game.catalog.saves.items():
+        load_menu.add_object(file, record["summary"])
+    game.modes[GameManager.LOAD_MENU_MODE] = load_menu
+    game.modes[GameManager.OPTION_MENU_MODE] = built_mode(GameManager.OPTION_MENU, game)
+    game.world_state.modes["only"] = built_mode(WorldManager.ONLY_MODE, game.world_state)
+    game.modes["only"] = game.world_state.modes["only"]
+
+def new_game():
+    return GameManager(None, headless.HeadlessCommands(), False)
+
+# holds SESSIONS game managers at once, returning the memory they take
+def measure(prepare):
+    games = []
+    gc.collect()
+    tracemalloc.start()
+    for number in range(SESSIONS):
+        game = new_game()
+        prepare(game)
+        games.append(game)
+    gc.collect()
+    traced = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return traced
+
+# returns the seconds taken to make one session's modes
+def time_modes(make_mode, owner):
+    start = time.perf_counter()
+    for number in range(SESSIONS):
+        for template in [ GameManager.MAIN_MENU, GameManager.LOAD_MENU, GameManager.OPTION_MENU ]:
+            make_mode(template, owner)
+        make_mode(WorldManager.ONLY_MODE, owner.world_state)
+    return (time.perf_counter() - start) / SESSIONS
+
+def new_mode(template, owner):
+    return template.new_mode(owner)
+
+def report(name, traced, elapsed):
+    print(f"{name:>20}: {traced / SESSIONS:8.0f} bytes per session, {elapsed * 1000000:6.1f} us to make its modes")
+
+def main():
+    root = fresh_root()
+    try:
+        print(f"{SESSIONS} game managers held at once, each with its menus and world")
+        # modes built the old way replace the ones made from templates, which are freed
+        before = measure(build_modes)
+        after = measure(lambda game: None)
+        game = new_game()
+        report("modes built", before, time_modes(built_mode, game))
+        report("modes from templates", after, time_modes(new_mode, game))
+        print(f"{'saved':>20}: {(before - after) / SESSIONS:8.0f} bytes per session, {100 * (before - after) / before:5.1f}% of each session")
+    finally:
+        shutil.rmtree(root)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+import namemanager
+
+# Name Normalization Benchmark
+# compares the throughput of the name manager and copies of the old to_lower, clean_name and hyphen loops
+# on player names, both repeated and all different
+# test/test_names.py checks they give the same names
+
+FUZZ_NAMES = 50000
+REPEATS = 100
+
+ALPHABET = {
+    'A' : 'a', 'B' : 'b', 'C' : 'c', 'D' : 'd', 'E' : 'e',
+    'F' : 'f', 'G' : 'g', 'H' : 'h', 'I' : 'i', 'J' : 'j',
+    'K' : 'k', 'L' : 'l', 'M' : 'm', 'N' : 'n', 'O' : 'o',
+    'P' : 'p', 'Q' : 'q', 'R' : 'r', 'S' : 's', 'T' : 't',
+    'U' : 'u', 'V' : 'v', 'W' : 'w', 'X' : 'x', 'Y' : 'y', 'Z' : 'z' }
+
+PLAYER_NAMES = [ "bob", "Bob", "  bob  ", "Bob The Brave", "bob   the   brave", "quit", "back", "stop",
+    "Sir Reginald Fitzwilliam", "abcdefghijklmn opq", "abcdefghijklmnop!", "x", "", " ", "bob!",
+    "R2D2", "Zoë", "mary jane", "MARY JANE WATSON PARKER", "tab\tname", "a b c d e f g h i" ]
+
+# the old to_lower
+def legacy_to_lower(arg_string):
+    if len(arg_string) != 1:
+        new_lower_input = ""
+        for character in arg_string:
+            new_lower_input += legacy_to_lower(character)
+        return new_lower_input
+
+    for capital, lower_case in ALPHABET.items():
+        if arg_string == capital:
+            return lower_case
+
+    return arg_string
+
+# the old clean_name
+def legacy_clean_name(name_string):
+    result = ""
+    if name_string == None or len(name_string) == 0:
+        return None
+
+    name_string = name_string.rstrip(' ')
+    name_string = name_string.lstrip(' ')
+
+    if name_string == None or len(name_string) == 0:
+        return None
+
+    space_found = False
+
+    for character in name_string:
+        if space_found == True:
+            if character == ' ':
+                continue
+            else:
+                space_found = False
+
+        if character >= 'a' and character <= 'z':
+            result += character
+        elif character >= 'A' and character <= 'Z':
+            result += legacy_to_lower(character)
+        elif character == ' ':
+            if result == "":
+                continue
+
+            result += ' '
+            space_found = True
+        else:
+            return None
+
+        if len(result) >= namemanager.MAX_NAME_LENGTH:
+            break
+
+    return result
+
+# the old hyphen loop, copied through gamemanager
+def legacy_slug(name):
+    clean_name = ""
+    for char in name:
+        if char == " ":
+            clean_name += "-"
+        else:
+            clean_name += char
+    return clean_name
+
+def legacy_normalize(name_string):
+    display_name = legacy_clean_name(name_string)
+    if display_name == None:
+        return None, None
+    return display_name, legacy_slug(display_name)
+
+# random names made mostly of letters and spaces, with the odd symbol or accent
+def fuzz_names(name_count):
+    generator = random.Random(13)
+    characters = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ" + " " * 10 + "\t!-'é"
+    return [ "".join(generator.choice(characters) for i in range(generator.randint(0, 30))) for name in range(name_count) ]
+
+def time_names(name, funct, names, repeats):
+    start = time.perf_counter()
+    for repeat in range(repeats):
+        for player_name in names:
+            funct(player_name)
+    elapsed = (time.perf_counter() - start) / (repeats * len(names))
+    print(f"{name:>36}: {elapsed * 1e6:8.3f} us per name")
+    return elapsed
+
+def main():
+    fuzzed = fuzz_names(FUZZ_NAMES)
+
+    print(f"{len(PLAYER_NAMES)} player names, repeated")
+    legacy = time_names("old clean_name + hyphen loop", legacy_normalize, PLAYER_NAMES, REPEATS)
+    cached = time_names("normalize_name, cached", namemanager.normalize_name, PLAYER_NAMES, REPEATS)
+    print(f"{'speedup':>36}: {legacy / cached:8.1f}x")
+
+    print(f"{FUZZ_NAMES} different names")
+    legacy = time_names("old clean_name + hyphen loop", legacy_normalize, fuzzed, 1)
+    uncached = time_names("normalize_name, uncached", namemanager.normalize_name.__wrapped__, fuzzed, 1)
+    print(f"{'speedup':>36}: {legacy / uncached:8.1f}x")
+
+    long_text = " ".join(fuzzed[:200])
+    print(f"to_lower on {len(long_text)} characters")
+    legacy = time_names("old recursive to_lower", legacy_to_lower, [ long_text ], 10)
+    tables = time_names("to_lower table", namemanager.to_lower, [ long_text ], 10)
+    print(f"{'speedup':>36}: {legacy / tables:8.1f}x")
+
+if __name__ == '__main__':
+    main()
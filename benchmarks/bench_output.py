@@ -0,0 +1,80 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+import textmanager
+import outputchannel
+
+# Output Channel Benchmark
+# plays the display_text calls of a few busy command turns into a frontend that records every write,
+# once with a channel that writes each display_text straight through, as print did, and once buffered per turn
+# test/test_output.py checks both show the same text
+
+REPEATS = 2000
+FRONTEND_WRITE_COST = 0.00002 # the window does work for every write it is handed
+
+CONFIG_TEXT = "[SOUND] sound volume: 10\n[MUSIC] music volume: 10\n[MASTER] master volume: 7\n[DELAY] speed of text: normal\n[WELCOME] display welcome message: yes"
+
+# each turn is the display_text calls one command makes before the game waits on the user again
+def option_set_turn():
+    textmanager.display_text("Successfully set new option value.")
+
+def option_page_turn():
+    textmanager.display_text("OPTIONS\n", True)
+    textmanager.display_text(f"{textmanager.END_MARKER}\n{CONFIG_TEXT}\n{textmanager.END_MARKER}", True)
+
+def change_mode_turn():
+    textmanager.display_text("Starting adventure!!!")
+    textmanager.display_text("Changing page...")
+
+def look_turn():
+    textmanager.display_text([ "cow", "box", "troll", "corpse", "potato", "sword", "lamp", "door", "rug", "chest" ])
+    textmanager.display_text("There is nothing like \"dragon\" here.\nTry typing \"look\" to see what is around.")
+
+TURNS = [ option_set_turn, option_page_turn, change_mode_turn, look_turn ]
+
+class Frontend():
+    def __init__(self):
+        self.writes = 0
+        self.text = []
+
+    def write(self, text):
+        self.writes += 1
+        self.text.append(text)
+        time.sleep(0) # give up the thread, as handing text to the window does
+        end = time.perf_counter() + FRONTEND_WRITE_COST
+        while time.perf_counter() < end:
+            pass
+
+def play_turns(buffer_size):
+    frontend = Frontend()
+    token = outputchannel.set_output(outputchannel.OutputChannel(frontend.write, buffer_size))
+    try:
+        start = time.perf_counter()
+        for repeat in range(REPEATS):
+            for turn in TURNS:
+                turn()
+                # the game waits on the user at the end of every turn
+                outputchannel.flush_output()
+        elapsed = (time.perf_counter() - start) / (REPEATS * len(TURNS))
+    finally:
+        outputchannel.reset_output(token)
+    return frontend, elapsed
+
+def main():
+    unbuffered, legacy = play_turns(1)
+    buffered, coalesced = play_turns(outputchannel.OUTPUT_BUFFER_SIZE)
+
+    turns = REPEATS * len(TURNS)
+    print(f"{'write per display_text':>24}: {unbuffered.writes / turns:6.2f} writes, {legacy * 1e6:8.2f} us per turn")
+    print(f"{'write per turn':>24}: {buffered.writes / turns:6.2f} writes, {coalesced * 1e6:8.2f} us per turn")
+    print(f"{'speedup':>24}: {legacy / coalesced:6.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+import results
+from mode import Mode
+from worldmanager import WorldManager
+
+# Results Benchmark
+# times the old prefix checks against dispatch on the result type
+# test/test_results.py checks legacy string returns are read as the results they stood for
+
+CALLS = 200000
+
+# the old dispatch: test every return for each prefix in turn, then print what is left
+def legacy_dispatch(mode_return, counts):
+    if isinstance(mode_return, str) == True:
+        if len(mode_return) > len(WorldManager.GAME_COMMAND) + 1 and mode_return[:len(WorldManager.GAME_COMMAND)] == WorldManager.GAME_COMMAND:
+            counts["world"] += 1
+            return
+        if len(mode_return) > len(Mode.CHANGE_MODE) + 1 and mode_return[:len(Mode.CHANGE_MODE)] == Mode.CHANGE_MODE:
+            counts["change"] += 1
+            return
+    if mode_return != "\n":
+        counts["text"] += 1
+
+def count_text(result, counts):
+    counts["text"] += 1
+
+def count_nothing(result, counts):
+    pass
+
+def count_world(result, counts):
+    counts["world"] += 1
+
+def count_change(result, counts):
+    counts["change"] += 1
+
+HANDLERS = {
+    results.Text : count_text,
+    results.Listing : count_text,
+    results.Silent : count_nothing,
+    results.WorldCommand : count_world,
+    results.ChangeMode : count_change }
+
+def typed_dispatch(mode_return, counts):
+    result = results.to_result(mode_return)
+    HANDLERS[type(result)](result, counts)
+
+def time_dispatch(name, dispatch, returns):
+    counts = { "text" : 0, "world" : 0, "change" : 0 }
+    start = time.perf_counter()
+    for call in range(CALLS // len(returns)):
+        for mode_return in returns:
+            dispatch(mode_return, counts)
+    elapsed = (time.perf_counter() - start) / CALLS
+    print(f"{name:>32}: {elapsed * 1e9:8.1f} ns per command")
+    return elapsed
+
+def main():
+    # what commands send back over a turn of play: mostly text, now and then a change of mode
+    legacy_returns = [ "You look around.", "It is a box.", [ "box", "key" ], { "box" : "It is a box." }, "\n", f"{Mode.CHANGE_MODE}options", f"{WorldManager.GAME_COMMAND}{WorldManager.SAVE_SIGNATURE}" ]
+    typed_returns = [ results.to_result(mode_return) for mode_return in legacy_returns ]
+
+    legacy = time_dispatch("string prefixes", legacy_dispatch, legacy_returns)
+    time_dispatch("legacy strings read as results", typed_dispatch, legacy_returns)
+    typed = time_dispatch("typed results", typed_dispatch, typed_returns)
+    print(f"{'speedup':>32}: {legacy / typed:8.2f}x")
+
+if __name__ == '__main__':
+    main()
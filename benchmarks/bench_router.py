@@ -0,0 +1,157 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+import os
+import sys
+import time
+import signal
+import shutil
+import hashlib
+import tempfile
+import multiprocessing
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+import filemanager
+import headless
+import sessionrouter
+from worldmanager import WorldManager
+
+# Session Router Benchmark
+# checks a routed game shows what a headless game does, carries its world over when migrated,
+# and survives its worker being killed, then times a world with cpu heavy commands on 1 to N workers
+
+SESSIONS = 64
+ROUNDS = 20
+WORK_ROUNDS = 4000 # hashes per heavy command
+SCRIPT = [ "look", "push cow", "push cow", "look cow", "help push", "push cow", "options", "back", "push cow", "push cow", "push cow" ]
+
+def fresh_root():
+    root = tempfile.mkdtemp()
+    source = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+    shutil.copytree(os.path.join(source, filemanager.SOURCE_PATH), os.path.join(root, filemanager.SOURCE_PATH))
+    shutil.copy(os.path.join(source, filemanager.MAIN_SHELL), root)
+    os.makedirs(os.path.join(root, filemanager.DATA_PATH, filemanager.SAVES_PATH))
+    filemanager.PROJECT_ROOT = root
+    filemanager.rescan_files()
+    return root
+
+# a world whose pushes take real work, set up inside each worker process
+def heavy_world():
+    push_entry = WorldManager.ONLY_MODE.commands["push"]
+    push_funct = push_entry.funct
+
+    def heavy_push_funct(self, objects, targets=None):
+        digest = b""
+        for round in range(WORK_ROUNDS):
+            digest = hashlib.sha256(digest).digest()
+        return push_funct(self, objects, targets)
+
+    push_entry.funct = heavy_push_funct
+
+def headless_turns(lines):
+    game = headless.HeadlessGame()
+    turns = [ game.start() ]
+    for line in lines:
+        turns.append(game.send(line))
+    game.close()
+    return turns
+
+def check_router():
+    root = fresh_root()
+    opening = [ "new", "bob", "yes" ]
+    headless_turns([]) # the first game is welcomed differently
+    expected = headless_turns(opening + SCRIPT)
+
+    router = sessionrouter.SessionRouter(2)
+    try:
+        # played on one worker
+        turns = [ router.start("alone") ]
+        for line in opening + SCRIPT:
+            turns.append(router.send("alone", line))
+        if turns != expected:
+            raise AssertionError("a routed game showed different text from a headless game")
+
+        # migrated to the other worker halfway
+        turns = [ router.start("moved") ]
+        half = len(opening) + len(SCRIPT) // 2
+        for position, line in enumerate(opening + SCRIPT):
+            if position == half:
+                start_worker = router.worker_of("moved")
+                if router.migrate("moved", 1 - start_worker) == False or router.worker_of("moved") == start_worker:
+                    raise AssertionError("a game waiting on a command could not be migrated")
+            turns.append(router.send("moved", line))
+        if turns != expected:
+            raise AssertionError("a migrated game lost its world or mode")
+
+        # partway through a question a game stays where it is
+        router.start("asking")
+        for line in opening + [ "quit" ]:
+            router.send("asking", line)
+        if router.migrate("asking", 1 - router.worker_of("asking")) == True:
+            raise AssertionError("a game partway through a question was migrated")
+
+        # a killed worker is restarted, losing only its own sessions
+        killed = router.worker_of("asking")
+        router.start("healthy")
+        for line in opening:
+            router.send("healthy", line)
+        router.migrate("healthy", 1 - killed)
+        os.kill(router._SessionRouter__workers[killed].process.pid, signal.SIGKILL)
+        time.sleep(0.5)
+        shown = router.send_many([ ("asking", "yes"), ("healthy", "look") ])
+        if shown[0] != None or shown[1] != expected[len(opening) + 1]:
+            raise AssertionError("a killed worker kept the other workers' sessions from being played")
+        lost = router.check_workers()
+        if "asking" not in lost or "healthy" in lost or router.send("asking", "yes") != None:
+            raise AssertionError("sessions on a killed worker were not reported lost")
+        if router.send("healthy", "look") != expected[len(opening) + 1]:
+            raise AssertionError("a session on a healthy worker was lost with a killed worker")
+        router.start("after")
+        if router.send("after", "look") == None:
+            raise AssertionError("the restarted worker does not play games")
+    finally:
+        router.shutdown()
+        shutil.rmtree(root)
+    print(f"routed games match headless ones, migrate with their world and mode, and a killed worker is restarted")
+
+def time_workers(worker_count):
+    root = fresh_root()
+    router = sessionrouter.SessionRouter(worker_count, heavy_world)
+    try:
+        session_ids = [ f"session {number}" for number in range(SESSIONS) ]
+        # spread sessions evenly, so the timing shows the workers rather than the hash
+        for number, session_id in enumerate(session_ids):
+            router.start(session_id)
+            router.migrate(session_id, number % worker_count)
+        for line in [ "new", "bob", "yes" ]:
+            router.send_many([ (session_id, line) for session_id in session_ids ])
+
+        start = time.perf_counter()
+        for round in range(ROUNDS):
+            shown = router.send_many([ (session_id, "push cow") for session_id in session_ids ])
+            if None in shown:
+                raise AssertionError("a session ended early")
+        elapsed = time.perf_counter() - start
+    finally:
+        router.shutdown()
+        shutil.rmtree(root)
+    return SESSIONS * ROUNDS / elapsed
+
+def main():
+    check_router()
+
+    cpu_count = multiprocessing.cpu_count()
+    # two workers are always timed, so a single core shows what sharding costs
+    worker_counts = sorted(set([ count for count in [ 1, 2, 4, 8, 16 ] if count <= max(cpu_count, 2) ] + [ cpu_count ]))
+    print(f"{SESSIONS} sessions pushing a cow that takes {WORK_ROUNDS} hashes to push, on {cpu_count} cores")
+    single = None
+    for worker_count in worker_counts:
+        rate = time_workers(worker_count)
+        if single == None:
+            single = rate
+        print(f"{worker_count:>3} workers: {rate:8.0f} commands per second, {rate / single:5.2f}x one worker")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+import filemanager
+
+# Save Catalog Benchmark
+# compares startup save validation with synthetic saves on disk:
+# the old os.walk per save, a file index lookup per save, and one catalog sync
+
+SAVE_COUNT = 10000
+WALK_SAMPLE = 50 # walking per save is far too slow to run 10k times
+
+def walk_locate(file_name):
+    matches = []
+    for root, dirs, files in os.walk(filemanager.PROJECT_ROOT):
+        if filemanager.SOURCE_PATH in dirs:
+            dirs.remove(filemanager.SOURCE_PATH)
+        if file_name in files:
+            matches.append(os.path.join(root, file_name))
+    if len(matches) != 1:
+        return None
+    return matches[0]
+
+# build saves on disk, along with the config listing and catalog that refer to them
+def build_saves(project_root, save_count):
+    saves_path = os.path.join(project_root, filemanager.DATA_PATH, filemanager.SAVES_PATH)
+    os.makedirs(saves_path)
+
+    config_saves = {}
+    catalog = filemanager.SaveCatalog()
+    for i in range(save_count):
+        save_name = f"player {i}"
+        file_name = f"player-{i}"
+        with open(os.path.join(saves_path, file_name), 'wb') as file:
+            file.write(b"{}")
+        summary = f"Player {save_name} is... doing things..."
+        config_saves[save_name] = summary
+        catalog.saves[save_name] = { "file" : file_name, "size" : None, "mtime" : None, "summary" : summary }
+    
+    # first sync fills in sizes and modification times
+    filemanager.sync_catalog(catalog)
+    return config_saves
+
+def main():
+    with tempfile.TemporaryDirectory() as project_root:
+        filemanager.PROJECT_ROOT = project_root
+        config_saves = build_saves(project_root, SAVE_COUNT)
+
+        # old startup: one tree walk per save
+        sample = list(config_saves.keys())[:WALK_SAMPLE]
+        start = time.perf_counter()
+        for save_name in sample:
+            walk_locate(save_name.replace(" ", "-"))
+        walk_time = (time.perf_counter() - start) * SAVE_COUNT / len(sample)
+
+        # indexed startup: one tree walk, then one lookup per save
+        start = time.perf_counter()
+        filemanager.rescan_files()
+        for save_name in config_saves.keys():
+            filemanager.locate_file(save_name.replace(" ", "-"))
+        index_time = time.perf_counter() - start
+
+        # catalog startup: read the catalog and check it against one listing
+        start = time.perf_counter()
+        catalog = filemanager.read_catalog()
+        filemanager.sync_catalog(catalog)
+        catalog_time = time.perf_counter() - start
+
+        print(f"saves on disk: {SAVE_COUNT}")
+        print(f"os.walk per save:  {walk_time:10.3f} s (estimated from {WALK_SAMPLE} saves)")
+        print(f"index per save:    {index_time:10.3f} s")
+        print(f"catalog sync:      {catalog_time:10.3f} s ({len(catalog.saves)} valid saves)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+import os
+import sys
+import json
+import time
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+import filemanager
+import schema
+from worldmanager import WorldManager
+from gamemanager import GameManager
+
+# Schema Load Benchmark
+# loads thousands of small saves and configs, comparing the old build
+# (run __init__, then setattr every key) with the compiled schema loaders
+
+SAVE_COUNT = 5000
+
+# the old _build_object
+def legacy_build(member_variables, class_type):
+    new_object = class_type()
+    for key, value in member_variables.items():
+        setattr(new_object, key, value)
+    return new_object
+
+# writes a world save and a config for every player, returning their file names
+def build_files(project_root, save_count):
+    saves_path = os.path.join(project_root, filemanager.DATA_PATH, filemanager.SAVES_PATH)
+    os.makedirs(saves_path)
+
+    file_names = []
+    for i in range(save_count):
+        world = WorldManager.World()
+        world.cow_push_count = i % 6
+        world.location = f"Room {i}"
+        if i % 2 == 0:
+            world.containers = []
+
+        config = GameManager.Configuration()
+        config.most_recent_save = f"player {i}"
+        config.saves = { f"player {i}" : "Player is... doing things..." }
+
+        file_name = f"player-{i}"
+        with open(os.path.join(saves_path, file_name), 'w') as file:
+            json.dump(vars(world), file)
+        with open(os.path.join(saves_path, file_name + ".config"), 'w') as file:
+            json.dump(vars(config), file)
+        file_names.append(file_name)
+
+    filemanager.rescan_files()
+    return file_names
+
+def time_builds(name, build, parsed):
+    start = time.perf_counter()
+    for world_data, config_data in parsed:
+        build(world_data, WorldManager.World)
+        build(config_data, GameManager.Configuration)
+    elapsed = time.perf_counter() - start
+    print(f"{name:>28}: {elapsed * 1000:8.1f} ms  ({elapsed / len(parsed) * 1e6:6.1f} us per save and config)")
+    return elapsed
+
+def time_reads(name, file_names):
+    start = time.perf_counter()
+    for file_name in file_names:
+        filemanager.read_data(file_name, WorldManager.World)
+        filemanager.read_data(file_name + ".config", GameManager.Configuration)
+    elapsed = time.perf_counter() - start
+    print(f"{name:>28}: {elapsed * 1000:8.1f} ms")
+    return elapsed
+
+def main():
+    with tempfile.TemporaryDirectory() as project_root:
+        filemanager.PROJECT_ROOT = project_root
+        file_names = build_files(project_root, SAVE_COUNT)
+
+        # parsed dicts, to time the build step alone
+        parsed = []
+        for file_name in file_names:
+            path = filemanager.locate_file(file_name)
+            with open(path, 'rb') as file:
+                world_data = json.load(file)
+            with open(path + ".config", 'rb') as file:
+                config_data = json.load(file)
+            parsed.append((world_data, config_data))
+
+        print(f"building {SAVE_COUNT} worlds and {SAVE_COUNT} configs from parsed dicts")
+        legacy = time_builds("__init__ + setattr", legacy_build, parsed)
+        compiled = time_builds("compiled schema", schema.load, parsed)
+        print(f"{'speedup':>28}: {legacy / compiled:8.2f}x")
+
+        print(f"reading {SAVE_COUNT} saves and {SAVE_COUNT} configs from disk")
+        build_object = filemanager._build_object
+        filemanager._build_object = legacy_build
+        legacy = time_reads("__init__ + setattr", file_names)
+        filemanager._build_object = build_object
+        compiled = time_reads("compiled schema", file_names)
+        print(f"{'speedup':>28}: {legacy / compiled:8.2f}x")
+
+if __name__ == '__main__':
+    main()
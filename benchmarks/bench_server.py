@@ -0,0 +1,175 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+import os
+import sys
+import time
+import shutil
+import asyncio
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+import filemanager
+import outputchannel
+import headless
+import gameserver
+
+# Game Server Benchmark
+# checks a player on the server sees what a headless game shows, then load tests a server on the loopback
+# with 10, 100 and 1000 players at once, reporting commands per second and latency percentiles
+
+SESSION_COUNTS = [ 10, 100, 1000 ]
+COMMANDS_PER_SESSION = 40
+ROUNDS = [ "look", "look box", "lok bx", "push cow", "help", "help box", "attack troll", "options", "back" ]
+SCRIPT = [ "look", "look box", "lok bx", "push cow", "options", "back", "help", "quit", "yes", "quit" ]
+
+def fresh_root():
+    root = tempfile.mkdtemp()
+    source = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+    shutil.copytree(os.path.join(source, filemanager.SOURCE_PATH), os.path.join(root, filemanager.SOURCE_PATH))
+    shutil.copy(os.path.join(source, filemanager.MAIN_SHELL), root)
+    os.makedirs(os.path.join(root, filemanager.DATA_PATH, filemanager.SAVES_PATH))
+    filemanager.PROJECT_ROOT = root
+    filemanager.rescan_files()
+    return root
+
+# player names may only use letters
+def player_name(number):
+    name = ""
+    while True:
+        name += chr(ord("a") + number % 26)
+        number //= 26
+        if number == 0:
+            return f"player {name}"
+
+# Client
+# a player on the loopback, reading the game's text a turn at a time
+class Client():
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    # reads the rest of the turn, returning its text, or None if the server hung up
+    async def read_turn(self):
+        lines = []
+        while True:
+            line = await self.reader.readline()
+            if len(line) == 0:
+                return None
+            line = line.decode("utf-8")
+            if line == f"{gameserver.TURN_MARKER}\n":
+                return "".join(lines)
+            lines.append(line)
+
+    # sends a command, returning the text of the turn it played and how long it took
+    async def send(self, command):
+        start = time.perf_counter()
+        self.writer.write(f"{command}\n".encode("utf-8"))
+        text = await self.read_turn()
+        return text, time.perf_counter() - start
+
+    async def close(self):
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+
+# sessions end a moment after their players hang up
+async def close_server(server, listener):
+    while len(server.sessions) != 0:
+        await asyncio.sleep(0.01)
+    listener.close()
+    await listener.wait_closed()
+    await server.close_files()
+
+async def connect(port):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port, limit=1024 * 1024)
+    return Client(reader, writer)
+
+def headless_text(lines):
+    output = outputchannel.CapturedOutput()
+    token = outputchannel.set_output(output)
+    try:
+        headless.run_lines(lines)
+    finally:
+        outputchannel.reset_output(token)
+    return output.take_text()
+
+async def check_equivalence():
+    lines = [ "new", player_name(0), "yes" ] + SCRIPT
+
+    # the server writes the configuration before anyone connects, so no player sees the first open welcome
+    root = fresh_root()
+    headless_text([ "quit" ])
+    expected = headless_text(lines)
+    shutil.rmtree(root)
+
+    root = fresh_root()
+    server = gameserver.GameServer(max_sessions=1)
+    listener = await server.start_tcp()
+    port = listener.sockets[0].getsockname()[1]
+    client = await connect(port)
+    turns = [ await client.read_turn() ]
+
+    # the server is full with one player
+    other = await connect(port)
+    turned_away = await other.reader.read()
+    await other.close()
+
+    for line in lines:
+        text, elapsed = await client.send(line)
+        if text == None:
+            break
+        turns.append(text)
+    await client.close()
+    await close_server(server, listener)
+    shutil.rmtree(root)
+
+    # the last turn is ended by the server hanging up rather than a marker
+    if "".join(turns) != expected[:len("".join(turns))] or expected.endswith("Goodbye!\n") == False:
+        raise AssertionError("a player on the server saw different text from a headless game")
+    if turned_away.decode("utf-8") != f"{gameserver.FULL_MESSAGE}\n":
+        raise AssertionError("a player past the session limit was let in")
+    print(f"a player on the server sees what a headless game shows over {len(lines)} commands, and a full server turns players away")
+
+async def play_session(port, number, latencies):
+    client = await connect(port)
+    await client.read_turn()
+    for line in [ "new", player_name(number), "yes" ]:
+        await client.send(line)
+    for command in range(COMMANDS_PER_SESSION):
+        text, elapsed = await client.send(ROUNDS[(number + command) % len(ROUNDS)])
+        if text == None:
+            raise AssertionError(f"session {number} was closed early")
+        latencies.append(elapsed)
+    await client.close()
+
+async def load_test(session_count):
+    root = fresh_root()
+    server = gameserver.GameServer(max_sessions=session_count)
+    listener = await server.start_tcp()
+    port = listener.sockets[0].getsockname()[1]
+
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*[ play_session(port, number, latencies) for number in range(session_count) ])
+    elapsed = time.perf_counter() - start
+
+    await close_server(server, listener)
+    shutil.rmtree(root)
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2]
+    p99 = latencies[min(len(latencies) - 1, len(latencies) * 99 // 100)]
+    print(f"{session_count:>5} sessions: {len(latencies) / elapsed:8.0f} commands per second, p50 {p50 * 1000:8.2f} ms, p99 {p99 * 1000:8.2f} ms, {elapsed:6.2f} s")
+
+async def main():
+    await check_equivalence()
+    for session_count in SESSION_COUNTS:
+        await load_test(session_count)
+
+if __name__ == '__main__':
+    asyncio.run(main())
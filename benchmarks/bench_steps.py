@@ -0,0 +1,120 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import threading
+from queue import Queue
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+import filemanager
+import outputchannel
+import headless
+from gamemanager import GameManager
+
+# Step Benchmark
+# plays many games at once, interleaving a command from each in turn,
+# first as step generators resumed from this one thread, then with the old thread per game blocking on its input,
+# checking every game shows what a game played alone does
+
+GAME_COUNTS = [ 100, 1000 ]
+SCRIPT = [ "new", "bob", "no", "bob", "yes", "look", "look box", "lok bx", "push cow", "attack troll",
+    "options", "back", "help", "quit", "no", "look all", "quit", "yes", "quit" ]
+
+def fresh_root():
+    root = tempfile.mkdtemp()
+    source = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+    shutil.copytree(os.path.join(source, filemanager.SOURCE_PATH), os.path.join(root, filemanager.SOURCE_PATH))
+    shutil.copy(os.path.join(source, filemanager.MAIN_SHELL), root)
+    os.makedirs(os.path.join(root, filemanager.DATA_PATH, filemanager.SAVES_PATH))
+    filemanager.PROJECT_ROOT = root
+    filemanager.rescan_files()
+    return root
+
+# Thread Game
+# the old way to play a game one command at a time: on its own thread, blocking on a queue for each line
+class ThreadGame():
+    def __init__(self):
+        self.commands = headless.HeadlessCommands()
+        self.output = outputchannel.CapturedOutput()
+        self.lines = Queue()
+        self.turns = Queue()
+        self.thread = threading.Thread(target=self.run)
+        self.thread.daemon = True
+
+    def start(self):
+        self.thread.start()
+        self.turns.get()
+        return self.output.take_text()
+
+    def send(self, line):
+        self.lines.put(line)
+        self.turns.get()
+        return self.output.take_text()
+
+    def get_input(self):
+        self.commands.show_reports()
+        self.turns.put(True)
+        line = self.lines.get()
+        if line == None:
+            raise headless.EndOfInput()
+        return line
+
+    def run(self):
+        token = outputchannel.set_output(self.output)
+        try:
+            game = GameManager(self, self.commands, False)
+            game.run()
+        finally:
+            game.save_writer.close()
+            outputchannel.reset_output(token)
+            self.turns.put(False)
+
+def play_alone():
+    output = outputchannel.CapturedOutput()
+    token = outputchannel.set_output(output)
+    headless.run_lines(SCRIPT)
+    outputchannel.reset_output(token)
+    return output.take_text()
+
+# plays every game a command at a time, round robin, returning what each showed and the threads running midway
+def interleave(games):
+    shown = [ game.start() for game in games ]
+    threads = 0
+    start = time.perf_counter()
+    for index, line in enumerate(SCRIPT):
+        for number, game in enumerate(games):
+            shown[number] += game.send(line)
+        if index == len(SCRIPT) // 2:
+            threads = threading.active_count()
+    elapsed = time.perf_counter() - start
+    return shown, threads, elapsed
+
+def measure(name, game_type, game_count):
+    # the first game in a fresh project is welcomed differently, so every game is played after one
+    root = fresh_root()
+    play_alone()
+    expected = play_alone()
+
+    games = [ game_type() for number in range(game_count) ]
+    shown, threads, elapsed = interleave(games)
+    shutil.rmtree(root)
+    for text in shown:
+        if text != expected:
+            raise AssertionError(f"a {name} game showed different text from a game played alone")
+    commands = len(SCRIPT) * game_count
+    print(f"{name:>24}: {commands / elapsed:8.0f} commands per second, {threads:5} threads running")
+
+def main():
+    for game_count in GAME_COUNTS:
+        print(f"{game_count} games, {len(SCRIPT)} commands each, all shown the same as a game played alone")
+        measure("step generators", headless.HeadlessGame, game_count)
+        measure("thread per game", ThreadGame, game_count)
+
+if __name__ == '__main__':
+    main()
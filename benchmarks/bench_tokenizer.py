@@ -0,0 +1,123 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+import textmanager
+
+# Tokenizer Benchmark
+# parses a corpus of recorded style inputs with the old character by character get_input
+# and the table driven parse_input, checking both give the same result in both validate_chars modes
+
+REPEATS = 200
+FUZZ_LINES = 20000
+
+# lines as players type them: commands, menu picks, names, mistakes and stray characters
+RECORDED_INPUTS = [ "x", "", " ", "new game", "New Game", "continue", "load", "load bob", "LOAD  Bob",
+    "options", "quit", "back", "stop", "yes", "no", "y", "n", "look", "help", "look all",
+    "open box", "Open the Box", "open   box  ", "   push cow", "push cow cow cow", "attack troll",
+    "ATTACK TROLL", "attack all", "attack troll with sword", "use all", "do stuff", "do stuff box",
+    "delete bob", "save", "sound 7", "music 10", "master 3", "delay slow", "welcome no",
+    "open box!", "what?", "go north.", "take potato, eat potato", "look\tall", "café",
+    "a b c d e f g h i j k l m n o p", "the quick brown fox jumps over the lazy troll again and again",
+    "Bob The Brave", "   ", "      look      at      the      cow      " ]
+
+# the old get_input, fed a string instead of reading one
+def legacy_parse(arg_string, validate_chars=True):
+    result = ""
+    space_found = False
+
+    for character in arg_string:
+        if space_found == True:
+            if character == ' ':
+                continue
+            else:
+                space_found = False
+
+        if validate_chars == False:
+            result += character
+            if character == ' ':
+                space_found = True
+            continue
+
+        if character >= 'a' and character <= 'z':
+            result += character
+        elif character >= 'A' and character <= 'Z':
+            result += legacy_to_lower(character)
+        elif character == ' ':
+            result += ' '
+            space_found = True
+        else:
+            return None, None
+
+    if len(result) != 0:
+        result = result.lstrip(' ')
+    if len(result) != 0:
+        result = result.rstrip(' ')
+
+    if len(result) == 0:
+        return None, None
+
+    words = result.split(' ')
+    if len(words) == 0:
+        return None, None
+
+    nouns = None
+    verb = words[0]
+    if len(words) > 1:
+        nouns = words[1:]
+
+    return verb, nouns
+
+def legacy_to_lower(arg_string):
+    if len(arg_string) != 1:
+        new_lower_input = ""
+        for character in arg_string:
+            new_lower_input += legacy_to_lower(character)
+        return new_lower_input
+
+    for capital, lower_case in textmanager.ALPHABET.items():
+        if arg_string == capital:
+            return lower_case
+
+    return arg_string
+
+# random lines made mostly of letters and spaces, with the odd tab, symbol or accent
+def fuzz_lines(line_count):
+    generator = random.Random(12)
+    characters = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ" + " " * 12 + "\t!.,-'éÉ\x00"
+    return [ "".join(generator.choice(characters) for i in range(generator.randint(0, 40))) for line in range(line_count) ]
+
+def time_parse(name, parse, corpus, validate_chars):
+    start = time.perf_counter()
+    for repeat in range(REPEATS):
+        for line in corpus:
+            parse(line, validate_chars)
+    elapsed = (time.perf_counter() - start) / (REPEATS * len(corpus))
+    print(f"{name:>32}: {elapsed * 1e6:8.3f} us per line")
+    return elapsed
+
+def main():
+    # results must match exactly before anything is timed
+    for line in RECORDED_INPUTS + fuzz_lines(FUZZ_LINES):
+        for validate_chars in [ True, False ]:
+            expected = legacy_parse(line, validate_chars)
+            result = textmanager.parse_input(line, validate_chars)
+            if result != expected:
+                raise AssertionError(f"{line!r} validate_chars={validate_chars}: {result!r} != {expected!r}")
+    print(f"parse results match on {len(RECORDED_INPUTS) + FUZZ_LINES} lines in both modes")
+
+    for validate_chars in [ True, False ]:
+        print(f"validate_chars={validate_chars}, {len(RECORDED_INPUTS)} recorded inputs")
+        legacy = time_parse("character by character", legacy_parse, RECORDED_INPUTS, validate_chars)
+        tables = time_parse("translation tables", textmanager.parse_input, RECORDED_INPUTS, validate_chars)
+        print(f"{'speedup':>32}: {legacy / tables:8.1f}x")
+
+if __name__ == '__main__':
+    main()
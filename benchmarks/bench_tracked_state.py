@@ -0,0 +1,59 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+from trackedstate import TrackedState
+
+# Tracked State Benchmark
+# measures the cost of reads and writes on a world which isn't tracking, as when journal saves are off,
+# and on one which is, next to a plain one
+
+NUMBER = 200000
+
+class PlainWorld():
+    def __init__(self):
+        self.cow_push_count = 0
+        self.containers = [ "box" ]
+        self.rooms = { "hall" : [ "kitchen" ] }
+
+class TrackedWorld(TrackedState):
+    def __init__(self):
+        self.cow_push_count = 0
+        self.containers = [ "box" ]
+        self.rooms = { "hall" : [ "kitchen" ] }
+
+OPERATIONS = [
+    ("attribute read", "world.cow_push_count"),
+    ("attribute write", "world.cow_push_count = 5"),
+    ("attribute increment", "world.cow_push_count += 1"),
+    ("list read", "world.containers[0]"),
+    ("list item write", "world.containers[0] = 'box'"),
+    ("list append + pop", "world.containers.append('crate'); world.containers.pop()"),
+    ("dict item write", "world.rooms['hall'] = 'kitchen'"),
+    ("nested list write", "world.rooms['cellar'] = []; world.rooms['cellar'].append('x')") ]
+
+def untracked_world():
+    return TrackedWorld()
+
+def tracked_world():
+    world = TrackedWorld()
+    world.start_tracking()
+    return world
+
+def main():
+    print(f"{'operation':>20} {'plain (ns)':>11} {'not tracking (ns)':>18} {'tracking (ns)':>14} {'overhead (ns)':>14}")
+    for name, statement in OPERATIONS:
+        times = []
+        for make_world in [ PlainWorld, untracked_world, tracked_world ]:
+            world = make_world()
+            times.append(min(timeit.repeat(statement, globals={ "world" : world }, number=NUMBER, repeat=3)) / NUMBER)
+        print(f"{name:>20} {times[0] * 1e9:>11.1f} {times[1] * 1e9:>18.1f} {times[2] * 1e9:>14.1f} {(times[2] - times[0]) * 1e9:>14.1f}")
+
+if __name__ == '__main__':
+    main()
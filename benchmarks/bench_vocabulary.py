@@ -0,0 +1,121 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+from vocabulary import Vocabulary
+from mode import Mode
+
+# Vocabulary Benchmark
+# checks prefix resolution and typo suggestions against a brute force scan of every word,
+# then times them on a mode with a 10k word vocabulary
+
+VOCABULARY_SIZE = 10000
+QUERIES = 2000
+CHECKED_QUERIES = 500
+
+def random_word(generator, letters="abcdefghijklmnopqrstuvwxyz"):
+    return "".join(generator.choice(letters) for i in range(generator.randint(2, 12)))
+
+# edit distance where swapping two neighboring letters is one edit
+def edit_distance(first, second):
+    rows = [ list(range(len(second) + 1)) ]
+    for i in range(1, len(first) + 1):
+        row = [i]
+        for j in range(1, len(second) + 1):
+            cost = 0 if first[i - 1] == second[j - 1] else 1
+            row.append(min(rows[i - 1][j] + 1, row[j - 1] + 1, rows[i - 1][j - 1] + cost))
+            if i > 1 and j > 1 and first[i - 1] == second[j - 2] and first[i - 2] == second[j - 1]:
+                row[j] = min(row[j], rows[i - 2][j - 2] + 1)
+        rows.append(row)
+    return rows[-1][-1]
+
+def brute_resolve(words, prefix):
+    if prefix in words:
+        return prefix
+    matches = [ word for word in words if word.startswith(prefix) ]
+    if len(matches) == 1:
+        return matches[0]
+    return None
+
+def brute_suggest(words, typed, max_distance, max_suggestions):
+    found = sorted([ (edit_distance(typed, word), word) for word in words if word != typed ])
+    return [ word for distance, word in found if distance <= max_distance ][:max_suggestions]
+
+def check_equivalence():
+    generator = random.Random(16)
+    # a small alphabet makes close words common
+    words = set([ random_word(generator, "abcde") for i in range(400) ])
+    vocabulary = Vocabulary(words)
+    for query in range(CHECKED_QUERIES):
+        typed = random_word(generator, "abcdef")[:generator.randint(1, 8)]
+        if vocabulary.resolve(typed) != brute_resolve(words, typed):
+            raise AssertionError(f"resolve({typed!r}): {vocabulary.resolve(typed)!r} != {brute_resolve(words, typed)!r}")
+        for max_distance in [ 1, 2 ]:
+            expected = brute_suggest(words, typed, max_distance, 1000)
+            result = vocabulary.suggest(typed, max_distance, 1000)
+            if result != expected:
+                raise AssertionError(f"suggest({typed!r}, {max_distance}): {result!r} != {expected!r}")
+
+    # removing words leaves the rest as they were
+    removed = sorted(words)[::2]
+    for word in removed:
+        vocabulary.remove(word)
+        words.discard(word)
+    for query in range(CHECKED_QUERIES // 4):
+        typed = random_word(generator, "abcdef")[:generator.randint(1, 8)]
+        if vocabulary.resolve(typed) != brute_resolve(words, typed) or vocabulary.suggest(typed) != brute_suggest(words, typed, 1, 3):
+            raise AssertionError(f"{typed!r} resolves differently after removing words")
+    print(f"resolve and suggest match a brute force scan on {CHECKED_QUERIES} queries")
+
+def time_queries(name, funct, queries):
+    start = time.perf_counter()
+    for query in queries:
+        funct(query)
+    elapsed = (time.perf_counter() - start) / len(queries)
+    print(f"{name:>36}: {elapsed * 1e6:10.2f} us per word")
+    return elapsed
+
+def main():
+    check_equivalence()
+
+    generator = random.Random(17)
+    words = list(set([ random_word(generator) for i in range(VOCABULARY_SIZE) ]))
+    mode = Mode("A very large room.")
+    start = time.perf_counter()
+    for word in words:
+        mode.add_object(word, "Something.")
+    print(f"{len(words)} objects added in {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    # the trie is built the first time a noun is not found exactly
+    start = time.perf_counter()
+    mode.resolve_object("")
+    print(f"{'build trie':>36}: {(time.perf_counter() - start) * 1000:10.2f} ms")
+
+    prefixes = [ word[:generator.randint(1, len(word))] for word in generator.sample(words, QUERIES) ]
+    typos = []
+    for word in generator.sample(words, QUERIES):
+        index = generator.randrange(len(word))
+        typos.append(word[:index] + generator.choice("abcdefghijklmnopqrstuvwxyz") + word[index + 1:])
+
+    print(f"{len(words)} object vocabulary")
+    time_queries("resolve prefix", mode.resolve_object, prefixes)
+    scan = time_queries("brute force scan, one edit", lambda typed: brute_suggest(words, typed, 1, 3), typos[:5])
+    trie = time_queries("trie suggest, one edit", mode.suggest_objects, typos)
+    print(f"{'speedup':>36}: {scan / trie:10.1f}x")
+
+    # changes to the room update the trie in place
+    start = time.perf_counter()
+    for word in words[:1000]:
+        mode.delete_object(word)
+        mode.add_object(word, "Something again.")
+    print(f"{'delete and add object':>36}: {(time.perf_counter() - start) / 1000 * 1e6:10.2f} us")
+
+if __name__ == '__main__':
+    main()
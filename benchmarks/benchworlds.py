@@ -0,0 +1,33 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+import os
+import sys
+import json
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+from worldmanager import WorldManager
+
+# Bench Worlds
+# synthetic worlds shared by the save benchmarks
+
+# each step of build_world adds roughly this many json bytes
+STEP_SIZE = 105
+
+# Build World
+# grows a world with inventories, a room graph and counters until its json is about target_size bytes
+def build_world(target_size):
+    world = WorldManager.World()
+    world.inventory = []
+    world.rooms = {}
+    world.counters = {}
+    world.visits = []
+
+    for i in range((target_size - len(json.dumps(vars(world)))) // STEP_SIZE):
+        world.inventory.append(f"rusty item number {i}")
+        world.rooms[f"room {i}"] = [ f"room {i + 1}", f"room {i * 7 % 1000}" ]
+        world.counters[f"pushed thing {i}"] = i * 3
+        world.visits.append(i)
+    return world
@@ -0,0 +1,306 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+import sys
+import struct
+from array import array
+
+# Binary Format
+# compact binary container for saved member variables
+# a versioned header, then one typed value holding the member variable dict
+#
+# header: magic bytes, format version, flags
+# values: one type byte, then
+#   ints and floats are fixed width, big ints and strings are length-prefixed bytes,
+#   lists and dicts are count-prefixed values
+# lists are stored as columns wherever they can be, so loading is mostly done in bulk:
+#   lists of only ints, floats or strings are packed into typed arrays,
+#   lists of lists keep their lengths in one array and their items in one flat list,
+#   and dicts keep their keys in one string array and their values in one list
+
+MAGIC = b"TADV"
+VERSION = 1
+
+# value types
+NONE_TYPE = 0
+FALSE_TYPE = 1
+TRUE_TYPE = 2
+INT_TYPE = 3
+BIG_INT_TYPE = 4
+FLOAT_TYPE = 5
+STR_TYPE = 6
+LIST_TYPE = 7
+DICT_TYPE = 8
+INT_ARRAY_TYPE = 9
+FLOAT_ARRAY_TYPE = 10
+STR_ARRAY_TYPE = 11
+NESTED_LIST_TYPE = 12
+KEYED_DICT_TYPE = 13
+
+# lists and dicts shorter than this are not worth storing as columns
+MIN_ARRAY_LENGTH = 4
+
+# strings in a string array are joined by this character
+# arrays with a string that contains it are stored as plain lists
+STR_SEPARATOR = "\x00"
+
+_HEADER = struct.Struct("<4sBB")
+_TYPE = struct.Struct("<B")
+_COUNT = struct.Struct("<I")
+_INT = struct.Struct("<q")
+_FLOAT = struct.Struct("<d")
+_COUNT_LENGTH = struct.Struct("<II")
+_TYPE_COUNT = struct.Struct("<BI")
+_TYPE_COUNT_LENGTH = struct.Struct("<BII")
+_TYPE_INT = struct.Struct("<Bq")
+_TYPE_FLOAT = struct.Struct("<Bd")
+
+# arrays are stored little endian on disk
+_SWAP_BYTES = sys.byteorder != "little"
+
+# Is Binary
+# returns True if the bytes begin with this format's magic bytes
+def is_binary(data_bytes):
+    return data_bytes[:len(MAGIC)] == MAGIC
+
+# Encode
+# converts a dict of member variables into binary format bytes
+def encode(member_variables):
+    return b"".join(encode_chunks(member_variables))
+
+# Encode Chunks
+# produces the encoded bytes of a dict of member variables as a list of byte chunks
+def encode_chunks(member_variables):
+    parts = [ _HEADER.pack(MAGIC, VERSION, 0) ]
+    _encode_value(member_variables, parts)
+    return parts
+
+# Decode
+# converts binary format bytes back into a dict of member variables
+# returns None if the bytes are not this format, or are from a newer version
+def decode(data_bytes):
+    if len(data_bytes) < _HEADER.size:
+        return None
+
+    magic, version, flags = _HEADER.unpack_from(data_bytes, 0)
+    if magic != MAGIC or version > VERSION:
+        return None
+
+    value, offset = _decode_value(memoryview(data_bytes), _HEADER.size)
+    return value
+
+# encodes a value onto the end of parts
+def _encode_value(value, parts):
+    value_type = type(value)
+
+    if value_type is str:
+        _encode_str(value, parts)
+    elif value_type is int:
+        _encode_int(value, parts)
+    elif value_type is bool:
+        parts.append(_TYPE.pack(TRUE_TYPE if value else FALSE_TYPE))
+    elif value is None:
+        parts.append(_TYPE.pack(NONE_TYPE))
+    elif value_type is float:
+        parts.append(_TYPE_FLOAT.pack(FLOAT_TYPE, value))
+    elif isinstance(value, dict):
+        _encode_dict(value, parts)
+    elif isinstance(value, (list, tuple)):
+        _encode_list(value, parts)
+    elif isinstance(value, bool):
+        parts.append(_TYPE.pack(TRUE_TYPE if value else FALSE_TYPE))
+    elif isinstance(value, int):
+        _encode_int(int(value), parts)
+    elif isinstance(value, float):
+        parts.append(_TYPE_FLOAT.pack(FLOAT_TYPE, float(value)))
+    elif isinstance(value, str):
+        _encode_str(str(value), parts)
+    else:
+        raise TypeError(f"cannot encode {value_type.__name__} in binary format")
+
+def _encode_int(value, parts):
+    try:
+        parts.append(_TYPE_INT.pack(INT_TYPE, value))
+    except struct.error:
+        # ints too big for 8 bytes are stored as signed bytes
+        length = (value.bit_length() + 8) // 8
+        parts.append(_TYPE_COUNT.pack(BIG_INT_TYPE, length))
+        parts.append(value.to_bytes(length, "little", signed=True))
+
+def _encode_str(value, parts):
+    str_bytes = value.encode('utf-8')
+    parts.append(_TYPE_COUNT.pack(STR_TYPE, len(str_bytes)))
+    parts.append(str_bytes)
+
+def _encode_dict(value, parts):
+    count = len(value)
+
+    # keys are always strings, the same as json
+    keys = [ key if type(key) is str else str(key) for key in value.keys() ]
+    if count >= MIN_ARRAY_LENGTH and _encode_str_array(keys, parts, KEYED_DICT_TYPE) == True:
+        _encode_list(list(value.values()), parts)
+        return
+
+    parts.append(_TYPE_COUNT.pack(DICT_TYPE, count))
+    for key, item in zip(keys, value.values()):
+        key_bytes = key.encode('utf-8')
+        parts.append(_COUNT.pack(len(key_bytes)))
+        parts.append(key_bytes)
+        _encode_value(item, parts)
+
+def _encode_list(value, parts):
+    count = len(value)
+
+    if count >= MIN_ARRAY_LENGTH:
+        item_types = set(map(type, value))
+        if len(item_types) == 1:
+            item_type = item_types.pop()
+            if item_type is str:
+                if _encode_str_array(value, parts, STR_ARRAY_TYPE) == True:
+                    return
+            elif item_type is int:
+                if _encode_number_array(INT_ARRAY_TYPE, 'q', value, parts) == True:
+                    return
+            elif item_type is float:
+                if _encode_number_array(FLOAT_ARRAY_TYPE, 'd', value, parts) == True:
+                    return
+            elif issubclass(item_type, (list, tuple)):
+                _encode_nested_list(value, parts)
+                return
+
+    parts.append(_TYPE_COUNT.pack(LIST_TYPE, count))
+    for item in value:
+        _encode_value(item, parts)
+
+# packs numbers into a typed array
+# returns False if any number does not fit the array type
+def _encode_number_array(array_type, type_code, value, parts):
+    try:
+        numbers = array(type_code, value)
+    except OverflowError:
+        return False
+
+    if _SWAP_BYTES:
+        numbers.byteswap()
+    parts.append(_TYPE_COUNT.pack(array_type, len(value)))
+    parts.append(numbers.tobytes())
+    return True
+
+# joins strings into one block of bytes
+# returns False if any string contains the separator
+def _encode_str_array(value, parts, array_type):
+    joined = STR_SEPARATOR.join(value)
+    if joined.count(STR_SEPARATOR) != len(value) - 1:
+        return False
+
+    str_bytes = joined.encode('utf-8')
+    parts.append(_TYPE_COUNT_LENGTH.pack(array_type, len(value), len(str_bytes)))
+    parts.append(str_bytes)
+    return True
+
+def _encode_nested_list(value, parts):
+    # lengths of every inner list, then all of their items as one list
+    lengths = array('I', map(len, value))
+    if _SWAP_BYTES:
+        lengths.byteswap()
+    parts.append(_TYPE_COUNT.pack(NESTED_LIST_TYPE, len(value)))
+    parts.append(lengths.tobytes())
+
+    flat = []
+    for item in value:
+        flat.extend(item)
+    _encode_list(flat, parts)
+
+# decodes one value at offset, returning the value and the offset after it
+def _decode_value(view, offset):
+    value_type = view[offset]
+    offset += 1
+
+    if value_type == STR_TYPE:
+        length = _COUNT.unpack_from(view, offset)[0]
+        offset += 4
+        return str(view[offset:offset + length], 'utf-8'), offset + length
+    elif value_type == INT_TYPE:
+        return _INT.unpack_from(view, offset)[0], offset + 8
+    elif value_type == NONE_TYPE:
+        return None, offset
+    elif value_type == FALSE_TYPE:
+        return False, offset
+    elif value_type == TRUE_TYPE:
+        return True, offset
+    elif value_type == FLOAT_TYPE:
+        return _FLOAT.unpack_from(view, offset)[0], offset + 8
+    elif value_type == STR_ARRAY_TYPE:
+        return _decode_str_array(view, offset)
+    elif value_type == INT_ARRAY_TYPE:
+        return _decode_number_array('q', view, offset)
+    elif value_type == FLOAT_ARRAY_TYPE:
+        return _decode_number_array('d', view, offset)
+    elif value_type == KEYED_DICT_TYPE:
+        keys, offset = _decode_str_array(view, offset)
+        values, offset = _decode_value(view, offset)
+        return dict(zip(keys, values)), offset
+    elif value_type == NESTED_LIST_TYPE:
+        return _decode_nested_list(view, offset)
+    elif value_type == DICT_TYPE:
+        count = _COUNT.unpack_from(view, offset)[0]
+        offset += 4
+        result = {}
+        for i in range(count):
+            length = _COUNT.unpack_from(view, offset)[0]
+            offset += 4
+            key = str(view[offset:offset + length], 'utf-8')
+            offset += length
+            result[key], offset = _decode_value(view, offset)
+        return result, offset
+    elif value_type == LIST_TYPE:
+        count = _COUNT.unpack_from(view, offset)[0]
+        offset += 4
+        result = []
+        for i in range(count):
+            item, offset = _decode_value(view, offset)
+            result.append(item)
+        return result, offset
+    elif value_type == BIG_INT_TYPE:
+        length = _COUNT.unpack_from(view, offset)[0]
+        offset += 4
+        return int.from_bytes(view[offset:offset + length], "little", signed=True), offset + length
+
+    raise ValueError(f"unknown binary format type {value_type}")
+
+def _decode_number_array(type_code, view, offset):
+    count = _COUNT.unpack_from(view, offset)[0]
+    offset += 4
+    numbers = array(type_code)
+    end = offset + count * numbers.itemsize
+    numbers.frombytes(view[offset:end])
+    if _SWAP_BYTES:
+        numbers.byteswap()
+    return numbers.tolist(), end
+
+def _decode_str_array(view, offset):
+    count, length = _COUNT_LENGTH.unpack_from(view, offset)
+    offset += 8
+    end = offset + length
+    if count == 0:
+        return [], end
+    return str(view[offset:end], 'utf-8').split(STR_SEPARATOR), end
+
+def _decode_nested_list(view, offset):
+    count = _COUNT.unpack_from(view, offset)[0]
+    offset += 4
+    lengths = array('I')
+    end = offset + count * lengths.itemsize
+    lengths.frombytes(view[offset:end])
+    if _SWAP_BYTES:
+        lengths.byteswap()
+
+    flat, end = _decode_value(view, end)
+
+    result = []
+    start = 0
+    for length in lengths:
+        result.append(flat[start:start + length])
+        start += length
+    return result, end
@@ -5,9 +5,12 @@
 import sys
 import time
 import tkinter as tk
+import tkinter.font as tkfont
 from queue import Empty
 from PIL import Image, ImageTk
 
+import textmanager
+
 # Display Manager
 # opens windows to display and run the game
 
@@ -21,6 +24,9 @@ DEFAULT_THEMES = {
     "font_type" : "Times New Roman",
     "normal_size" : 8 }
 
+# text the average character width of the text log is measured on
+WIDTH_SAMPLE = "abcdefghijklmnopqrstuvwxyz, "
+
 # Window
 # default type of window object
 class Window():
@@ -234,6 +240,10 @@ class GameWindow(Window):
         self.text_log.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         self.text_delay = 0.01
 
+        # lists are laid out to the width of the textbox
+        self.text_font = tkfont.Font(font=self.text_log.cget("font"))
+        self.text_log.bind("<Configure>", self.on_resize)
+
         # add scrollbar for the textbox
         self._add_widget(tk.Scrollbar, "normal", self.text_frame,\
             command=self.text_log.yview)
@@ -252,6 +262,7 @@ class GameWindow(Window):
         self.clear_command = "clear"
         self.change_title = "change title:"
         self.change_speed = "change speed:"
+        self.save_report = "save report:"
 
         # wait for call to destroy
         self.gm_thread = thread
@@ -267,10 +278,11 @@ class GameWindow(Window):
         self.text_delay = animation_speed
     
     # setup command queue commands
-    def set_commands(self, clear_command, change_title, change_speed):
+    def set_commands(self, clear_command, change_title, change_speed, save_report):
         self.clear_command = clear_command
         self.change_title = change_title
         self.change_speed = change_speed
+        self.save_report = save_report
 
     # override run
     def run(self):
@@ -309,6 +321,10 @@ class GameWindow(Window):
             if len(command) > len(self.change_speed):
                 if command[:len(self.change_speed)] == self.change_speed:
                     self.text_delay = float(command[len(self.change_speed):])
+
+            if len(command) > len(self.save_report):
+                if command[:len(self.save_report)] == self.save_report:
+                    self.show_report(command[len(self.save_report):])
         except Empty:
             pass
         finally:
@@ -317,6 +333,13 @@ class GameWindow(Window):
     def wake(self, event):
         self.entry_bar.focus_set()
 
+    # report how many characters fit on a line of the textbox
+    def on_resize(self, event):
+        border = int(self.text_log.cget("borderwidth")) + int(self.text_log.cget("highlightthickness"))\
+            + int(self.text_log.cget("padx"))
+        char_size = self.text_font.measure(WIDTH_SAMPLE) / len(WIDTH_SAMPLE)
+        textmanager.set_window_width(max(1, int((event.width - 2 * border) / char_size)))
+
     # if thread closes, destroy window
     def wait_for_destroy(self):
         if self.gm_thread.is_alive() == True:
@@ -382,29 +405,32 @@ class GameWindow(Window):
         self.entry_bar.insert(tk.END, "== Press Enter to Continue ==")
         self.entry_bar.config(state=tk.DISABLED) # wait to clear screen until input is buffered
     
+    # print a background report into the log without animating it
+    def show_report(self, text):
+        self.text_log.config(state=tk.NORMAL)
+        self.text_log.insert(tk.END, f"[{text}]\n")
+        self.text_log.see(tk.END)
+        self.text_log.config(state=tk.DISABLED)
+
     # animate text updates
+    # a character at a time, until done or interrupted, then the rest at once
+    # the game flushes a whole turn of text in one write, so this must not recur per character
     def animate(self, text):
-        if self._is_animating == False:
+        index = 0
+        while self._is_animating == True and index < len(text) - 1:
             self.text_log.config(state=tk.NORMAL)
-            self.text_log.insert(tk.END, f"{text}")
+            self.text_log.insert(tk.END, f"{text[index]}")
             self.text_log.see(tk.END)
             self.text_log.config(state=tk.DISABLED)
-            self.color_text(self.entry_bar)
-            return
-        
+            time.sleep(self.text_delay)
+            index += 1
+
+        # terminal is done typing
         self.text_log.config(state=tk.NORMAL)
-        self.text_log.insert(tk.END, f"{text[0]}")
+        self.text_log.insert(tk.END, f"{text[index:]}")
         self.text_log.see(tk.END)
         self.text_log.config(state=tk.DISABLED)
-
-        if len(text) == 1:
-            # terminal is done typing
-            self.color_text(self.entry_bar)
-            self._is_animating = False
-            return
-        
-        time.sleep(self.text_delay)
-        self.animate(text[1:])
+        self.color_text(self.entry_bar)
     
     def color_text(self, text_widget):
         text_widget.config(background=self.game_themes["flash_color"])
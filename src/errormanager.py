@@ -2,9 +2,14 @@
 # 06-10-2024
 # Brian Morris
 
+import os
 import sys
-import inspect
+import json
+import time
+import atexit
+import threading
 from datetime import datetime
+from json.encoder import encode_basestring_ascii
 
 import filemanager
 
@@ -12,6 +17,240 @@ import filemanager
 # stores and logs error reports
 # gracefully handles any crashes
 
+# records are buffered, and written in batches by a background thread
+FLUSH_INTERVAL = 1.0 # seconds between writes while errors are waiting
+FLUSH_RECORDS = 1024 # waiting errors which wake the writer early
+MAX_PENDING_RECORDS = 10000 # errors past this many waiting are counted, then dropped
+
+# repeats of an error waiting to be written are counted on it rather than written again
+# and each error is written at most this many times per window, later repeats are held and counted
+RATE_LIMIT = 5
+RATE_WINDOW = 60.0 # seconds
+
+# the error log is moved aside when it grows too large or too old
+LOG_MAX_BYTES = 1024 * 1024
+LOG_MAX_AGE = 7 * 24 * 60 * 60 # seconds
+LOG_BACKUPS = 3
+
+# Error Record
+# one logged error, and how many times it happened
+# only the code object and line are captured when logging, the source is worked out when written
+class ErrorRecord():
+    __slots__ = ( "key", "time", "last_time", "count", "code", "line_number", "source_text", "error_type", "message" )
+
+    def __init__(self, time, code, line_number, error_type, message, source_text=None, key=None):
+        self.key = key # what repeats of this error have in common
+        self.time = time
+        self.last_time = time
+        self.count = 1
+        self.code = code
+        self.line_number = line_number
+        self.source_text = source_text
+        self.error_type = error_type
+        self.message = message
+
+    # Source
+    # returns where the error was logged from, as file/class: function line number
+    def source(self):
+        if self.source_text == None:
+            self.source_text = _source_of(self.code, self.line_number)
+        return self.source_text
+
+    # To Line
+    # returns the record as one line of json, times are kept to the millisecond
+    # records always have the same fields, so the line is built directly rather than through json.dumps
+    def to_line(self):
+        line = (f"{{\"time\": {self.time:.3f}, \"source\": {encode_basestring_ascii(self.source())}, "
+            f"\"type\": {encode_basestring_ascii(self.error_type)}, \"message\": {encode_basestring_ascii(self.message)}")
+        if self.count > 1:
+            line += f", \"count\": {self.count}, \"last_time\": {self.last_time:.3f}"
+        return line + "}\n"
+
+    def __str__(self):
+        current_time = datetime.fromtimestamp(self.time).strftime("%Y-%m-%d %H:%M:%S")
+        error_report = f"ERROR\nfrom source {self.source()} at time {current_time}.\n"
+        error_report += f"Reported as {self.error_type}: {self.message}.\n"
+        if self.count > 1:
+            last_time = datetime.fromtimestamp(self.last_time).strftime("%Y-%m-%d %H:%M:%S")
+            error_report += f"Repeated {self.count} times, last at time {last_time}.\n"
+        return error_report
+
+# Error Log
+# buffers error records in memory and writes them to the error log in batches
+# each record is written as one line of json, so the log can be read back a line at a time
+class ErrorLog():
+    def __init__(self, flush_interval=FLUSH_INTERVAL, flush_records=FLUSH_RECORDS, max_pending=MAX_PENDING_RECORDS):
+        self.flush_interval = flush_interval
+        self.flush_records = flush_records
+        self.max_pending = max_pending
+
+        # records waiting to be written, and how many did not fit
+        self.__pending = []
+        self.__dropped = 0
+        self.__lock = threading.Lock()
+
+        # records still counting repeats by error, waiting or held back by the rate limit
+        self.__open = {}
+        self.__held = {}
+        # start time and records written of each error's rate limit window
+        self.__windows = {}
+        self.__last_sweep = time.time()
+
+        # only one batch is written at a time, by the thread or by flush
+        self.__write_lock = threading.Lock()
+        self.__log_started = None # time of the first record in the current log
+
+        self.__wake = threading.Event()
+        self.__is_closed = False
+        self.__thread = threading.Thread(target=self.__run)
+        self.__thread.daemon = True
+        self.__thread.start()
+
+    # Add
+    # queues one error to be written, or counts it on the same error still waiting
+    # errors are the same if they come from the same line with the same type and message
+    def add(self, code, line_number, error_type, message):
+        current_time = time.time()
+        key = (code.co_filename, line_number, error_type, message) # file names hash faster than code objects
+
+        with self.__lock:
+            record = self.__open.get(key)
+            if record != None:
+                record.count += 1
+                record.last_time = current_time
+                return
+
+            record = ErrorRecord(current_time, code, line_number, error_type, message, None, key)
+
+            window = self.__windows.get(key)
+            if window == None or current_time - window[0] > RATE_WINDOW:
+                window = [ current_time, 0 ]
+                self.__windows[key] = window
+            if window[1] >= RATE_LIMIT:
+                # written too often lately, count repeats until the window ends
+                self.__open[key] = record
+                self.__held[key] = record
+                return
+
+            if len(self.__pending) >= self.max_pending:
+                self.__dropped += 1
+                return
+
+            window[1] += 1
+            self.__open[key] = record
+            self.__pending.append(record)
+            is_full = len(self.__pending) >= self.flush_records
+
+        if is_full == True:
+            self.__wake.set()
+
+    # Flush
+    # writes every waiting record now, along with held records whose rate limit window is over
+    def flush(self, is_releasing_all=False):
+        with self.__write_lock:
+            records = self.__take_records(is_releasing_all)
+            if len(records) != 0:
+                self.__write(records)
+
+    # Close
+    # writes everything still waiting or held, then stops the writer thread
+    def close(self):
+        if self.__is_closed == True:
+            return
+
+        self.__is_closed = True
+        self.__wake.set()
+        self.__thread.join()
+        self.flush(True)
+
+    def __take_records(self, is_releasing_all):
+        current_time = time.time()
+
+        with self.__lock:
+            records = self.__pending
+            dropped = self.__dropped
+            self.__pending = []
+            self.__dropped = 0
+
+            # records being written stop counting repeats
+            for record in records:
+                del self.__open[record.key]
+
+            # held records are written once their window is over, starting a new window
+            for key, record in list(self.__held.items()):
+                if current_time - self.__windows[key][0] > RATE_WINDOW or is_releasing_all == True:
+                    del self.__held[key]
+                    del self.__open[key]
+                    self.__windows[key] = [ current_time, 1 ]
+                    records.append(record)
+
+            # windows which are over are forgotten, checked once a window so floods of distinct errors stay cheap
+            if current_time - self.__last_sweep > RATE_WINDOW:
+                self.__last_sweep = current_time
+                for key, window in list(self.__windows.items()):
+                    if current_time - window[0] > RATE_WINDOW and key not in self.__held:
+                        del self.__windows[key]
+
+        if dropped != 0:
+            records.append(ErrorRecord(current_time, None, None, "LogOverflow", f"{dropped} errors were dropped", "error log"))
+        return records
+
+    # writer thread loop
+    def __run(self):
+        while self.__is_closed == False:
+            self.__wake.wait(self.flush_interval)
+            self.__wake.clear()
+            try:
+                self.flush()
+            except OSError as error:
+                print(f"Could not write error log: {error}", file=sys.stderr)
+
+    def __write(self, records):
+        log_bytes = "".join([ record.to_line() for record in records ]).encode('utf-8')
+
+        # age is measured from the first record in the log
+        if self.__log_started == None:
+            first_record = _parse_record(next(filemanager.read_logs(True), None))
+            self.__log_started = records[0].time if first_record == None else first_record.time
+
+        if time.time() - self.__log_started > LOG_MAX_AGE:
+            self.__rotate(records)
+
+        log_size = filemanager.add_log(log_bytes)
+
+        if log_size > LOG_MAX_BYTES:
+            self.__rotate(None)
+
+    def __rotate(self, records):
+        filemanager.rotate_logs(LOG_BACKUPS)
+        self.__log_started = None if records == None else records[0].time
+
+# the error log every error is sent to, started on the first error
+_error_log = None
+_error_log_lock = threading.Lock()
+
+def _get_error_log():
+    global _error_log
+
+    if _error_log == None:
+        with _error_log_lock:
+            if _error_log == None:
+                _error_log = ErrorLog()
+                atexit.register(_error_log.close) # errors still waiting are written on exit
+    return _error_log
+
+# Forget Error Log
+# drops the error log this process was handed by its parent, so it starts one of its own on its first error
+# a forked process has no writer thread, and may have been forked while another thread held the lock
+def forget_error_log():
+    global _error_log, _error_log_lock
+    _error_log = None
+    _error_log_lock = threading.Lock()
+
+# fork is only found on unix
+if hasattr(os, "register_at_fork") == True:
+    os.register_at_fork(after_in_child=forget_error_log)
+
 # Log Error
 # store a thrown exception to be reported later
 # takes an exception-type report
@@ -19,48 +258,80 @@ def log_error(exception_reported):
     # ensure argument is an exception
     if isinstance(exception_reported, Exception) == False:
         exception_reported = Exception("log-error requires an exception as input")
-    
-    # get the current date and time
-    current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-    # get source of the error
-    caller_frame = inspect.currentframe().f_back
-
-    filename = caller_frame.f_code.co_filename
-    caller_class = caller_frame.f_locals.get('self', None).__class__.__name__
-    function_name = caller_frame.f_code.co_filename
-    line_number = caller_frame.f_lineno
-
-    source = f"{filename}/{caller_class}: {function_name} line {line_number}"
-
-    # get the type of exception
-    error_type = type(exception_reported).__name__
-
-    # create log
-    error_report = f"ERROR\nfrom source {source} at time {current_time}.\n"
-    error_report += f"Reported as {error_type}: {str(exception_reported)}.\n"
+    # get source of the error, the code and line are enough to work out the rest later
+    caller_frame = sys._getframe(1)
 
     # store error
-    filemanager.add_log(error_report)
+    _get_error_log().add(caller_frame.f_code, caller_frame.f_lineno, type(exception_reported).__name__, str(exception_reported))
+
+# Flush Errors
+# writes every error still waiting to the error log
+def flush_errors():
+    if _error_log != None:
+        _error_log.flush()
 
 # Close Program
 # gracefully handle a fatal error and exit the program
 def close_program():
     # log a fatal error
     log_error(Exception("fatal error encountered"))
-        
+    flush_errors()
+
     # gracefully exit program
     sys.exit(1)
 
+# Read Errors
+# yields every logged error as an error record, oldest first, reading the log one line at a time
+def read_errors():
+    flush_errors()
+
+    for line in filemanager.read_logs():
+        record = _parse_record(line)
+        if record != None:
+            yield record
+
 # view all current errors with stderr
 def inspect_errors():
-    # get the log from file
-    logs = filemanager.read_data(filemanager.ERROR_LOG, list)
+    # send all errors in log to sderr
+    for error_record in read_errors():
+        print(error_record, file=sys.stderr)
 
-    # if there were no logs, or file is missing, return
-    if logs == None:
-        return
+# returns the record on a line of the error log, or None if there is no line or it is broken
+def _parse_record(line):
+    if line == None:
+        return None
+    try:
+        fields = json.loads(line)
+    except ValueError:
+        return None # line cut short by a crash
+    if isinstance(fields, dict) == False:
+        return None
 
-    # send all errors in log to sderr
-    for error_report in logs:
-        print(error_report, file=sys.stderr)
+    record = ErrorRecord(fields.get("time", 0), None, None, str(fields.get("type")), str(fields.get("message")), str(fields.get("source")))
+    record.last_time = fields.get("last_time", record.time)
+    record.count = fields.get("count", 1)
+    return record
+
+# sources by code object and line, since errors come from few places
+_sources = {}
+
+def _source_of(code, line_number):
+    source = _sources.get((code, line_number))
+    if source == None:
+        if code == None:
+            source = "unknown source"
+        else:
+            class_name, function_name = _split_qualname(getattr(code, "co_qualname", code.co_name))
+            source = f"{code.co_filename}/{class_name}: {function_name} line {line_number}"
+        _sources[(code, line_number)] = source
+    return source
+
+# splits a qualified function name into its class and function names
+# functions outside of a class have no class name
+def _split_qualname(qualname):
+    qualname = qualname.rpartition("<locals>.")[2]
+    class_name, separator, function_name = qualname.rpartition(".")
+    if class_name == "":
+        return None, function_name
+    return class_name, function_name
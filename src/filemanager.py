@@ -4,11 +4,20 @@
 
 import os
 import json
+import stat
+import zlib
+import lzma
+import tempfile
+import threading
+
+import binaryformat
+import schema
 
 # initialize paths
 PROJECT_ROOT = os.path.abspath(os.path.join( os.path.dirname(os.path.abspath(__file__)), os.pardir))
 DATA_PATH = "data"
 SAVES_PATH = "saves"
+SESSIONS_PATH = "sessions" # hibernating games, never indexed
 SOURCE_PATH = "src" # path is ignored when modifying files, and added to file_dependencies
 TEST_PATH = "test"
 CACHE = "__pycache__"
@@ -17,12 +26,80 @@ CACHE = "__pycache__"
 MAIN_SHELL = "main.sh"
 FILE_DEPENDENCIES = [ MAIN_SHELL ]
 CURRENT_CONFIG = "current.config"
+SAVE_CATALOG = "saves.catalog"
 ERROR_LOG = "error.log"
 
+# temporary files are written beside their target, then renamed over it
+TEMP_SUFFIX = ".tmp"
+
+# journals of changes since a save's last full write sit beside the save
+JOURNAL_SUFFIX = ".journal"
+
+# save file formats
+FORMAT_JSON = "json"
+FORMAT_BINARY = "binary"
+SAVE_FORMATS = [ FORMAT_JSON, FORMAT_BINARY ]
+BINARY_EXTENSION = ".tadv" # saves with this extension are always binary
+
+# save compression methods
+COMPRESSION_NONE = "none"
+COMPRESSION_ZLIB = "zlib" # written with a gzip header
+COMPRESSION_LZMA = "lzma" # written as xz
+COMPRESSION_METHODS = [ COMPRESSION_NONE, COMPRESSION_ZLIB, COMPRESSION_LZMA ]
+COMPRESSION_LEVELS = { COMPRESSION_NONE : [ 0 ], COMPRESSION_ZLIB : list(range(0, 10)), COMPRESSION_LZMA : list(range(0, 10)) }
+DEFAULT_COMPRESSION_LEVEL = 6
+
+# compressed files are told apart from uncompressed ones by these magic bytes
+GZIP_MAGIC = b"\x1f\x8b"
+XZ_MAGIC = b"\xfd7zXZ\x00"
+GZIP_WBITS = 31
+
+# compressed files are read and written in pieces of this size
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# write durability levels
+DURABILITY_NONE = 0 # rename into place, the system flushes to disk whenever it likes
+DURABILITY_FILE = 1 # flush file contents to disk before renaming
+DURABILITY_DIRECTORY = 2 # also flush the folder, so the rename itself survives a power loss
+DURABILITY_LEVELS = [ DURABILITY_NONE, DURABILITY_FILE, DURABILITY_DIRECTORY ]
+
+# file index of file name : list of paths, built on first lookup
+_file_index = None
+
+# guards save catalogs, which are written from the save writer thread
+_catalog_lock = threading.RLock()
+
+# number of entries in each journal that has been read or appended to, by save file name
+_journal_entries = {}
+
+# durability used by every write
+_durability = DURABILITY_FILE
+
+# format used to write saves
+_save_format = FORMAT_JSON
+
+# the umask new files are made under
+# it can only be read by setting it, so it is read once here, before any other thread could be making files
+_umask = os.umask(0)
+os.umask(_umask)
+
+# compression used to write saves
+_compression = COMPRESSION_NONE
+_compression_level = DEFAULT_COMPRESSION_LEVEL
+
 # File Manager
 # handles all file i/o operations
 # ensures file validity, and no duplicate files exist
 
+# save catalog data struct
+# records every save's file name, size, modification time and summary by save name
+# lets startup and the load menu skip opening individual save files
+class SaveCatalog():
+    def __init__(self):
+        self.saves = {}
+
+schema.register(SaveCatalog)
+
 # Validate Files
 # ensures a list of files mandetory for program function do exist
 # returns a 1 if they don't, and a 0 if they do
@@ -35,7 +112,11 @@ def validate_files():
     # add project source files
     project_files = [ "main.py", "mode.py", "gamemanager.py",
         "errormanager.py", "filemanager.py", "textmanager.py",
-        "worldmanager.py", "displaymanager.py" ]
+        "worldmanager.py", "displaymanager.py", "binaryformat.py",
+        "savewriter.py", "trackedstate.py", "schema.py",
+        "namemanager.py", "outputchannel.py", "vocabulary.py", "results.py",
+        "headless.py", "gameserver.py", "sessionrouter.py",
+        "hibernation.py" ]
     for file in project_files:
         files_to_validate.append(os.path.join(PROJECT_ROOT, SOURCE_PATH, file))
 
@@ -49,26 +130,58 @@ def validate_files():
     return 0
 
 # Add Log
-# used to append a new error log to the report file
+# used to append a batch of encoded error records to the report file
 # if the error log file does not exist, make it
-def add_log(error_report):
-    found_path = locate_file(ERROR_LOG)
-
-    if found_path == None:
-        found_path = os.path.join(PROJECT_ROOT, DATA_PATH, ERROR_LOG)
-        # create empty error log file
-        with open(found_path, 'wb') as f:
-            pass
+# returns the size of the error log after writing
+def add_log(log_bytes):
+    log_path = locate_file(ERROR_LOG)
     
-    # convert the error_report into a json string
-    json_string = json.dumps(error_report)
+    # finally, write bytes onto the end of the file, creating it if needed
+    with open(log_path, 'ab') as file:
+        file.write(log_bytes)
+        log_size = file.tell()
     
-    # Convert the json string to bytes
-    json_bytes = json_string.encode('utf-8')
-
-    # finally, write bytes into the file
-    with open(file_path, 'ab') as file:
-        file.write(json_bytes)
+    return log_size
+
+# Rotate Logs
+# moves the error log aside as its newest backup, shifting older backups along
+# the oldest backup past backup_count is removed
+def rotate_logs(backup_count):
+    log_paths = _log_paths(backup_count + 1)
+
+    for index in range(len(log_paths) - 1, 0, -1):
+        if os.path.isfile(log_paths[index - 1]):
+            os.replace(log_paths[index - 1], log_paths[index])
+
+    if backup_count == 0 and os.path.isfile(log_paths[0]):
+        os.remove(log_paths[0])
+
+# Read Logs
+# yields every line of the error log and its backups, oldest first, one line at a time
+# only the current log is read if is_current_only is True
+def read_logs(is_current_only=False):
+    log_paths = [ locate_file(ERROR_LOG) ]
+    if is_current_only == False:
+        log_paths = _log_paths(None)
+
+    for log_path in reversed(log_paths):
+        if os.path.isfile(log_path) == False:
+            continue
+        with open(log_path, 'rb') as file:
+            for line in file:
+                yield line
+
+# returns the paths of the error log and its backups, newest first
+# backups are counted up to path_count paths, or until one is missing if path_count is None
+def _log_paths(path_count):
+    log_path = locate_file(ERROR_LOG)
+    log_paths = [ log_path ]
+    while path_count == None or len(log_paths) < path_count:
+        backup_path = f"{log_path}.{len(log_paths)}"
+        if path_count == None and os.path.isfile(backup_path) == False:
+            break
+        log_paths.append(backup_path)
+    return log_paths
 
 # Add Save
 # adds a new file to the saves folder using world.data
@@ -82,7 +195,8 @@ def add_save(file_name, world_data):
     # build a new file in the saves folder in data
     found_path = os.path.join(PROJECT_ROOT, DATA_PATH, SAVES_PATH, file_name)
     
-    _write_json_object(found_path, world_data)
+    _write_object(found_path, world_data)
+    _index_add(found_path)
 
     return 0
 
@@ -99,6 +213,7 @@ def add_config(new_data):
     found_path = os.path.join(PROJECT_ROOT, DATA_PATH, CURRENT_CONFIG)
 
     _write_json_object(found_path, new_data)
+    _index_add(found_path)
     
     return 0
 
@@ -112,6 +227,7 @@ def delete_file(file_name):
         return 1 # cannot delete file
     
     os.remove(found_path)
+    _index_remove(found_path)
     return 0 # successful deletion
 
 # Write Data
@@ -124,25 +240,383 @@ def write_data(file_name, data):
     if found_path == None or not os.path.exists(found_path):
         return 1 # cannot write to file
     
-    _write_json_object(found_path, data)
+    _write_object(found_path, data)
     
     return 0
 
+# Read Save
+# reads a save's last full write, then replays every entry of its journal on top of it
+# returns None if there was no valid save found
+def read_save(file_name, expected_type):
+    data = read_data(file_name, expected_type)
+
+    if data == None:
+        return None
+    
+    entries = 0
+    journal_path = _journal_path(file_name)
+    if journal_path != None:
+        with open(journal_path, 'rb') as file:
+            for line in file:
+                try:
+                    changes = json.loads(line)
+                except ValueError:
+                    break # entry cut short by a crash, nothing after it was written
+                schema.apply(data, changes)
+                entries += 1
+    _journal_entries[file_name] = entries
+    
+    return data
+
+# Append Journal
+# appends one entry of changed member variables to a save's journal, creating the journal if needed
+# returns the number of entries and bytes in the journal, or None, None if the save does not exist
+def append_journal(file_name, changes):
+    found_path = locate_file(file_name)
+
+    if found_path == None:
+        return None, None # nothing to journal against
+    
+    journal_path = found_path + JOURNAL_SUFFIX
+    if file_name not in _journal_entries:
+        # count entries left by an earlier session
+        _journal_entries[file_name] = 0
+        if os.path.isfile(journal_path):
+            with open(journal_path, 'rb') as file:
+                _journal_entries[file_name] = sum(1 for line in file)
+    
+    # one line of json per entry
+    json_bytes = json.dumps(changes).encode('utf-8') + b"\n"
+
+    with open(journal_path, 'ab') as file:
+        file.write(json_bytes)
+        if _durability >= DURABILITY_FILE:
+            file.flush()
+            os.fsync(file.fileno())
+        size = file.tell()
+    _index_add(journal_path)
+    
+    _journal_entries[file_name] += 1
+    return _journal_entries[file_name], size
+
+# Compact Journal
+# folds a save's journal into a new full write of the save, then removes the journal
+# returns 1 if the save could not be read, 0 if successful
+def compact_journal(file_name, expected_type):
+    data = read_save(file_name, expected_type)
+
+    if data == None:
+        return 1
+    
+    write_data(file_name, data)
+    _remove_journal(file_name)
+    return 0
+
+# Write Save
+# writes a full save, creating it if needed, and removes its journal which the write replaces
+def write_save(file_name, data):
+    if add_save(file_name, data) != 0:
+        write_data(file_name, data)
+    _remove_journal(file_name)
+
+# Delete Save
+# deletes a save file along with its journal
+# returns 1 if you cannot perform deletion, returns 0 if successful
+def delete_save(file_name):
+    _remove_journal(file_name)
+    return delete_file(file_name)
+
+# finds the path to a save's journal
+# returns None if the save has no journal
+def _journal_path(file_name):
+    found_path = locate_file(file_name)
+    if found_path == None or not os.path.isfile(found_path + JOURNAL_SUFFIX):
+        return None
+    return found_path + JOURNAL_SUFFIX
+
+def _remove_journal(file_name):
+    journal_path = _journal_path(file_name)
+    if journal_path != None:
+        os.remove(journal_path)
+        _index_remove(journal_path)
+    _journal_entries[file_name] = 0
+
+# Read Catalog
+# reads the save catalog from the data folder
+# returns an empty catalog if there is no catalog file yet
+def read_catalog():
+    catalog_path = os.path.join(PROJECT_ROOT, DATA_PATH, SAVE_CATALOG)
+
+    if not os.path.isfile(catalog_path):
+        return SaveCatalog()
+    
+    catalog = _read_json_object(catalog_path, SaveCatalog)
+
+    if catalog == None:
+        return SaveCatalog()
+    
+    return catalog
+
+# Sync Catalog
+# checks every catalog entry against one listing of the saves folder
+# drops entries whose file is gone, refreshes size and modification time, and rewrites the catalog if it changed
+def sync_catalog(catalog):
+    saves_path = os.path.join(PROJECT_ROOT, DATA_PATH, SAVES_PATH)
+
+    # list saves folder once
+    listing = {}
+    if os.path.isdir(saves_path):
+        with os.scandir(saves_path) as entries:
+            for entry in entries:
+                listing[entry.name] = entry
+    
+    with _catalog_lock:
+        changed = False
+        valid_saves = {}
+        for save_name, record in catalog.saves.items():
+            entry = listing.get(record["file"])
+            if entry == None or not entry.is_file():
+                changed = True
+                continue # save is no longer on disk
+            
+            stats = entry.stat()
+            if record["size"] != stats.st_size or record["mtime"] != stats.st_mtime:
+                record["size"] = stats.st_size
+                record["mtime"] = stats.st_mtime
+                changed = True
+            valid_saves[save_name] = record
+        catalog.saves = valid_saves
+
+        if changed == True:
+            write_catalog(catalog)
+
+# Catalog Add
+# records a save and its summary in memory, before its file is written
+def catalog_add(catalog, save_name, file_name, summary):
+    with _catalog_lock:
+        record = catalog.saves.get(save_name)
+        if record == None or record["file"] != file_name:
+            record = { "file" : file_name, "size" : None, "mtime" : None, "summary" : summary }
+        else:
+            record = dict(record, summary=summary)
+        catalog.saves[save_name] = record
+
+# Catalog Save
+# records the size and modification time of a save file which was just written, and rewrites the catalog
+def catalog_save(catalog, save_name):
+    with _catalog_lock:
+        record = catalog.saves.get(save_name)
+        if record == None:
+            return # save was removed before its file was written
+        
+        found_path = locate_file(record["file"])
+        if found_path != None:
+            stats = os.stat(found_path)
+            record["size"] = stats.st_size
+            record["mtime"] = stats.st_mtime
+        
+        write_catalog(catalog)
+
+# Catalog Remove
+# forgets a save which was deleted
+def catalog_remove(catalog, save_name):
+    with _catalog_lock:
+        if catalog_forget(catalog, save_name) == None:
+            return
+        
+        write_catalog(catalog)
+
+# Catalog Forget
+# forgets a save in memory, leaving the catalog file to be rewritten later
+# returns the save's record, or None if it was not in the catalog
+def catalog_forget(catalog, save_name):
+    with _catalog_lock:
+        return catalog.saves.pop(save_name, None)
+
+# Write Catalog
+# overwrites the save catalog file, creating it if it is missing
+def write_catalog(catalog):
+    catalog_path = os.path.join(PROJECT_ROOT, DATA_PATH, SAVE_CATALOG)
+    with _catalog_lock:
+        _write_json_object(catalog_path, catalog)
+        _index_add(catalog_path)
+
 # writes a classed object into a file using json by breaking it up into strings
-# reverse this process to read an object... need a dict of name:class_types to reference!!!
+# reverse this process to read an object, using the class_type's schema
 def _write_json_object(file_path, classed_object):
     # retrive object's member variables
-    member_variables = vars(classed_object)
+    member_variables = schema.dump(classed_object)
 
-    # convert this dict into a json string
-    json_string = json.dumps(member_variables)
+    # finally, write json bytes into the file as they are made
+    _write_atomic(file_path, _json_chunks(member_variables))
 
-    # Convert the json string to bytes
-    json_bytes = json_string.encode('utf-8')
+# converts a dict into json bytes one member variable at a time
+# produces the same bytes as encoding the whole dict at once
+def _json_chunks(member_variables):
+    separator = b"{"
+    for key, value in member_variables.items():
+        json_string = f"{json.dumps(key)}: {json.dumps(value)}"
+        yield separator + json_string.encode('utf-8')
+        separator = b", "
+    
+    if separator == b"{":
+        yield b"{}"
+    else:
+        yield b"}"
 
-    # finally, write bytes into the file
-    with open(file_path, 'wb') as file:
-        file.write(json_bytes)
+# writes a classed object into a file in whichever format and compression the file should use
+# saves use the save format, or binary if they have the binary extension, everything else uses json
+def _write_object(file_path, classed_object):
+    # retrive object's member variables
+    member_variables = schema.dump(classed_object)
+
+    # convert this dict into bytes using the file's format
+    if _format_for(file_path) == FORMAT_BINARY:
+        chunks = binaryformat.encode_chunks(member_variables)
+    else:
+        chunks = _json_chunks(member_variables)
+    
+    # compress bytes as they are written
+    if _compression_for(file_path) != COMPRESSION_NONE:
+        chunks = _compress_chunks(chunks, _compression, _compression_level)
+    
+    _write_atomic(file_path, chunks)
+
+# compresses a stream of byte chunks
+# small chunks are gathered up so the compressor works on large pieces
+def _compress_chunks(chunks, compression, level):
+    if compression == COMPRESSION_LZMA:
+        compressor = lzma.LZMACompressor(format=lzma.FORMAT_XZ, preset=level)
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, GZIP_WBITS)
+    
+    pending = []
+    pending_size = 0
+    for chunk in chunks:
+        pending.append(chunk)
+        pending_size += len(chunk)
+        if pending_size < STREAM_CHUNK_SIZE:
+            continue
+        
+        compressed = compressor.compress(b"".join(pending))
+        pending = []
+        pending_size = 0
+        if len(compressed) != 0:
+            yield compressed
+    
+    if pending_size != 0:
+        yield compressor.compress(b"".join(pending))
+    yield compressor.flush()
+
+# decides the compression a file is written with
+def _compression_for(file_path):
+    saves_path = os.path.join(PROJECT_ROOT, DATA_PATH, SAVES_PATH)
+    if os.path.dirname(file_path) == saves_path:
+        return _compression
+    
+    return COMPRESSION_NONE
+
+# decides the format a file is written in
+def _format_for(file_path):
+    if file_path.endswith(BINARY_EXTENSION):
+        return FORMAT_BINARY
+    
+    saves_path = os.path.join(PROJECT_ROOT, DATA_PATH, SAVES_PATH)
+    if os.path.dirname(file_path) == saves_path:
+        return _save_format
+    
+    return FORMAT_JSON
+
+# Set Save Format
+# chooses the format new saves are written in
+# returns 1 if the format is not a save format, 0 if successful
+def set_save_format(save_format):
+    global _save_format
+
+    if save_format not in SAVE_FORMATS:
+        return 1
+    
+    _save_format = save_format
+    return 0
+
+# Set Compression
+# chooses how new saves are compressed, and how hard the compressor works
+# returns 1 if the method or level is not supported, 0 if successful
+def set_compression(compression, level=DEFAULT_COMPRESSION_LEVEL):
+    global _compression
+    global _compression_level
+
+    if compression not in COMPRESSION_METHODS:
+        return 1
+    
+    if compression == COMPRESSION_NONE:
+        level = 0
+    elif level not in COMPRESSION_LEVELS[compression]:
+        return 1
+    
+    _compression = compression
+    _compression_level = level
+    return 0
+
+# Set Durability
+# chooses how much flushing to disk every write performs
+# returns 1 if the level is not a durability level, 0 if successful
+def set_durability(level):
+    global _durability
+
+    if level not in DURABILITY_LEVELS:
+        return 1
+    
+    _durability = level
+    return 0
+
+# writes chunks of bytes into a temporary file beside the target, then renames it over the target
+# a crash mid-write leaves either the old file or the new file, never a truncated one
+def _write_atomic(file_path, chunks):
+    directory, file_name = os.path.split(file_path)
+    descriptor, temp_path = tempfile.mkstemp(prefix=f".{file_name}.", suffix=TEMP_SUFFIX, dir=directory)
+
+    try:
+        # mkstemp makes files only their owner can read, so the file keeps the mode open() would have given it
+        if hasattr(os, "fchmod") == True:
+            os.fchmod(descriptor, _file_mode(file_path))
+        with os.fdopen(descriptor, 'wb') as file:
+            for chunk in chunks:
+                file.write(chunk)
+            if _durability >= DURABILITY_FILE:
+                file.flush()
+                os.fsync(file.fileno())
+        os.replace(temp_path, file_path)
+    except BaseException:
+        # never leave a half written temporary file behind
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    if _durability >= DURABILITY_DIRECTORY:
+        _fsync_directory(directory)
+
+# returns the mode a file being replaced already has, or the mode a new file is given under the umask
+def _file_mode(file_path):
+    try:
+        return stat.S_IMODE(os.stat(file_path).st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~_umask
+
+# flushes a folder's entries to disk
+# some systems cannot open folders, and they are skipped
+def _fsync_directory(directory):
+    try:
+        descriptor = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    
+    try:
+        os.fsync(descriptor)
+    except OSError:
+        pass
+    finally:
+        os.close(descriptor)
 
 # reads a classed object from a file using json
 # returns 'None' if no classed object can be constructed with file data
@@ -162,14 +636,61 @@ def _read_json_object(file_path, class_type):
     # convert the json string back into a dict
     member_variables = json.loads(json_string)
 
-    # create new object using given type
-    new_object = class_type()
+    return _build_object(member_variables, class_type)
 
-    # use the member variables
-    for key, value in member_variables.items():
-        setattr(new_object, key, value)
+# reads a classed object from a file in either format, compressed or not
+# binary files are told apart from json, and compressed files from uncompressed, by their magic bytes
+# returns 'None' if no classed object can be constructed with file data
+def _read_object(file_path, class_type):
+    # read bytes from target file
+    data_bytes = _read_decompressed(file_path)
+    
+    # check for empty file
+    if len(data_bytes) == 0:
+        return None
+    
+    if binaryformat.is_binary(data_bytes):
+        member_variables = binaryformat.decode(data_bytes)
+    else:
+        member_variables = json.loads(data_bytes)
+    
+    if member_variables == None:
+        return None
+    
+    return _build_object(member_variables, class_type)
+
+# reads all bytes from a file, decompressing them piece by piece if the file is compressed
+def _read_decompressed(file_path):
+    with open(file_path, 'rb') as file:
+        head = file.read(len(XZ_MAGIC))
+
+        if head.startswith(GZIP_MAGIC):
+            decompressor = zlib.decompressobj(GZIP_WBITS)
+        elif head.startswith(XZ_MAGIC):
+            decompressor = lzma.LZMADecompressor(format=lzma.FORMAT_XZ)
+        else:
+            return head + file.read() # not compressed
+        
+        data_bytes = bytearray(decompressor.decompress(head))
+        while True:
+            chunk = file.read(STREAM_CHUNK_SIZE)
+            if len(chunk) == 0:
+                break
+            data_bytes += decompressor.decompress(chunk)
+        
+        if head.startswith(GZIP_MAGIC):
+            data_bytes += decompressor.flush()
+    
+    return data_bytes
 
-    return new_object
+# creates a new object of the given type using a dict of member variables
+def _build_object(member_variables, class_type):
+    # member variables that are not a dict cannot make an object
+    if isinstance(member_variables, dict) == False:
+        return None
+    
+    # the class_type's schema checks the member variables and fills in any missing ones
+    return schema.load(member_variables, class_type)
 
 # Read Data
 # copy out the binary contents of a file into a list of items and return it
@@ -180,31 +701,82 @@ def read_data(file_name, expected_type):
     if found_path == None or not os.path.exists(found_path):
         return None # cannot read file
     
-    data = _read_json_object(found_path, expected_type)
+    data = _read_object(found_path, expected_type)
     
     return data
 
 # Locate File
-# searches project files for every match, returning the path to that file
+# looks up every match for a file name in the file index, returning the path to that file
 # returns None if there were 0/multiple matches or file is not a file
 def locate_file(file_name):
-    matches = []
-
-    # error log is found in src, but can still be edited
+    # error log is always found in data, and is not indexed since it changes so often
     if file_name == ERROR_LOG:
-        return os.path.join(PROJECT_ROOT, SOURCE_PATH, ERROR_LOG)
+        return os.path.join(PROJECT_ROOT, DATA_PATH, ERROR_LOG)
+
+    # dependencies are never mutable project files
+    if file_name in FILE_DEPENDENCIES:
+        return None
+
+    # index is built once, on the first lookup
+    if _file_index == None:
+        rescan_files()
+
+    matches = _file_index.get(file_name)
+
+    if matches == None or len(matches) != 1:
+        return None
+    else:
+        return matches[0]
+
+# Rescan Files
+# walks project files once, rebuilding the index of file name : list of paths
+# use this if files were added or removed outside of the program
+def rescan_files():
+    global _file_index
+
+    new_index = {}
 
     for root, dirs, files in os.walk(PROJECT_ROOT):
         if SOURCE_PATH in dirs:
             dirs.remove(SOURCE_PATH)
+        if SESSIONS_PATH in dirs:
+            dirs.remove(SESSIONS_PATH)
         
-        if file_name in files and file_name not in FILE_DEPENDENCIES:
+        for file_name in files:
+            # dependencies, unfinished writes and error logs are never indexed
+            if file_name in FILE_DEPENDENCIES or file_name.endswith(TEMP_SUFFIX) or file_name.startswith(ERROR_LOG):
+                continue
             file_path = os.path.join(root, file_name)
             # Ensure the match is a file
-            if os.path.isfile(file_path):  
-                matches.append(file_path)
+            if os.path.isfile(file_path):
+                if file_name not in new_index:
+                    new_index[file_name] = []
+                new_index[file_name].append(file_path)
     
-    if len(matches) != 1:
-        return None
-    else:
-        return matches[0]
\ No newline at end of file
+    _file_index = new_index
+
+# adds a newly created file to the index
+# duplicate names are kept so locate_file can refuse them
+def _index_add(file_path):
+    if _file_index == None:
+        return # index will find this file when it is built
+    
+    file_name = os.path.basename(file_path)
+    if file_name not in _file_index:
+        _file_index[file_name] = []
+    if file_path not in _file_index[file_name]:
+        _file_index[file_name].append(file_path)
+
+# removes a deleted file from the index
+def _index_remove(file_path):
+    if _file_index == None:
+        return
+    
+    file_name = os.path.basename(file_path)
+    matches = _file_index.get(file_name)
+    if matches == None or file_path not in matches:
+        return
+    
+    matches.remove(file_path)
+    if len(matches) == 0:
+        del _file_index[file_name]
\ No newline at end of file
@@ -4,12 +4,20 @@
 
 import os
 import sys
+import inspect
 
 import errormanager
 import filemanager
 import textmanager
+import binaryformat
+import results
+import namemanager
+import outputchannel
+import schema
+import savewriter
+from savewriter import SaveWriter
 from worldmanager import WorldManager
-from mode import Mode
+from mode import Mode, ModeTemplate
 
 # Game Manager
 # Stores and Mutates all game states
@@ -26,6 +34,17 @@ class GameManager():
             self.master_volume = 0.7
             self.text_delay = GameManager.NORMAL_TEXT
             self.display_welcome = True
+
+            # file writes
+            self.write_durability = filemanager.DURABILITY_FILE
+            self.save_format = filemanager.FORMAT_JSON
+            self.save_compression = filemanager.COMPRESSION_NONE
+            self.save_compression_level = filemanager.DEFAULT_COMPRESSION_LEVEL
+
+            # journal saves append changes, and fold them into a full save past these limits
+            self.save_journal = False
+            self.journal_max_entries = 50
+            self.journal_max_bytes = 64 * 1024
             
             # save data
             self.saves = {}
@@ -97,6 +116,7 @@ class GameManager():
     CHANGE_TITLE = "change title:"
     CLEAR_COMMAND = "clear"
     CHANGE_SPEED = "change animation speed:"
+    SAVE_REPORT = "save report:"
 
     MAIN_MENU_TITLE = "Main Menu"
 
@@ -106,6 +126,7 @@ class GameManager():
     QUICK_TEXT = 0.01
 
     # ==== main menu mode functions ====
+    # functions which wait on the user are step generators, yielding textmanager.READ_LINE for each line they need
 
     def _main_new_funct(self, objects, targets=None):
         if targets != None and len(targets) != 0 and targets[0] != "game":
@@ -117,8 +138,8 @@ class GameManager():
         has_name = False
         while has_name != None:
             # grab user input
-            new_name = self.input_handler.get_input()
-            new_name = textmanager.clean_name(new_name)
+            new_name = yield textmanager.READ_LINE
+            new_name = namemanager.clean_name(new_name)
 
             # ensure name is valid
             if new_name == None:
@@ -129,12 +150,11 @@ class GameManager():
             if new_name == "quit" or new_name == "back" or new_name == "stop":
                 # print out text_argument, and wait for return from user
                 textmanager.display_text("Understood. Taking you back to the main menu.")
-                self.command_queue.put(self.CLEAR_COMMAND)
-                buffer = textmanager.get_input(self.input_handler)
+                yield from self._end_page()
 
                 # print out new prompt after clear screen
                 textmanager.display_text(f"{self.current_mode.prompt}\n{textmanager.END_MARKER}", True)
-                return f"\n"
+                return results.SILENT
                 
             # look for existing name
             if new_name in self.config.saves.keys():
@@ -142,18 +162,17 @@ class GameManager():
                 continue
 
             # check user is sure
-            has_name = textmanager.ask_yes_or_no(f"Should I call you \"{new_name}\"?", self.input_handler)
+            has_name = yield from textmanager.ask_yes_or_no_steps(f"Should I call you \"{new_name}\"?")
 
             # repeat if not
             if has_name == "quit":
                 # print out text_argument, and wait for return from user
                 textmanager.display_text("Understood. Taking you back to the main menu.")
-                self.command_queue.put(self.CLEAR_COMMAND)
-                buffer = textmanager.get_input(self.input_handler)
+                yield from self._end_page()
 
                 # print out new prompt after clear screen
                 textmanager.display_text(f"{self.current_mode.prompt}\n{textmanager.END_MARKER}", True)
-                return f"\n"
+                return results.SILENT
             elif has_name != None:
                 textmanager.display_text("Understood. What should I call you then?")
 
@@ -164,7 +183,7 @@ class GameManager():
         self.world_state.name(new_name)
 
         # switch to gameplay mode from worldmanager
-        return f"{Mode.CHANGE_MODE}{GameManager.START_ADVENTURE}"
+        return results.ChangeMode(GameManager.START_ADVENTURE)
 
     def _main_continue_funct(self, objects, targets=None):
         if targets != None and len(targets) != 0 and targets[0] != "game":
@@ -176,23 +195,20 @@ class GameManager():
         # for new games we rely on the constructor to initialize the new world
         self.world_state = WorldManager()
 
+        # most recent save must still be in the catalog
+        record = self.catalog.saves.get(self.config.most_recent_save)
+        if record == None:
+            return "There is no progress to continue. Try starting a new adventure!"
+
         # name world
         self.world_state.name(self.config.most_recent_save)
 
-        # remove spaces from file's name
-        clean_name = ""
-        for char in self.config.most_recent_save:
-            if char == " ":
-                clean_name += "-"
-            else:
-                clean_name += char
-
         # grab world data
-        world_data = filemanager.read_data(clean_name, WorldManager.World)
+        world_data = yield from textmanager.call_steps(filemanager.read_save, record["file"], WorldManager.World)
         self.world_state.load(world_data)
             
         # switch to gameplay mode from worldmanager
-        return f"{Mode.CHANGE_MODE}{self.START_ADVENTURE}"
+        return results.ChangeMode(self.START_ADVENTURE)
 
     def _main_load_funct(self, objects, targets=None):
         if targets != None and len(targets) != 0 and targets[0] != "game":
@@ -201,22 +217,23 @@ class GameManager():
         if len(self.config.saves) == 0:
             return "There are no saves to load."
         # pass to load submenu
-        return f"{Mode.CHANGE_MODE}{self.LOAD_MENU_MODE}"
+        return results.ChangeMode(self.LOAD_MENU_MODE)
 
     def _main_option_funct(self, objects, targets=None):
         if targets != None:
             return "The \"options\" command only makes sense here without specifying targets."
         # pass to options submenu
-        return f"{Mode.CHANGE_MODE}options"
+        return results.ChangeMode(self.OPTION_MENU_MODE)
+
+    # menus are compiled once, and shared by every game manager
+    MAIN_MENU = ModeTemplate("MAIN MENU\n => New\n => Continue\n => Load\n => Options\n => Quit", [
+        ("new", _main_new_funct, "Begin a new adventure!"),
+        ("continue", _main_continue_funct, "Continue where you last left off."),
+        ("load", _main_load_funct, "Continue one of your saved adventures."),
+        ("options", _main_option_funct, "Change settings for the game.") ])
 
     def _init_main_menu(self):
-        prompt = "MAIN MENU\n => New\n => Continue\n => Load\n => Options\n => Quit"
-        result = Mode(prompt)
-        result.add_command("new", self._main_new_funct, "Begin a new adventure!")
-        result.add_command("continue", self._main_continue_funct, "Continue where you last left off.")
-        result.add_command("load", self._main_load_funct, "Continue one of your saved adventures.")
-        result.add_command("options", self._main_option_funct, "Change settings for the game.")
-        return result
+        return self.MAIN_MENU.new_mode(self)
 
     # ==== load game submenu functions ====
 
@@ -235,20 +252,13 @@ class GameManager():
         elif len(targets) > 1 or targets[0] == Mode.ALL_OBJECTS:
             return "I can only load one file at a time."
 
-        # remove spaces from file's name
-        clean_name = ""
-        for char in targets[0]:
-            if char == " ":
-                clean_name += "-"
-            else:
-                clean_name += char
-            
         # validate target file exists
-        if filemanager.locate_file(clean_name) == None:
+        record = self.catalog.saves.get(targets[0])
+        if record == None:
             return f"There's no file here named \"{targets[0]}\". Try \"look\" to see which files I have saved."
             
         # grab world data from file
-        world_data = filemanager.read_data(clean_name, WorldManager.World)
+        world_data = yield from textmanager.call_steps(filemanager.read_save, record["file"], WorldManager.World)
         self.world_state = WorldManager()
         self.world_state.load(world_data)
             
@@ -256,7 +266,7 @@ class GameManager():
         self.world_state.name(targets[0])
 
         # switch to gameplay mode from world manager
-        return f"{Mode.CHANGE_MODE}{self.START_ADVENTURE}"
+        return results.ChangeMode(self.START_ADVENTURE)
 
     def _load_delete_funct(self, objects, targets=None):
         # ensure targets is a list type
@@ -278,43 +288,37 @@ class GameManager():
 
         files_to_delete = []
         for target in targets:
-            # remove spaces from file's name
-            clean_name = ""
-            for char in target:
-                if char == " ":
-                    clean_name += "-"
-                else:
-                    clean_name += char
-            
-            # validate target file exists
-            if filemanager.locate_file(clean_name) == None:
+            # validate target file exists, and is one this game lists
+            record = self.catalog.saves.get(target)
+            if record == None or target not in self.config.saves.keys():
                 return f"There's no file here named \"{target}\". Try \"look\" to see which files I have saved."
-            files_to_delete.append(clean_name)
+            files_to_delete.append(record["file"])
 
-            can_delete = textmanager.ask_yes_or_no("Are you sure you want to delete these files?", self.input_handler)
+            can_delete = yield from textmanager.ask_yes_or_no_steps("Are you sure you want to delete these files?")
 
         if can_delete != None:
             return f"Understood."
+        
+        # pending saves must not write deleted files back to disk
+        yield from textmanager.call_steps(self.save_writer.flush)
             
         # delete save files, change save listing
         new_save_list = {}
+        deleted_files = []
         for file, data in self.config.saves.items():
-            # add spaces to file's name
-            clean_name = ""
-            for char in file:
-                if char == " ":
-                    clean_name += "-"
-                else:
-                    clean_name += char
-                
             if file in targets:
                 # remove from mode
                 self.current_mode.delete_object(file)
 
-                # remove from disk
-                filemanager.delete_file(clean_name)
+                # remove from catalog, unless another game sharing it got there first
+                record = filemanager.catalog_forget(self.catalog, file)
+                if record != None:
+                    deleted_files.append(record["file"])
             else:
                 new_save_list[file] = data
+
+        # then from disk
+        yield from textmanager.call_steps(self._delete_saves, deleted_files)
             
         # return config saves to remaining objects
         self.config.saves = {}
@@ -323,14 +327,16 @@ class GameManager():
 
         return "Files deleted..."
 
+    LOAD_MENU = ModeTemplate("LOAD MENU\n => Look\n => Load\n => Delete\n => Back", [
+        ("load", _load_game_funct, "Load one of the files saved to disk."),
+        ("delete", _load_delete_funct, "Delete one or more save files.") ])
+
     def _init_load_menu(self):
-        result = Mode("LOAD MENU\n => Look\n => Load\n => Delete\n => Back")
-        result.add_command("load", self._load_game_funct, "Load one of the files saved to disk.")
-        result.add_command("delete", self._load_delete_funct, "Delete one or more save files.")
+        result = self.LOAD_MENU.new_mode(self)
 
-        # add all files on disk as objects in this mode
-        for file, data in self.config.saves.items():
-            result.add_object(file, data)
+        # add all files in the save catalog as objects in this mode
+        for file, record in self.catalog.saves.items():
+            result.add_object(file, record["summary"])
         return result
 
     # ==== options menu functions ====
@@ -350,15 +356,14 @@ class GameManager():
         successful_change = self.config.change_value(targets[0], targets[1])
 
         if successful_change == False:
-            return f"\n"
+            return results.SILENT
             
         # settings have been updated
-        filemanager.write_data(filemanager.CURRENT_CONFIG, self.config)
+        self._write_config()
             
         # clear the screen
         textmanager.display_text("Successfully set new option value.")
-        self.command_queue.put(self.CLEAR_COMMAND)
-        buffer = self.input_handler.get_input()
+        yield from self._end_page()
         textmanager.display_text(f"{self.current_mode.prompt}\n", True)
         textmanager.display_text(f"{textmanager.END_MARKER}\n{self.config}\n{textmanager.END_MARKER}", True) # prints out all options
 
@@ -366,17 +371,24 @@ class GameManager():
         if targets[0] == "delay":
             self.command_queue.put(f"{self.CHANGE_SPEED}{self.config.text_delay}")
 
-        return f"\n"
+        return results.SILENT
         
     def _option_default_funct(self, objects, targets=None):
         if targets != None:
             return "The \"reset\" command only makes sense here without specifying targets."
+
+        # other games share the configuration file
+        if self.shared_files != None:
+            return "Settings can't be restored to default here, as other players share them."
             
         # restore settings from default
-        can_reset = textmanager.ask_yes_or_no("Are you sure you want to restore settings to default?", self.input_handler)
+        can_reset = yield from textmanager.ask_yes_or_no_steps("Are you sure you want to restore settings to default?")
 
         if can_reset != None:
             return "Understood."
+        
+        # pending config writes must not land after the reset
+        yield from textmanager.call_steps(self.save_writer.flush)
             
         # delete current config file
         filemanager.delete_file(filemanager.CURRENT_CONFIG)
@@ -395,12 +407,11 @@ class GameManager():
 
         # clear the screen
         textmanager.display_text("Restored settings to default.")
-        self.command_queue.put(self.CLEAR_COMMAND)
-        buffer = self.input_handler.get_input()
+        yield from self._end_page()
         textmanager.display_text(f"{self.current_mode.prompt}\n", True)
         textmanager.display_text(f"{textmanager.END_MARKER}\n{self.config}\n{textmanager.END_MARKER}", True) # prints out all options
 
-        return "\n"
+        return results.SILENT
         
     def _option_wipe_funct(self, objects, targets=None):
         if targets != None:
@@ -409,51 +420,115 @@ class GameManager():
         if self.last_signature != self.MAIN_MENU_MODE:
             return "You cannot \"wipe\" data without returning to main menu..."
 
-        can_reset = textmanager.ask_yes_or_no("Are you sure you want to completely wipe save data?", self.input_handler)
+        # other games share the saves and configuration
+        if self.shared_files != None:
+            return "You cannot \"wipe\" data here, as other players share it."
+
+        can_reset = yield from textmanager.ask_yes_or_no_steps("Are you sure you want to completely wipe save data?")
 
         if can_reset != None:
             return "Understood."
             
-        can_reset = textmanager.ask_yes_or_no("This will wipe options saved, as well as ALL saves! Are you sure?", self.input_handler)
+        can_reset = yield from textmanager.ask_yes_or_no_steps("This will wipe options saved, as well as ALL saves! Are you sure?")
 
         if can_reset != None:
             return "Understood."
+        
+        # pending saves must not write wiped files back to disk
+        yield from textmanager.call_steps(self.save_writer.flush)
             
         # delete all save files
-        for file in self.config.saves.keys():
-            # remove spaces from file's name
-            clean_name = ""
-            for char in file:
-                if char == " ":
-                    clean_name += "-"
-                else:
-                    clean_name += char
-                    
-            filemanager.delete_file(clean_name)
+        for file, record in self.catalog.saves.items():
+            filemanager.delete_save(record["file"])
+        
+        # delete the save catalog
+        filemanager.delete_file(filemanager.SAVE_CATALOG)
             
         # reset configuration, clearing acheivement data
         self.config = self.Configuration()
 
         textmanager.display_text("Wiping all saved options, and all save data...")
-        self.command_queue.put(self.CLEAR_COMMAND)
-        buffer = self.input_handler.get_input()
+        yield from self._end_page()
 
         # we need to reset the game to initial game running state
-        return f"{Mode.CHANGE_MODE}{self.COMPLETE_BREAK}"
+        return results.ChangeMode(self.COMPLETE_BREAK)
+
+    # WIPE not available in gameplay mode
+    OPTION_MENU = ModeTemplate("OPTIONS\n => Set\n => Reset\n => Wipe\n => Back\n", [
+        ("set", _option_set_funct, "Change a setting."),
+        ("reset", _option_default_funct, "Restore default settings."),
+        ("wipe", _option_wipe_funct, "Wipe all data from disk.") ])
 
     def _init_option_menu(self):
-        # add string representation of current values
-        # WIPE not available in gameplay mode
-        result_text = "OPTIONS\n => Set\n => Reset\n => Wipe\n => Back\n"
+        return self.OPTION_MENU.new_mode(self)
+        
+    # ==== End Function Definitions ====
 
-        result = Mode(result_text)
-        result.add_command("set", self._option_set_funct, "Change a setting.")
-        result.add_command("reset", self._option_default_funct, "Restore default settings.")
-        result.add_command("wipe", self._option_wipe_funct, "Wipe all data from disk.")
+    # Suggestion Text
+    # returns a line offering close matches to something mistyped, or nothing if there are none
+    def _suggestion_text(self, suggestions):
+        if len(suggestions) == 0:
+            return ""
+        quoted = [ f"\"{suggestion}\"" for suggestion in suggestions ]
+        if len(quoted) == 1:
+            return f"\nDid you mean {quoted[0]}?"
+        return f"\nDid you mean {', '.join(quoted[:-1])} or {quoted[-1]}?"
+
+    # Clear Page
+    # shows everything displayed on this page, then tells the window to end the page
+    def _clear_page(self):
+        outputchannel.flush_output()
+        self.command_queue.put(self.CLEAR_COMMAND)
 
-        return result
+    # End Page
+    # clears the page, then waits on an input buffer while the user reads it
+    # without page breaks, as when no one is watching, the game goes straight on
+    def _end_page(self):
+        self._clear_page()
+        if self.page_breaks == True:
+            buffer = yield textmanager.READ_LINE
+
+    # Write Config
+    # hands a copy of the configuration to the save writer
+    # newer configurations replace any that are still waiting to be written
+    # games sharing files keep their configuration to themselves, and never write it
+    def _write_config(self):
+        if self.shared_files != None:
+            return
+
+        config_data = savewriter.snapshot(self.config)
+        self.save_writer.submit(filemanager.CURRENT_CONFIG, None, filemanager.write_data, filemanager.CURRENT_CONFIG, config_data,
+            report_queue=self.command_queue)
+
+    # Delete Saves
+    # removes save files which are out of the catalog, then rewrites the catalog
+    def _delete_saves(self, file_names):
+        for file_name in file_names:
+            filemanager.delete_save(file_name)
+        filemanager.write_catalog(self.catalog)
+
+    # Store Save
+    # writes a save file and its catalog entry, run by the save writer
+    def _store_save(self, save_name, file_name, world_data):
+        filemanager.write_save(file_name, world_data)
+        filemanager.catalog_save(self.catalog, save_name)
+
+    # Store Journal
+    # appends world changes to a save's journal, run by the save writer
+    # saves without a full write yet get one, and long journals are folded into a full write
+    def _store_journal(self, world_changes, save_name, file_name):
+        entries, size = filemanager.append_journal(file_name, world_changes)
+
+        if entries == None:
+            # the first save of a world holds every member variable
+            world_data = WorldManager.World()
+            for key, value in world_changes.items():
+                setattr(world_data, key, value)
+            filemanager.write_save(file_name, world_data)
+        elif entries >= self.config.journal_max_entries or size >= self.config.journal_max_bytes:
+            filemanager.compact_journal(file_name, WorldManager.World)
         
-    # ==== End Function Definitions ====
+        filemanager.catalog_save(self.catalog, save_name)
 
     # INIT MODES
     # used to initialize gamerunning modes for main menu
@@ -464,7 +539,9 @@ class GameManager():
         self.modes[self.OPTION_MENU_MODE] = self._init_option_menu()
 
     # initialize game environment
-    def __init__(self, input_handler, command_queue):
+    # page_breaks is False to go straight on at the end of each page, for headless runs
+    # shared_files are the catalog and writer of a server, for games which share its files with other players
+    def __init__(self, input_handler, command_queue, page_breaks=True, shared_files=None):
         # ensure package files are present
         if filemanager.validate_files() != 0:
             errormanager.log_error("Cannot validate dependencies")
@@ -481,26 +558,32 @@ class GameManager():
 
         # retrieve configuration options
         self.config = filemanager.read_data(filemanager.CURRENT_CONFIG, self.Configuration)
+        filemanager.set_durability(self.config.write_durability)
+        filemanager.set_save_format(self.config.save_format)
+        filemanager.set_compression(self.config.save_compression, self.config.save_compression_level)
+
+        # retrieve save catalog
+        self.shared_files = shared_files
+        if shared_files == None:
+            self.catalog = open_catalog(self.config.saves)
+        else:
+            self.catalog = shared_files.catalog
 
-        # ensure save file validity
-        valid_saves = {}
-        for file, data in self.config.saves.items():
-            clean_name = ""
-            for char in file:
-                if char == " ":
-                    clean_name += "-"
-                else:
-                    clean_name += char
-            if filemanager.locate_file(clean_name) != None:
-                # save is still valid on startup
-                valid_saves[file] = data
+        # copied at once, as games sharing the catalog may be adding to it
         self.config.saves = {}
-        for file, data in valid_saves.items():
-            self.config.saves[file] = data
+        for file, record in dict(self.catalog.saves).items():
+            self.config.saves[file] = record["summary"]
 
         # initialize stdin and window command variables
         self.input_handler = input_handler
         self.command_queue = command_queue
+        self.page_breaks = page_breaks
+
+        # saves and configuration are written in the background
+        if shared_files == None:
+            self.save_writer = SaveWriter(command_queue, self.SAVE_REPORT)
+        else:
+            self.save_writer = shared_files.save_writer
 
         # set up mode variables
         self.modes = {}
@@ -521,15 +604,24 @@ class GameManager():
             self.modes[key] = value
 
         self.game_running = False
+
+        # set while the game waits on a command, the only point its session data can be taken
+        self.awaiting_command = False
     
-    # run a session of game
+    # run a session of game, reading each line from the input handler on this thread
     def run(self, skip_initial_buffer=False):
+        textmanager.run_steps(self.play(skip_initial_buffer), self.input_handler)
+
+    # Play
+    # a session of game as step generators: yields textmanager.READ_LINE whenever it waits on the user,
+    # and is sent back the line they typed
+    def play(self, skip_initial_buffer=False):
         # set the title
         self.command_queue.put(f"{self.CHANGE_TITLE}{self.MAIN_MENU_TITLE}")
 
         # initial buffer
-        if skip_initial_buffer != True:
-            buffer = textmanager.get_input(self.input_handler)
+        if skip_initial_buffer != True and self.page_breaks == True:
+            buffer = yield from textmanager.get_input_steps()
 
         # test for first open to display welcome to my game message
         if self._is_first_open == True:
@@ -541,8 +633,7 @@ class GameManager():
             initial_text += "\nFor instance, this \"page\" ends here, after this initial welcoming message."
             initial_text += "\nTo reset the game to a state where this initial message shows up again, use the \"wipe\" command in the options menu."
             textmanager.display_text(initial_text, True)
-            self.command_queue.put(self.CLEAR_COMMAND)
-            buffer = textmanager.get_input(self.input_handler)
+            yield from self._end_page()
 
             self._is_first_open = False
 
@@ -558,8 +649,7 @@ class GameManager():
             welcome_message += "To exit the game, type \"quit\".\nTo keep this message from popping up on startup,"
             welcome_message += "set the \"welcome\" setting to \"no\".\n"
             textmanager.display_text(welcome_message, True)
-            self.command_queue.put(self.CLEAR_COMMAND)
-            buffer = textmanager.get_input(self.input_handler)
+            yield from self._end_page()
 
         self.current_mode = self.modes[self.MAIN_MENU_MODE]
         self.current_signature = self.MAIN_MENU_MODE
@@ -572,29 +662,128 @@ class GameManager():
         self.game_running = True
 
         # begin gameplay loop
-        self.run_modes()
+        yield from self.run_modes()
 
         # gameplay loop exits with QUIT and program falls out of execution here
+        outputchannel.flush_output()
+        yield from textmanager.call_steps(self.close_files)
+
+    # Resume
+    # step generator playing on a game from its session data, in the mode it was left in
+    # show_mode is False to carry straight on without showing the player where they are, as when a game wakes from hibernation
+    def resume(self, session_data, show_mode=True):
+        session = binaryformat.decode(session_data)
+
+        self.config = schema.load(session["config"], self.Configuration)
+        self.world_state = WorldManager()
+        self.world_state.load(schema.load(session["world"], WorldManager.World))
+        self.world_state.name(session["user_name"])
+        self.world_state.track_changes(self.config.save_journal)
+
+        # what changed since the last save is carried over, so the next journal save still holds it
+        # session data from before changes were carried holds none, and every member variable counts as changed
+        world_changes = session.get("world_changes")
+        if world_changes == None:
+            self.world_state.world.mark_all()
+        else:
+            self.world_state.world.mark_changed(world_changes)
+
+        self.current_signature, self.current_mode = self._find_mode(session["mode"])
+        self.last_signature, self.last_mode = self._find_mode(session["last_mode"])
+
+        # show the player where they are
+        if self.current_signature == self.MAIN_MENU_MODE:
+            self.command_queue.put(f"{self.CHANGE_TITLE}{self.MAIN_MENU_TITLE}")
+        else:
+            self.command_queue.put(f"{self.CHANGE_TITLE}{self.world_state.get_location_title()}")
+        if show_mode == True:
+            textmanager.display_text(f"{self.current_mode.prompt}\n{textmanager.END_MARKER}", True)
+            if self.current_signature == self.OPTION_MENU_MODE:
+                textmanager.display_text(f"\n{self.config}\n{textmanager.END_MARKER}", True)
+
+        self.game_running = True
+        yield from self.run_modes()
+
+        outputchannel.flush_output()
+        yield from textmanager.call_steps(self.close_files)
+
+    # Close Files
+    # waits until everything this game handed the save writer is on disk
+    # a game with files of its own then stops its writer, while a shared writer carries on for the other games
+    def close_files(self):
+        if self.shared_files == None:
+            self.save_writer.close()
+        else:
+            self.save_writer.flush()
+
+    # Get Session Data
+    # returns the game in play as bytes: the player's name, their world, what of it changed since it was last saved,
+    # their configuration, and the modes they are in
+    # returns None unless the game is waiting on a command, as it can't be picked up partway through a question
+    def get_session_data(self):
+        if self.awaiting_command == False:
+            return None
+
+        session = {
+            "user_name" : self.world_state.user_name,
+            "world" : schema.dump(self.world_state.get_world_data()),
+            "world_changes" : sorted(self.world_state.world.changed_fields()),
+            "config" : schema.dump(self.config),
+            "mode" : self.current_signature,
+            "last_mode" : self.last_signature }
+        return binaryformat.encode(session)
+
+    # finds a mode by signature, looking in the world first
+    # returns signature, mode, or None, None if there is no such mode
+    def _find_mode(self, signature):
+        mode = self.world_state.modes.get(signature)
+        if mode == None:
+            mode = self.modes.get(signature)
+        if mode == None:
+            return None, None
+        return signature, mode
     
+    # returns True if the current mode is one of the world's, rather than a menu
+    def _is_world_mode(self):
+        return self.world_state.modes.get(self.current_signature) is self.current_mode
+
     def run_modes(self):
         # gameplay loop continues running CURRENT_MODE commands until user exits game
 
         while(self.game_running == True):
             # get input
+            self.awaiting_command = True
             if self.current_signature == self.OPTION_MENU_MODE:
-                verb, nouns = textmanager.get_input(self.input_handler, False)
+                verb, nouns = yield from textmanager.get_input_steps(False)
             else:
-                verb, nouns = textmanager.get_input(self.input_handler)
+                verb, nouns = yield from textmanager.get_input_steps()
+            self.awaiting_command = False
 
             # input may have included invalid characters
             if verb == None:
                 textmanager.display_text("You've entered invalid characters. I only take spaces and a-z.")
                 continue
 
-            # input command might not be a command
+            # while playing, input command might be the start of a command, or not a command at all
+            # menus only take whole commands, so a stray letter never runs something else
+            is_playing = self._is_world_mode()
             if self.current_mode.is_command(verb) == False:
-                textmanager.display_text(f"\"{verb}\" isn't a valid command.\nTry \"help\" for a list of commands.")
-                continue
+                command = None
+                suggestion_text = ""
+                if is_playing == True:
+                    command = self.current_mode.resolve_command(verb)
+                    suggestion_text = self._suggestion_text(self.current_mode.suggest_commands(verb))
+                if command == None:
+                    textmanager.display_text(f"\"{verb}\" isn't a valid command.{suggestion_text}\nTry \"help\" for a list of commands.")
+                    continue
+                verb = command
+
+            # nouns may also be the start of an object while playing
+            if nouns != None and is_playing == True:
+                for index, noun in enumerate(nouns):
+                    target = self.current_mode.resolve_object(noun)
+                    if target != None:
+                        nouns[index] = target
 
             # check for special command all as first noun: should be only noun
             if nouns != None and len(nouns) > 0:
@@ -606,8 +795,15 @@ class GameManager():
             # otherwise run the mode_return with verb-nouns
             mode_return = self.current_mode.run_command(verb, nouns)
 
+            # commands which talk with the user are step generators, played through until they return
+            if inspect.isgenerator(mode_return) == True:
+                mode_return = yield from mode_return
+
+            # commands may return a result, or a string, list or dict as they used to
+            result = results.to_result(mode_return)
+
             # if mode return executed NONE, command logic couldn't understand what was asserted
-            if mode_return == None:
+            if result == None:
                 result_text = f"I didn't quite understand \"{verb}"
                 if nouns != None and len(nouns) != 0:
                     for noun in nouns:
@@ -616,116 +812,132 @@ class GameManager():
                 textmanager.display_text(f"{result_text}\"...\nTry typing \"help {verb}\" for help with that command.")
                 continue
 
-            # mode return can contain items in a list or dict with NONE value: which means target speicified doesn't exist
+            # listings can contain items in a list or dict with NONE value: which means target speicified doesn't exist
             invalid_noun = None
-            if isinstance(mode_return, str) == False:
+            if type(result) == results.Listing:
                 # try list
-                if isinstance(mode_return, list) == True:
-                    if None in mode_return:
+                if isinstance(result.items, list) == True:
+                    if None in result.items:
                         for noun in nouns:
                             if self.current_mode.is_valid(noun) == False:
-                                invalid_noun = target
+                                invalid_noun = noun
                                 break
                 # try dict
-                if isinstance(mode_return, dict) == True:
-                    for target, result in mode_return.items():
-                        if result == None:
+                if isinstance(result.items, dict) == True:
+                    for target, detail in result.items.items():
+                        if detail == None:
                             invalid_noun = target
                             break
             
             # test for invalid noun used
             if invalid_noun != None:
-                textmanager.display_text(f"There is nothing like \"{invalid_noun}\" here.\nTry typing \"look\" to see what is around.")
+                suggestion_text = ""
+                if is_playing == True:
+                    suggestion_text = self._suggestion_text(self.current_mode.suggest_objects(invalid_noun))
+                textmanager.display_text(f"There is nothing like \"{invalid_noun}\" here.{suggestion_text}\nTry typing \"look\" to see what is around.")
                 continue
 
-            # check for specific commands which world can send gamemanager
-            return_handled = self.handle_world_commands(mode_return)
-
-            if return_handled == True:
+            # hand the result to whatever handles its type
+            handler = self._result_handler(type(result))
+            if handler == None:
+                errormanager.log_error(f"No handler for a {type(result).__name__} result, so it was skipped")
                 continue
-            
-            # check for mode return CHANGE_MODE
-            return_handled = self.handle_change_mode(mode_return)
-
-            if return_handled == True:
-                continue
-            
-            # if there were no special command returns, print mode return and keep running
-            if mode_return != "\n":
-                textmanager.display_text(mode_return)
+            handled = handler(self, result)
+            if inspect.isgenerator(handled) == True:
+                yield from handled
         
         # self.game_running was set to false: we are escaping gameplay
     
+    # returns the handler for a type of result, or for the nearest type it derives from
+    # returns None if none of them have a handler
+    def _result_handler(self, result_type):
+        handler = self.RESULT_HANDLERS.get(result_type)
+        if handler != None:
+            return handler
+        for base_type in result_type.__mro__:
+            handler = self.RESULT_HANDLERS.get(base_type)
+            if handler != None:
+                return handler
+        return None
+
+    # Show Results
+    # prints a text or listing result, or nothing for a silent one
+    def show_text(self, result):
+        textmanager.display_text(result.text)
+
+    def show_listing(self, result):
+        textmanager.display_text(result.items)
+
+    def show_nothing(self, result):
+        pass
+
     # Handle World Commands
-    # tests to see if WORLD_COMMAND command was used, and if so, handles it
-    # returns False only if there was no WORLD_COMMAND item used
+    # tests to see if a world command was returned, and if so, handles it
+    # takes a WorldCommand result, or a string of GAME_COMMAND followed by its signature
+    # step generator, which returns False only if there was no world command used
     def handle_world_commands(self, mode_return):
-        # WORLD_COMMAND command not used if return is shorter
-        if len(mode_return) <= len(WorldManager.GAME_COMMAND) + 1:
+        result = results.to_result(mode_return)
+        if type(result) != results.WorldCommand:
             return False
         
-        # WORLD_COMMAND command not used if it isn't in the string
-        if mode_return[:len(WorldManager.GAME_COMMAND)] != WorldManager.GAME_COMMAND:
-            return False
-        
-        # WORLD_COMMAND command is followed up by some kind of command word
-        command_string = mode_return[len(WorldManager.GAME_COMMAND):]
+        # world command is some kind of command word
+        command_string = result.command
 
         # handle world command based on supported results
         if command_string == WorldManager.SAVE_SIGNATURE:
-            # clean name
-            clean_name = ""
-            for char in self.world_state.user_name:
-                if char == " ":
-                    clean_name += "-"
-                else:
-                    clean_name += char
+            # file name of the save
+            file_name = namemanager.slug_name(self.world_state.user_name)
             
-            world_data = self.world_state.get_world_data()
-
             # check to see if we are overwriting save data
-            if filemanager.locate_file(clean_name) != None:
-                can_overwrite = textmanager.ask_yes_or_no("Are you sure you want to overwrite save data?", self.input_handler)
+            if filemanager.locate_file(file_name) != None or self.world_state.user_name in self.catalog.saves.keys():
+                can_overwrite = yield from textmanager.ask_yes_or_no_steps("Are you sure you want to overwrite save data?")
 
                 if can_overwrite != None:
                     textmanager.display_text("Understood.")
                     return True
-                
-                # we can overwrite
-                filemanager.write_data(clean_name, world_data)
-            else:
-                # we must create a new save object with the data
-                filemanager.add_save(clean_name, world_data)
             
             # now we must store our updated file summary
-            self.config.saves[self.world_state.user_name] = self.world_state.get_summary()
+            summary = self.world_state.get_summary()
+            self.config.saves[self.world_state.user_name] = summary
+            filemanager.catalog_add(self.catalog, self.world_state.user_name, file_name, summary)
 
             # and update the load menu mode
             self.modes[self.LOAD_MENU_MODE] = self._init_load_menu()
 
+            # hand a copy of the world, or of its changes, to the save writer, which reports back once it is on disk
+            if self.config.save_journal == True:
+                world_changes = self.world_state.get_world_changes()
+                self.save_writer.submit_changes(file_name, "Game saved!", self._store_journal, world_changes, self.world_state.user_name, file_name,
+                    report_queue=self.command_queue)
+            else:
+                world_data = savewriter.snapshot(self.world_state.get_world_data())
+                self.world_state.get_world_changes() # saved world is the new checkpoint
+                self.save_writer.submit(file_name, "Game saved!", self._store_save, self.world_state.user_name, file_name, world_data,
+                    report_queue=self.command_queue)
+
             # and finally overwrite configuration with new updates
-            filemanager.write_data(filemanager.CURRENT_CONFIG, self.config)
+            self._write_config()
             
-            # if we are saving the game, after save operation we can just return
-            textmanager.display_text("Game saved!")
+            # if we are saving the game, the save writer finishes the save operation
+            textmanager.display_text("Saving game...")
             return True
         elif command_string == WorldManager.OPTION_SIGNATURE:
             # use gamemanager config options menu: back will return us to the game
-            return self.handle_change_mode(f"{Mode.CHANGE_MODE}{self.OPTION_MENU_MODE}")
+            return (yield from self.handle_change_mode(results.ChangeMode(self.OPTION_MENU_MODE)))
+
+        textmanager.display_text(f"There is no such world command \"{command_string}\".")
+        return True
  
     # Handle Change Mode
-    # tests to see if CHANGE_MODE command was used, and if so, handles it
-    # returns False only if change_mode isn't used, else returns true
+    # tests to see if a change of mode was returned, and if so, handles it
+    # takes a ChangeMode result, or a string of CHANGE_MODE followed by its signature
+    # step generator, which returns False only if change_mode isn't used, else returns true
     def handle_change_mode(self, mode_return):
-        # command not used if return is shorter
-        if len(mode_return) <= len(Mode.CHANGE_MODE) + 1:
-            return False
-        
-        # command not used CHANGE_MODE isn't in the string
-        if mode_return[:len(Mode.CHANGE_MODE)] != Mode.CHANGE_MODE:
+        result = results.to_result(mode_return)
+        if type(result) != results.ChangeMode:
             return False
         
-        mode_signature = mode_return[len(Mode.CHANGE_MODE):]
+        mode_signature = result.signature
         
         # find associated new mode
         new_mode = None
@@ -736,41 +948,40 @@ class GameManager():
             # from the main menu (or its submenus) we can just exit the game
             can_quit = None
             if self.current_signature != self.MAIN_MENU_MODE and self.last_signature != self.MAIN_MENU_MODE:
-                can_quit = textmanager.ask_yes_or_no("Are you sure you want to quit? You will lose any unsaved progress.", self.input_handler)
+                can_quit = yield from textmanager.ask_yes_or_no_steps("Are you sure you want to quit? You will lose any unsaved progress.")
 
             if can_quit!=None:
                 textmanager.display_text("Understood.")
                 return True
             else:
                 if self.current_signature == self.MAIN_MENU_MODE or self.last_signature == self.MAIN_MENU_MODE:
+                    # every save must be on disk before we exit
+                    yield from textmanager.call_steps(self.save_writer.flush)
                     textmanager.display_text("Goodbye!")
                     self.game_running = False
                     return True # return to desktop
                 else:
                     # set most_recent_save as current one, if the save file exists
-                    if self.world_state.user_name in self.config.saves.keys():
-                        clean_name = ""
-                        for char in self.world_state.user_name:
-                            if char == " ":
-                                clean_name += "-"
-                            else:
-                                clean_name += char
-                        if filemanager.locate_file(clean_name) != None:
-                            self.config.most_recent_save = self.world_state.user_name
-                            filemanager.write_data(self.config, self.Configuration)
+                    if self.world_state.user_name in self.catalog.saves.keys():
+                        self.config.most_recent_save = self.world_state.user_name
+                        self._write_config()
+                    yield from textmanager.call_steps(self.save_writer.flush)
                     # return to main menu
-                    return self.handle_change_mode(f"{Mode.CHANGE_MODE}{self.MAIN_MENU_MODE}") # recur with MAIN MENU MODE
+                    return (yield from self.handle_change_mode(results.ChangeMode(self.MAIN_MENU_MODE))) # recur with MAIN MENU MODE
         elif mode_signature == self.COMPLETE_BREAK:
             # used to escape gameloop and start game from initial bootup conditions : USED ONLY IN WIPE SAVE MECHANIC
 
+            # stop writing files from the previous game
+            self.save_writer.close()
+
             # delete config file
             filemanager.delete_file(filemanager.CURRENT_CONFIG)
 
             # initialize a new version of game manager
-            self.__class__.__init__(self, self.input_handler, self.command_queue)
+            self.__class__.__init__(self, self.input_handler, self.command_queue, self.page_breaks, self.shared_files)
 
             # call run again
-            self.run(True)
+            yield from self.play(True)
 
             # finally, once inner loop escapes from previous self.run, escape fully from here too
             self.game_running = False
@@ -792,6 +1003,7 @@ class GameManager():
         elif mode_signature == GameManager.START_ADVENTURE:
             # beginning a new adventure using whatever world has been loaded
             textmanager.display_text(f"Starting adventure!!!")
+            self.world_state.track_changes(self.config.save_journal)
 
             # grab the mode we are supposed to use and change to that
             new_mode = self.world_state.get_initial_mode()
@@ -818,8 +1030,7 @@ class GameManager():
         self.current_signature = new_signature
 
         textmanager.display_text("Changing page...")
-        self.command_queue.put(self.CLEAR_COMMAND) # send clear command to controlling window which waits on input buffer
-        buffer = textmanager.get_input(self.input_handler) # hold execution here to buffer the terminal for screen clear
+        yield from self._end_page() # send clear command to controlling window which waits on input buffer
         if mode_signature == self.START_ADVENTURE:
             # disable the 'back' command
             self.last_mode = None
@@ -838,3 +1049,56 @@ class GameManager():
             textmanager.display_text(f"\n{self.config}\n{textmanager.END_MARKER}", True)
 
         return True
+
+    # result type -> handler, called with the game manager and the result
+    RESULT_HANDLERS = {
+        results.Text : show_text,
+        results.Listing : show_listing,
+        results.Silent : show_nothing,
+        results.WorldCommand : handle_world_commands,
+        results.ChangeMode : handle_change_mode }
+
+# Open Catalog
+# reads the save catalog, adding saves only listed in an older configuration's saves,
+# and checks it against one listing of the saves folder
+def open_catalog(config_saves):
+    catalog = filemanager.read_catalog()
+
+    for file, data in config_saves.items():
+        if file in catalog.saves.keys():
+            continue
+        catalog.saves[file] = { "file" : namemanager.slug_name(file), "size" : None, "mtime" : None, "summary" : data }
+
+    filemanager.sync_catalog(catalog)
+    return catalog
+
+# Shared Files
+# the save catalog and save writer of a server, shared by every game it hosts
+# games write their saves into the one catalog, so none of them overwrite another's listing with their own,
+# but each keeps its options to itself, and none can reset or wipe what the others share
+class SharedFiles():
+    # writes which can wait at once, with room for many players saving together
+    MAX_PENDING = 4096
+
+    # reads the files, and writes the default configuration if there is none yet, so the games only ever read it
+    def __init__(self):
+        if filemanager.validate_files() != 0:
+            errormanager.log_error("Cannot validate dependencies")
+            errormanager.close_program()
+
+        if filemanager.locate_file(filemanager.CURRENT_CONFIG) == None:
+            filemanager.add_config(GameManager.Configuration())
+        config = filemanager.read_data(filemanager.CURRENT_CONFIG, GameManager.Configuration)
+
+        self.catalog = open_catalog(config.saves)
+
+        # games hand each write the queue its report goes to
+        self.save_writer = SaveWriter(None, GameManager.SAVE_REPORT, self.MAX_PENDING)
+
+    # Close
+    # writes everything still waiting, then stops the writer
+    def close(self):
+        self.save_writer.close()
+
+# configurations are read from the config file
+schema.register(GameManager.Configuration)
@@ -0,0 +1,209 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+import sys
+import asyncio
+
+import textmanager
+import outputchannel
+import headless
+from gamemanager import GameManager, SharedFiles
+
+# Game Server
+# hosts many players in one process, each with their own game manager and world
+# players connect over tcp or a unix socket and speak in lines: one command per line in,
+# and everything the game shows back, ended by a line holding only TURN_MARKER when it waits for the next command
+# sockets and games are all served on one asyncio event loop: each game is played as step generators,
+# resumed when its player's next command comes in, while anything waiting on the disk is done on worker threads
+# every game shares the server's save catalog and save writer
+
+# marks the end of the game's turn: the game is waiting on a command
+TURN_MARKER = textmanager.PLAYER_TAG.strip()
+
+MAX_SESSIONS = 1000
+IDLE_TIMEOUT = 300.0 # seconds a player may leave the game waiting before they are disconnected
+INPUT_QUEUE_SIZE = 16 # commands read ahead of the game before the server stops reading the socket
+MAX_LINE_LENGTH = 4096
+
+FULL_MESSAGE = "The server is full, try again later."
+IDLE_MESSAGE = "Disconnected for being idle."
+
+# Session
+# one connected player and their game
+class Session():
+    def __init__(self, server, reader, writer):
+        self.server = server
+        self.reader = reader
+        self.writer = writer
+        self.lines = None
+        self.commands = headless.HeadlessCommands()
+        self.game = None
+
+    # Run
+    # plays the game until the player quits, disconnects, or idles too long
+    # the game's steps are resumed on the event loop each time a command comes in,
+    # and the calls they make on the disk are run on a worker thread
+    async def run(self):
+        self.lines = asyncio.Queue(self.server.input_queue_size)
+        reading = asyncio.ensure_future(self.__read())
+
+        # display text in this task goes to the player
+        token = outputchannel.set_output(outputchannel.OutputChannel(self.__write))
+        try:
+            self.game = await self.__call(GameManager, None, self.commands, False, self.server.shared_files)
+            steps = self.game.play()
+            line = None
+            while True:
+                try:
+                    request = steps.send(line)
+                    while type(request) == textmanager.BlockingCall:
+                        try:
+                            value = await self.__call(request.funct, *request.args)
+                        except Exception as error:
+                            request = steps.throw(error)
+                            continue
+                        request = steps.send(value)
+                except StopIteration:
+                    break
+
+                # the game is waiting on a command, which ends its turn
+                self.__end_turn()
+                line = await self.__next_line()
+                if line == None:
+                    steps.close()
+                    break
+        finally:
+            reading.cancel()
+            # saves still waiting are left to the shared writer, and reported if they are done
+            self.commands.show_reports()
+            outputchannel.reset_output(token)
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
+    # reads commands off the socket onto the input queue
+    # waits while the queue is full, which stops reading and lets the socket push back on the player
+    async def __read(self):
+        while True:
+            try:
+                data = await asyncio.wait_for(self.reader.readline(), self.server.idle_timeout)
+            except asyncio.TimeoutError:
+                self.__write(f"{IDLE_MESSAGE}\n")
+                data = b""
+            except (ValueError, ConnectionError, OSError):
+                data = b"" # line too long, or the connection broke
+
+            # the game ends when the player is gone
+            if len(data) == 0:
+                await self.lines.put(None)
+                return
+
+            await self.lines.put(data.decode("utf-8", "replace").rstrip("\r\n"))
+
+    # runs funct(*args) on a worker thread, so the other players play on while it waits
+    async def __call(self, funct, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, funct, *args)
+
+    # hands the next command to the game, once the player has taken what was sent to them
+    async def __next_line(self):
+        try:
+            await self.writer.drain()
+        except (ConnectionError, OSError):
+            return None
+        return await self.lines.get()
+
+    # sends whatever the turn showed, then TURN_MARKER
+    def __end_turn(self):
+        self.commands.show_reports()
+        outputchannel.write_output(f"{TURN_MARKER}\n")
+        outputchannel.flush_output()
+
+    # writes text to the socket
+    def __write(self, text):
+        if self.writer.is_closing() == False:
+            self.writer.write(text.encode("utf-8"))
+
+# Game Server
+# accepts players up to max_sessions, and turns away any more
+class GameServer():
+    def __init__(self, max_sessions=MAX_SESSIONS, idle_timeout=IDLE_TIMEOUT, input_queue_size=INPUT_QUEUE_SIZE):
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.input_queue_size = input_queue_size
+        self.sessions = set()
+        self.shared_files = None
+
+    # Start TCP
+    # returns the asyncio server listening on host and port
+    # players connecting all at once queue in a backlog as long as the session limit, rather than being dropped
+    async def start_tcp(self, host="127.0.0.1", port=0):
+        await self.__open_files()
+        return await asyncio.start_server(self.__connect, host, port, limit=MAX_LINE_LENGTH, backlog=self.max_sessions)
+
+    # Start Unix
+    # returns the asyncio server listening on a unix socket at path
+    async def start_unix(self, path):
+        await self.__open_files()
+        return await asyncio.start_unix_server(self.__connect, path, limit=MAX_LINE_LENGTH, backlog=self.max_sessions)
+
+    # Close Files
+    # writes every save still waiting, once the players are gone
+    async def close_files(self):
+        if self.shared_files != None:
+            await asyncio.get_running_loop().run_in_executor(None, self.shared_files.close)
+            self.shared_files = None
+
+    # reads the files every game shares, off the event loop
+    async def __open_files(self):
+        if self.shared_files == None:
+            self.shared_files = await asyncio.get_running_loop().run_in_executor(None, SharedFiles)
+
+    async def __connect(self, reader, writer):
+        if len(self.sessions) >= self.max_sessions:
+            writer.write(f"{FULL_MESSAGE}\n".encode("utf-8"))
+            try:
+                await writer.drain()
+            except (ConnectionError, OSError):
+                pass
+            writer.close()
+            return
+
+        session = Session(self, reader, writer)
+        self.sessions.add(session)
+        try:
+            await session.run()
+        finally:
+            self.sessions.discard(session)
+
+# Serve
+# runs a game server until it is interrupted
+# address is a port on the local host, or the path of a unix socket
+async def serve(address):
+    server = GameServer()
+    if address.isdigit() == True:
+        listener = await server.start_tcp("127.0.0.1", int(address))
+    else:
+        listener = await server.start_unix(address)
+
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        await server.close_files()
+
+# Main
+# serves on the port or socket path named on the command line
+def main():
+    address = "7777"
+    if len(sys.argv) > 1:
+        address = sys.argv[1]
+    try:
+        asyncio.run(serve(address))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
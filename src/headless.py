@@ -0,0 +1,171 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+import sys
+from collections import deque
+
+import textmanager
+import outputchannel
+from gamemanager import GameManager
+
+# Headless
+# runs the game manager without a window, for servers, tests, load tests and bots
+# commands come from stdin, a file of commands, or a HeadlessGame driven from python
+# pages go straight on when they end, since no one is there to press enter
+
+# raised to the game when its commands run out
+class EndOfInput(Exception):
+    pass
+
+# Headless Commands
+# stands in for the window's command queue
+# save reports are held until the game next asks for input, clears and speed changes only matter to a window
+class HeadlessCommands():
+    def __init__(self):
+        self.reports = deque() # filled by the save writer thread
+        self.title = None
+
+    def put(self, command):
+        if command.startswith(GameManager.SAVE_REPORT) == True:
+            self.reports.append(command[len(GameManager.SAVE_REPORT):])
+        elif command.startswith(GameManager.CHANGE_TITLE) == True:
+            self.title = command[len(GameManager.CHANGE_TITLE):]
+
+    # Show Reports
+    # displays the save reports that came in since they were last shown
+    def show_reports(self):
+        while len(self.reports) != 0:
+            textmanager.display_text(self.reports.popleft())
+        outputchannel.flush_output()
+
+# Line Input
+# hands the game one line at a time from any iterable of lines, such as a file
+# echo shows each line after the player tag, as if it had been typed
+class LineInput():
+    def __init__(self, lines, commands, echo=False):
+        self.lines = iter(lines)
+        self.commands = commands
+        self.echo = echo
+
+    def get_input(self):
+        self.commands.show_reports()
+
+        line = next(self.lines, None)
+        if line == None:
+            raise EndOfInput()
+
+        line = line.rstrip("\r\n")
+        if self.echo == True:
+            outputchannel.write_output(f"{textmanager.PLAYER_TAG}{line}\n")
+        return line
+
+# Run Lines
+# plays a game through to the end of its lines, or until it quits
+# text goes to the current output channel
+# returns the game manager once every save has been written
+def run_lines(lines, echo=False):
+    commands = HeadlessCommands()
+    game = GameManager(LineInput(lines, commands, echo), commands, False)
+    try:
+        game.run()
+    except EndOfInput:
+        pass
+    finally:
+        game.close_files()
+        commands.show_reports()
+    return game
+
+# Headless Game
+# a game played one command at a time from python, on the calling thread
+# start returns the text shown before the first command, and send returns the text each command shows
+class HeadlessGame():
+    def __init__(self, echo=False):
+        self.echo = echo
+        self.commands = HeadlessCommands()
+        self.output = outputchannel.CapturedOutput()
+        self.game = None
+        self.running = False
+        self.__steps = None
+
+    # Start
+    # plays the game until it first waits on a command
+    # a game exported from another HeadlessGame is picked up from its session data,
+    # showing the player where they are unless show_mode is False
+    def start(self, session_data=None, show_mode=True):
+        token = outputchannel.set_output(self.output)
+        try:
+            self.game = GameManager(None, self.commands, False)
+        finally:
+            outputchannel.reset_output(token)
+
+        if session_data == None:
+            self.__steps = self.game.play()
+        else:
+            self.__steps = self.game.resume(session_data, show_mode)
+        self.running = True
+        return self.__resume(None)
+
+    # Send
+    # plays one line, returning everything it showed
+    # returns None once the game has ended
+    def send(self, line):
+        if self.running == False:
+            return None
+        if self.echo == True:
+            self.output.write(f"{textmanager.PLAYER_TAG}{line}\n")
+        return self.__resume(line)
+
+    # Export
+    # ends the game, returning its session data for another HeadlessGame to start from
+    # returns None, leaving the game running, unless it is waiting on a command
+    def export(self):
+        if self.running == False:
+            return None
+        session_data = self.game.get_session_data()
+        if session_data != None:
+            self.close()
+        return session_data
+
+    # Close
+    # ends the game if it is still running, returning whatever it showed last
+    def close(self):
+        if self.running == True:
+            self.__steps.close()
+            self.__end()
+        return self.output.take_text()
+
+    # plays the game on from where it waited, until it waits again or ends
+    def __resume(self, line):
+        token = outputchannel.set_output(self.output)
+        try:
+            request = self.__steps.send(line)
+            while type(request) == textmanager.BlockingCall:
+                request = textmanager.answer_call(self.__steps, request)
+        except StopIteration:
+            self.__end()
+        finally:
+            self.commands.show_reports()
+            outputchannel.reset_output(token)
+        return self.output.take_text()
+
+    # every save is written once the game ends
+    def __end(self):
+        self.running = False
+        self.game.close_files()
+        token = outputchannel.set_output(self.output)
+        self.commands.show_reports()
+        outputchannel.reset_output(token)
+
+# Main
+# plays the commands in a file named on the command line, or from stdin
+def main():
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], "r") as file:
+            run_lines(file, True)
+    else:
+        run_lines(sys.stdin, sys.stdin.isatty() == False)
+    outputchannel.flush_output()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+import os
+import time
+import shutil
+import tempfile
+from collections import OrderedDict
+
+import filemanager
+import headless
+
+# Hibernation
+# keeps idle games out of memory in a long running server
+# a game left waiting on a command for longer than idle_timeout, or the least recently played once more than
+# max_resident games are held, is written to a spill folder as its session data and dropped
+# the next line sent to it picks it up from its spill file, carrying on without showing the player anything
+
+SPILL_SUFFIX = ".session"
+
+IDLE_TIMEOUT = 600.0 # seconds a game may wait on a command before it hibernates
+MAX_RESIDENT = 1000 # games held in memory before the least recently played hibernate
+
+# Session Store
+# plays headless games by session id, hibernating and waking them as they idle and are played again
+class SessionStore():
+    def __init__(self, max_resident=MAX_RESIDENT, idle_timeout=IDLE_TIMEOUT, clock=time.monotonic):
+        self.max_resident = max_resident
+        self.idle_timeout = idle_timeout
+        self.clock = clock
+
+        # session id -> HeadlessGame, least recently played first
+        self.__games = OrderedDict()
+        self.__last_played = {}
+
+        # session id -> path of the spill file a hibernating game was written to
+        self.__spilled = {}
+        self.__spill_count = 0
+        self.__spill_folder = None
+
+        self.hibernations = 0
+        self.restores = 0
+
+    def __len__(self):
+        return len(self.__games) + len(self.__spilled)
+
+    def __contains__(self, session_id):
+        return session_id in self.__games or session_id in self.__spilled
+
+    # Resident Count
+    # returns how many games are held in memory
+    def resident_count(self):
+        return len(self.__games)
+
+    # Is Resident
+    # returns True if a session's game is held in memory, False if it is hibernating or isn't being played
+    def is_resident(self, session_id):
+        return session_id in self.__games
+
+    # Start
+    # starts a game for a session, or picks one up from session data, returning the text it showed
+    # a session already being played is ended first
+    def start(self, session_id, session_data=None):
+        self.close(session_id)
+
+        game = headless.HeadlessGame()
+        text = game.start(session_data)
+        if game.running == True:
+            self.__played(session_id, game)
+        return text
+
+    # Send
+    # plays one line of a session, waking its game if it is hibernating
+    # returns the text it showed, or None if the session isn't being played or has just ended
+    def send(self, session_id, line):
+        game = self.__games.get(session_id)
+        if game == None:
+            game = self.__restore(session_id)
+            if game == None:
+                return None
+
+        text = game.send(line)
+        if game.running == False:
+            self.__forget(session_id)
+        else:
+            self.__played(session_id, game)
+        return text
+
+    # Export
+    # ends a session's game, returning its session data
+    # returns None, leaving the game running, if it isn't waiting on a command
+    def export(self, session_id):
+        if session_id in self.__spilled:
+            return self.__read_spill(session_id)
+
+        game = self.__games.get(session_id)
+        if game == None:
+            return None
+        session_data = game.export()
+        if session_data != None:
+            self.__forget(session_id)
+        return session_data
+
+    # Close
+    # ends a session's game, hibernating or not
+    def close(self, session_id):
+        game = self.__games.get(session_id)
+        if game != None:
+            game.close()
+            self.__forget(session_id)
+        elif session_id in self.__spilled:
+            os.remove(self.__spilled.pop(session_id))
+
+    # Close All
+    # ends every game and removes the spill folder
+    def close_all(self):
+        for game in self.__games.values():
+            game.close()
+        self.__games.clear()
+        self.__last_played.clear()
+        self.__spilled.clear()
+        if self.__spill_folder != None:
+            shutil.rmtree(self.__spill_folder, True)
+            self.__spill_folder = None
+
+    # Hibernate
+    # writes a session's game to its spill file and drops it from memory
+    # returns False if the game isn't held in memory, or is partway through a question
+    def hibernate(self, session_id):
+        game = self.__games.get(session_id)
+        if game == None:
+            return False
+
+        session_data = game.export()
+        if session_data == None:
+            return False
+        self.__forget(session_id)
+
+        spill_path = os.path.join(self.__folder(), f"{self.__spill_count}{SPILL_SUFFIX}")
+        self.__spill_count += 1
+        with open(spill_path, 'wb') as file:
+            file.write(session_data)
+        self.__spilled[session_id] = spill_path
+        self.hibernations += 1
+        return True
+
+    # Hibernate Idle
+    # hibernates every game which has waited on a command for longer than idle_timeout
+    # returns the ids of the sessions hibernated
+    def hibernate_idle(self):
+        oldest_played = self.clock() - self.idle_timeout
+        idle = []
+        for session_id in self.__games.keys():
+            if self.__last_played[session_id] > oldest_played:
+                break # the rest were played more recently
+            idle.append(session_id)
+        return [ session_id for session_id in idle if self.hibernate(session_id) == True ]
+
+    # marks a game as the most recently played, hibernating the least recently played past max_resident
+    # games partway through a question are passed over, as they can't be taken
+    def __played(self, session_id, game):
+        self.__games[session_id] = game
+        self.__games.move_to_end(session_id)
+        self.__last_played[session_id] = self.clock()
+
+        if len(self.__games) <= self.max_resident:
+            return
+        for least_played in list(self.__games.keys()):
+            if least_played == session_id:
+                continue
+            if self.hibernate(least_played) == True and len(self.__games) <= self.max_resident:
+                return
+
+    # wakes a hibernating game, returning it, or None if the session isn't hibernating
+    def __restore(self, session_id):
+        if session_id not in self.__spilled:
+            return None
+
+        game = headless.HeadlessGame()
+        game.start(self.__read_spill(session_id), False)
+        self.restores += 1
+        return game
+
+    # returns the session data in a session's spill file, removing the file
+    def __read_spill(self, session_id):
+        spill_path = self.__spilled.pop(session_id)
+        with open(spill_path, 'rb') as file:
+            session_data = file.read()
+        os.remove(spill_path)
+        return session_data
+
+    def __forget(self, session_id):
+        self.__games.pop(session_id, None)
+        self.__last_played.pop(session_id, None)
+
+    # each store spills into its own folder, so stores in other processes never share a file
+    def __folder(self):
+        if self.__spill_folder == None:
+            spill_root = os.path.join(filemanager.PROJECT_ROOT, filemanager.DATA_PATH, filemanager.SESSIONS_PATH)
+            os.makedirs(spill_root, exist_ok=True)
+            self.__spill_folder = tempfile.mkdtemp(dir=spill_root)
+        return self.__spill_folder
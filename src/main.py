@@ -35,12 +35,13 @@ def main():
     clear_command = game_logic.CLEAR_COMMAND
     change_title = game_logic.CHANGE_TITLE
     change_speed = game_logic.CHANGE_SPEED
+    save_report = game_logic.SAVE_REPORT
 
     # set animation speed
     app.set_speed(animation_speed)
 
     # set command words
-    app.set_commands(clear_command, change_title, change_speed)
+    app.set_commands(clear_command, change_title, change_speed, save_report)
 
     # run game window with game manager
     app.run()
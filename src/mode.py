@@ -2,6 +2,49 @@
 # 06-10-2024
 # Brian Morris
 
+import sys
+import types
+
+import results
+from vocabulary import Vocabulary
+
+# Intern Text
+# worlds repeat the same names, descriptions and hints across many modes
+# interned, every mode holding the same text holds one string
+def intern_text(text):
+    if type(text) == str:
+        return sys.intern(text)
+    return text
+
+# Add Hints
+# adds the hint of each entry to results, keeping any already there
+def _add_hints(results, entries):
+    for key_string, entry in entries:
+        if entry.hint_text != None and key_string not in results:
+            results[key_string] = entry.hint_text
+
+# Object Entry
+# an object of a mode, with its own hint
+# position is the order the object was added in
+class ObjectEntry():
+    __slots__ = ("description", "hint_text", "position")
+
+    def __init__(self, description, hint_text, position):
+        self.description = description
+        self.hint_text = hint_text
+        self.position = position
+
+# Command Entry
+# a command of a mode, with its own hint
+# position is the order the command was added in
+class CommandEntry():
+    __slots__ = ("funct", "hint_text", "position")
+
+    def __init__(self, funct, hint_text, position):
+        self.funct = funct
+        self.hint_text = hint_text
+        self.position = position
+
 # Mode
 # Encapsulates a mode of operation
 # in which the user interacts with Text Adventure
@@ -22,127 +65,316 @@ class Mode():
 
     # all modes have HELP, LOOK, BACK, and QUIT commands
     def _back_funct(self, targets=None):
-        return f"{self.CHANGE_MODE}{self.BACK_SIGNATURE}"
+        return results.ChangeMode(self.BACK_SIGNATURE)
     
     def _quit_funct(self, targets=None):
-        return f"{self.CHANGE_MODE}{self.QUIT_SIGNATURE}"
+        return results.ChangeMode(self.QUIT_SIGNATURE)
     
     def _look_funct(self, targets=None):
         if targets:
-            if targets[0] == self.ALL_OBJECTS and len(self.__objects.keys()) == 1:
-                return "There is nothing here..."
+            if targets[0] == self.ALL_OBJECTS:
+                if len(self.__objects) == 0:
+                    return "There is nothing here..."
+                return self.__get_object_details()
 
             results = {}
-            # find references in objects
-            for key_string in self.__objects.keys():
-                if (key_string in targets or targets[0] == self.ALL_OBJECTS) and key_string != self.ALL_OBJECTS:
-                    results[key_string] = self.__objects[key_string]
+            # find references in objects, in the order the objects were added
+            for key_string, entry in self.__find_entries(targets, self.__objects):
+                results[key_string] = entry.description
             
             # any non-matching targets should be None
             for target in targets:
-                if target not in results.keys() and targets[0] != self.ALL_OBJECTS:
+                if target not in results:
                     results[target] = None
             
             return results
         else:
             # if no targets were specified, we should return a list of all objects
-            results = []
-            if len(self.__objects.keys()) == 1: # there will always be a dummy "all" object
+            if len(self.__objects) == 0:
                 return "There is nothing here..."
-            for key_string in self.__objects.keys():
-                if key_string != self.ALL_OBJECTS:
-                    results.append(key_string)
-            return results
+            # the same list is handed back until objects change, so its layout is only worked out once
+            if self.__object_listing == None:
+                self.__object_listing = list(self.__objects.keys())
+            return self.__object_listing
 
+    # an object and a command of the same name each keep their own hint, and help shows the object's
     def _help_funct(self, targets=None):
         if targets:
+            if targets[0] == self.ALL_OBJECTS:
+                # every hint, kept until objects or commands change
+                if self.__hint_listing == None:
+                    self.__hint_listing = {}
+                    _add_hints(self.__hint_listing, self.__objects.items())
+                    _add_hints(self.__hint_listing, self.__commands.items())
+                return self.__hint_listing
+
             results = {}
-            # find references in objects and commands
-            for key_string in self.__objects.keys():
-                if (key_string in targets or targets[0] == self.ALL_OBJECTS) and key_string != self.ALL_OBJECTS:
-                    hint_text = self.__hints[key_string]
-                    if hint_text != None:
-                        results[key_string] = hint_text
-            for key_string in self.__commands.keys():
-                if (key_string in targets or targets[0] == self.ALL_OBJECTS) and key_string != self.ALL_OBJECTS:
-                    hint_text = self.__hints[key_string]
-                    if hint_text != None:
-                        results[key_string] = hint_text
+            # find references in objects and commands, in the order they were added
+            _add_hints(results, self.__find_entries(targets, self.__objects))
+            _add_hints(results, self.__find_entries(targets, self.__commands))
             
             # any non-matching targets should be None
             # as well as any objects which have no hint text
             for target in targets:
-                if target not in results.keys() and targets[0] != self.ALL_OBJECTS:
+                if target not in results:
                     results[target] = None
             
             return results
         else:
             # if no targets were specified, we should return a list of all commands
-            results = []
-            for key_string in self.__commands.keys():
-                results.append(key_string)
-            return results
+            if self.__command_listing == None:
+                self.__command_listing = list(self.__commands.keys())
+            return self.__command_listing
+
+    # Find Entries
+    # returns the key and entry of each target found in objects or commands, in the order they were added
+    # each target is looked up directly, and only the ones found are sorted
+    def __find_entries(self, targets, table):
+        found = [ (target, table[target]) for target in targets if target in table ]
+        if len(found) < 2:
+            return found
+        return sorted(set(found), key=self.__entry_position)
+
+    def __entry_position(self, found):
+        return found[1].position
+
+    # every object's description by name, kept until objects change
+    def __get_object_details(self):
+        if self.__object_details == None:
+            self.__object_details = { key_string : entry.description for key_string, entry in self.__objects.items() }
+        return self.__object_details
+
+    # listings are rebuilt the next time they are asked for
+    def __objects_changed(self):
+        self.__object_listing = None
+        self.__object_details = None
+        self.__hint_listing = None
+
+    def __commands_changed(self):
+        self.__command_listing = None
+        self.__hint_listing = None
+
+    # HELP, LOOK, BACK, and QUIT, shared by every mode
+    # built in commands are called with the mode they are run in
+    _BUILT_IN_COMMANDS = {
+        HELP_COMMAND : CommandEntry(_help_funct, "List commands, or get a hint on any object or command.", 0),
+        LOOK_COMMAND : CommandEntry(_look_funct, "List objects, or get some details on any object.", 1),
+        BACK_COMMAND : CommandEntry(_back_funct, "Return to previous menu, or close menu.", 2),
+        QUIT_COMMAND : CommandEntry(_quit_funct, "Quit to main menu or desktop.", 3) }
+
+    __slots__ = ("prompt", "__template", "__owner", "__commands", "__objects", "__next_position",
+        "__object_listing", "__object_details", "__command_listing", "__hint_listing",
+        "__command_words", "__object_words")
 
     # define mode
-    def __init__(self, prompt):
-        self.prompt = prompt
-        self.__commands = {}
-        self.__hints = {}
-        self.__objects = {}
+    # a mode made from a template starts out sharing the template's tables, listings and tries,
+    # and copies a table the first time it changes it; template commands are called with owner
+    def __init__(self, prompt, template=None, owner=None):
+        self.prompt = intern_text(prompt)
+        self.__template = template
+        self.__owner = owner
+        if template != None:
+            self.__commands = template.commands
+            self.__objects = template.objects
+            self.__next_position = template.next_position
+            self.__object_listing = template.object_listing
+            self.__object_details = template.object_details
+            self.__command_listing = template.command_listing
+            self.__hint_listing = template.hint_listing
+            self.__command_words = template.command_words
+            self.__object_words = template.object_words
+            return
+
         # all modes have HELP, LOOK, BACK, and QUIT
-        self.add_command(self.HELP_COMMAND, self._help_funct,
-            "List commands, or get a hint on any object or command.")
-        self.add_command(self.LOOK_COMMAND, self._look_funct,
-            "List objects, or get some details on any object.")
-        self.add_command(self.BACK_COMMAND, self._back_funct,
-            "Return to previous menu, or close menu.")
-        self.add_command(self.QUIT_COMMAND, self._quit_funct,
-            "Quit to main menu or desktop.")
-        self.add_object(self.ALL_OBJECTS, "Every target that you can possibly command.", "Easy shortcut for targetting everything.")
+        self.__commands = dict(self._BUILT_IN_COMMANDS)
+        self.__objects = {}
+        # positions only ever grow, so removing a key leaves the others in order
+        self.__next_position = len(self.__commands)
+        # listings returned by look and help, rebuilt after a change
+        self.__objects_changed()
+        self.__commands_changed()
+        # tries over command and object keys, built the first time a word is not found exactly
+        self.__command_words = None
+        self.__object_words = None
+
+    # tables shared with a template are copied before their first change, along with a fresh trie
+    def __own_objects(self):
+        if self.__template != None and self.__objects is self.__template.objects:
+            self.__objects = dict(self.__objects)
+            self.__object_words = None
+
+    def __own_commands(self):
+        if self.__template != None and self.__commands is self.__template.commands:
+            self.__commands = dict(self.__commands)
+            self.__command_words = None
     
     # Add Object
     # adds a new valid object target
     # mutates object if already exists
     def add_object(self, key_string, description, hint_text=None):
-        self.__objects[key_string] = description
-        self.__hints[key_string] = hint_text
+        self.__own_objects()
+        entry = self.__objects.get(key_string)
+        if entry == None:
+            key_string = intern_text(key_string)
+            position = self.__next_position
+            self.__next_position += 1
+        else:
+            position = entry.position
+        # entries may be shared with a template, so an object is always given a new entry
+        self.__objects[key_string] = ObjectEntry(intern_text(description), intern_text(hint_text), position)
+        self.__objects_changed()
+        if self.__object_words != None:
+            self.__object_words.add(key_string)
     
     # Delete Object
     # remove an object from the dictionary
     def delete_object(self, key_string):
         if key_string in self.__objects.keys():
+            self.__own_objects()
             del self.__objects[key_string]
+            self.__objects_changed()
+            if self.__object_words != None:
+                self.__object_words.remove(key_string)
     
     # Clear Objects
     # remove all objects from the dictionary
     def clear_objects(self):
         self.__objects = {}
+        self.__objects_changed()
+        self.__object_words = None
     
     # Add Function
     # adds a new function to mode's command dictionary
     # mutates function if it already exists
     def add_command(self, key_string, funct, hint_text=None):
-        self.__commands[key_string] = funct
-        self.__hints[key_string] = hint_text
+        self.__own_commands()
+        entry = self.__commands.get(key_string)
+        if entry == None:
+            key_string = intern_text(key_string)
+            position = self.__next_position
+            self.__next_position += 1
+        else:
+            position = entry.position
+        # built in and template entries are shared, so a command is always given a new entry
+        self.__commands[key_string] = CommandEntry(funct, intern_text(hint_text), position)
+        self.__commands_changed()
+        if self.__command_words != None:
+            self.__command_words.add(key_string)
 
     def is_command(self, verb):
         return verb in self.__commands.keys()
 
+    # "all" is a valid target in every mode
     def is_valid(self, noun):
-        return noun in self.__objects.keys()
+        return noun == self.ALL_OBJECTS or noun in self.__objects.keys()
     
+    # Resolve Command
+    # returns the command a verb names, either whole or by a start no other command shares
+    # quit ends the session, so it is only ever named whole
+    # returns None if there is no such command
+    def resolve_command(self, verb):
+        if verb in self.__commands.keys():
+            return verb
+        command = self.__get_command_words().resolve(verb)
+        if command == self.QUIT_COMMAND:
+            return None
+        return command
+
+    # Resolve Object
+    # returns the object a noun names, either whole or by a start no other object shares
+    # returns None if there is no such object
+    def resolve_object(self, noun):
+        if self.is_valid(noun) == True:
+            return noun
+        return self.__get_object_words().resolve(noun)
+
+    # Suggest Commands
+    # returns the commands a verb is the start of, or else commands a typo away from it
+    def suggest_commands(self, verb):
+        command_words = self.__get_command_words()
+        suggestions = command_words.complete(verb)
+        if len(suggestions) == 0:
+            suggestions = command_words.suggest(verb)
+        return suggestions
+
+    # Suggest Objects
+    # returns the objects a noun is the start of, or else objects a typo away from it
+    def suggest_objects(self, noun):
+        object_words = self.__get_object_words()
+        suggestions = object_words.complete(noun)
+        if len(suggestions) == 0:
+            suggestions = object_words.suggest(noun)
+        return suggestions
+
+    def __get_command_words(self):
+        if self.__command_words == None:
+            self.__command_words = Vocabulary(self.__commands.keys())
+        return self.__command_words
+
+    def __get_object_words(self):
+        if self.__object_words == None:
+            self.__object_words = Vocabulary(self.__objects.keys())
+        return self.__object_words
+
     # Run Command
     # runs a command stored in command_dict if it can
     # returns None if command could not be ran, otherwise returns result
     def run_command(self, verb, noun_list=None):
         # look for a matching command
-        if verb not in self.__commands.keys():
+        entry = self.__commands.get(verb)
+        if entry == None:
             return None
         
         # if using reserved command, return function result called on self
         if verb in self.RESERVE_WORDS:
-            return self.__commands[verb](noun_list)
+            if entry is self._BUILT_IN_COMMANDS[verb]:
+                return entry.funct(self, noun_list)
+            return entry.funct(noun_list)
         
-        # pass control to a custom command
-        return self.__commands[verb](self.__objects, noun_list)
-        
\ No newline at end of file
+        # pass control to a custom command, with the description of each of the mode's objects by name
+        # read only, as a mode made from a template shares them with every other mode made from it until it changes them
+        # template commands are plain functions, called with the mode's owner
+        objects = types.MappingProxyType(self.__get_object_details())
+        if self.__template != None and self.__template.commands.get(verb) is entry:
+            return entry.funct(self.__owner, objects, noun_list)
+        return entry.funct(objects, noun_list)
+
+# Mode Template
+# the static content of a mode, compiled once and shared read only by every mode made from it:
+# its prompt, command and object tables, the listings look and help hand back, and the tries over its words
+# commands are plain functions, such as a class's methods taken in its body, and are called with the owner of each mode
+# objects only one session changes are added to its own mode, which copies the shared table first
+class ModeTemplate():
+    __slots__ = ("prompt", "commands", "objects", "next_position",
+        "object_listing", "object_details", "command_listing", "hint_listing",
+        "command_words", "object_words")
+
+    # commands are (key, funct, hint), and objects are (key, description, hint)
+    def __init__(self, prompt, commands=(), objects=()):
+        self.prompt = intern_text(prompt)
+
+        self.commands = dict(Mode._BUILT_IN_COMMANDS)
+        for key_string, funct, hint_text in commands:
+            self.commands[intern_text(key_string)] = CommandEntry(funct, intern_text(hint_text), len(self.commands))
+        self.objects = {}
+        for key_string, description, hint_text in objects:
+            self.objects[intern_text(key_string)] = ObjectEntry(intern_text(description), intern_text(hint_text), len(self.commands) + len(self.objects))
+        self.next_position = len(self.commands) + len(self.objects)
+
+        self.object_listing = list(self.objects.keys())
+        self.object_details = { key_string : entry.description for key_string, entry in self.objects.items() }
+        self.command_listing = list(self.commands.keys())
+        self.hint_listing = {}
+        _add_hints(self.hint_listing, self.objects.items())
+        _add_hints(self.hint_listing, self.commands.items())
+
+        self.command_words = Vocabulary(self.commands.keys())
+        self.object_words = Vocabulary(self.objects.keys())
+
+    # New Mode
+    # returns a mode sharing this template's content, whose commands are called with owner
+    def new_mode(self, owner):
+        return Mode(self.prompt, self, owner)
+
+# commands may still return CHANGE_MODE followed by a signature
+results.register_prefix(Mode.CHANGE_MODE, results.ChangeMode)
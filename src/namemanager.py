@@ -0,0 +1,80 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+from functools import lru_cache
+
+# Name Manager
+# normalizes player text through tables built once:
+# lowering letters, checking for invalid characters, and turning names into file names
+
+UPPER_CASE = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+LOWER_CASE = "abcdefghijklmnopqrstuvwxyz"
+
+MAX_NAME_LENGTH = 15
+
+# file names use this in place of spaces
+SLUG_SEPARATOR = "-"
+
+# names remembered by the name caches
+NAME_CACHE_SIZE = 256
+
+# text is checked as ascii bytes: A-Z are lowered, and every byte besides letters and spaces is deleted
+# so text is valid only if translating it keeps its length
+_LOWER_TABLE = str.maketrans(UPPER_CASE, LOWER_CASE)
+_LOWER_BYTES = bytes.maketrans(UPPER_CASE.encode('ascii'), LOWER_CASE.encode('ascii'))
+_INVALID_BYTES = bytes(code for code in range(256) if chr(code) not in UPPER_CASE + LOWER_CASE + " ")
+
+# To Lower
+# reduces A-Z to lower case, leaving every other character as it is
+def to_lower(text):
+    if text.isascii() == True:
+        return text.encode('ascii').translate(_LOWER_BYTES).decode('ascii') # bytes translate far faster
+    return text.translate(_LOWER_TABLE)
+
+# Lower Letters
+# returns text lowered, or None if it has anything besides a-z, A-Z and spaces
+def lower_letters(text):
+    # non ascii characters are never valid
+    if text.isascii() == False:
+        return None
+
+    clean_bytes = text.encode('ascii').translate(_LOWER_BYTES, _INVALID_BYTES)
+    if len(clean_bytes) != len(text):
+        return None # invalid character deleted
+
+    return clean_bytes.decode('ascii')
+
+# Clean Name
+# safely limits name length and invalid character use
+# runs of spaces become one space, and only the first MAX_NAME_LENGTH characters are kept
+# returns None if name contains invalid characters
+def clean_name(name_string):
+    return normalize_name(name_string)[0]
+
+# Normalize Name
+# turns a raw player name into its clean display name and the file name its saves use
+# returns None, None if the name is empty or contains invalid characters
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def normalize_name(name_string):
+    if name_string == None:
+        return None, None
+
+    # skip spaces at either end, and runs of spaces
+    words = name_string.split(' ')
+    name_string = " ".join([ word for word in words if word != "" ])
+    if len(name_string) == 0:
+        return None, None
+
+    # characters past the length limit are never looked at
+    display_name = lower_letters(name_string[:MAX_NAME_LENGTH])
+    if display_name == None:
+        return None, None
+
+    return display_name, display_name.replace(' ', SLUG_SEPARATOR)
+
+# Slug Name
+# returns the file name used for a save with an already clean display name
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def slug_name(display_name):
+    return display_name.replace(' ', SLUG_SEPARATOR)
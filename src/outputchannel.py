@@ -0,0 +1,93 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+import sys
+import contextvars
+
+# Output Channel
+# collects the text the game displays and hands it to the frontend in one write,
+# once per command turn, before a page break, or when the buffer fills up
+
+# characters buffered before the channel flushes on its own
+OUTPUT_BUFFER_SIZE = 8192
+
+class OutputChannel():
+    # write_funct is given each flushed block of text
+    # with no write_funct, text goes to whatever sys.stdout is at the time of the flush
+    def __init__(self, write_funct=None, buffer_size=OUTPUT_BUFFER_SIZE):
+        self.__write_funct = write_funct
+        self.__buffer_size = buffer_size
+        self.__parts = []
+        self.__size = 0
+
+        # characters that fit on a line of the frontend, None until it reports it
+        self.char_width = None
+
+    # Write
+    # adds text to the buffer, flushing if it has filled up
+    def write(self, text):
+        self.__parts.append(text)
+        self.__size += len(text)
+        if self.__size >= self.__buffer_size:
+            self.flush()
+
+    # Flush
+    # hands everything buffered to the frontend as one block
+    def flush(self):
+        if self.__size == 0:
+            return
+
+        text = "".join(self.__parts)
+        self.__parts = []
+        self.__size = 0
+
+        if self.__write_funct == None:
+            print(text, file=sys.stdout, flush=True, end="")
+        else:
+            self.__write_funct(text)
+
+# Captured Output
+# an output channel that keeps every flushed block, for headless and test runs
+class CapturedOutput(OutputChannel):
+    def __init__(self, buffer_size=OUTPUT_BUFFER_SIZE):
+        self.blocks = []
+        super().__init__(self.blocks.append, buffer_size)
+
+    # returns all text flushed so far, and forgets it
+    def take_text(self):
+        self.flush()
+        text = "".join(self.blocks)
+        self.blocks.clear()
+        return text
+
+# channel used when the current context has not set one
+_default_output = OutputChannel()
+_current_output = contextvars.ContextVar("current_output", default=None)
+
+# Get Output
+# returns the channel display text is written to in the current context
+def get_output():
+    output = _current_output.get()
+    if output == None:
+        return _default_output
+    return output
+
+# Set Output
+# routes display text in the current context to a channel
+# returns a token that reset_output takes to restore the channel before it
+def set_output(output):
+    return _current_output.set(output)
+
+def reset_output(token):
+    _current_output.reset(token)
+
+# Write Output
+# buffers text on the current channel
+def write_output(text):
+    get_output().write(text)
+
+# Flush Output
+# sends everything buffered on the current channel to the frontend
+def flush_output():
+    get_output().flush()
@@ -0,0 +1,115 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+# Results
+# what a command hands back to the game manager
+# text and listings are shown to the user, the others tell the game manager what to do next
+# results can't be changed once made, so one result can be handed out for every return of the same string
+
+class Result():
+    __slots__ = ()
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"{type(self).__name__} results can't be changed")
+
+    def __delattr__(self, key):
+        raise AttributeError(f"{type(self).__name__} results can't be changed")
+
+# Text
+# a message to show the user
+class Text(Result):
+    __slots__ = ("text",)
+
+    def __init__(self, text):
+        object.__setattr__(self, "text", text)
+
+# Listing
+# a list of names, or a dict of names and details, to lay out for the user
+# a detail of None in a dict means that name was not found
+class Listing(Result):
+    __slots__ = ("items",)
+
+    def __init__(self, items):
+        object.__setattr__(self, "items", items)
+
+# Silent
+# the command has already shown everything it needs to
+class Silent(Result):
+    __slots__ = ()
+
+# Change Mode
+# move to the mode with a signature
+class ChangeMode(Result):
+    __slots__ = ("signature",)
+
+    def __init__(self, signature):
+        object.__setattr__(self, "signature", signature)
+
+# World Command
+# ask the game manager to do something for the world, such as saving it
+class WorldCommand(Result):
+    __slots__ = ("command",)
+
+    def __init__(self, command):
+        object.__setattr__(self, "command", command)
+
+SILENT = Silent()
+
+# legacy string returns that start with a registered prefix stand for a result of that type
+# prefix -> result type, taking the rest of the string
+_legacy_prefixes = {}
+# the same prefixes, so a string can be tested against them all with one startswith
+_prefix_tuple = ()
+
+# the results read from strings commands have returned, as commands mostly return the same few messages
+_string_results = {}
+STRING_RESULTS_SIZE = 1024 # strings remembered before they are all forgotten, so changing text can't grow them forever
+
+# Register Prefix
+# lets commands keep returning a prefixed string in place of a result
+def register_prefix(prefix, result_type):
+    global _prefix_tuple
+    _legacy_prefixes[prefix] = result_type
+    _prefix_tuple = tuple(_legacy_prefixes.keys())
+    _string_results.clear() # strings already read may start with the new prefix
+
+# To Result
+# turns whatever a command returned into a result
+# strings are read as they used to be: a registered prefix followed by at least two characters,
+# a lone newline for nothing to show, and anything else as text
+# returns None if the command returned None
+def to_result(mode_return):
+    if type(mode_return) is str:
+        try:
+            return _string_results[mode_return]
+        except KeyError:
+            pass
+        if len(_string_results) >= STRING_RESULTS_SIZE:
+            _string_results.clear()
+        result = _read_string(mode_return)
+        _string_results[mode_return] = result
+        return result
+
+    if mode_return == None or isinstance(mode_return, Result) == True:
+        return mode_return
+
+    if isinstance(mode_return, (list, dict)) == True:
+        return Listing(mode_return)
+
+    if isinstance(mode_return, str) == False:
+        return Text(mode_return)
+
+    return _read_string(mode_return)
+
+# reads a string as it used to be read
+def _read_string(mode_return):
+    # most commands return plain text, so that is ruled out before anything else
+    if mode_return.startswith(_prefix_tuple) == False:
+        return SILENT if mode_return == "\n" else Text(mode_return)
+
+    for prefix, result_type in _legacy_prefixes.items():
+        if len(mode_return) > len(prefix) + 1 and mode_return.startswith(prefix) == True:
+            return result_type(mode_return[len(prefix):])
+
+    return Text(mode_return)
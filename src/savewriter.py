@@ -0,0 +1,154 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+import threading
+from queue import Queue
+
+import errormanager
+
+# Save Writer
+# writes files on a background thread so the game never waits on the disk
+# every write belongs to a slot, and a write waiting in a slot is replaced by newer writes to it
+class SaveWriter():
+    # writes which can wait at once before submit blocks
+    DEFAULT_MAX_PENDING = 16
+
+    # queued to stop the writer thread
+    _STOP = object()
+
+    def __init__(self, command_queue, report_command, max_pending=DEFAULT_MAX_PENDING):
+        # results are reported to the window through the command queue
+        self.command_queue = command_queue
+        self.report_command = report_command
+
+        # slots in the order they were submitted, and the write waiting in each
+        self.__slots = Queue(max_pending)
+        self.__pending = {}
+        self.__lock = threading.Lock()
+
+        # the writer thread starts with the first write, so games which never write hold no thread
+        self.__thread = threading.Thread(target=self.__run)
+        self.__thread.daemon = True
+        self.__started = False
+        # once closed there is no writer thread, so writes are done on the thread which submits them
+        self.__closed = False
+
+    # Submit
+    # queues funct(*args) to be run by the writer for a slot
+    # if the slot already has a write waiting, it is replaced by this one
+    # report_text is sent to the window once the write is done, through report_queue if it is given
+    # and the writer's command queue if not
+    def submit(self, slot, report_text, funct, *args, report_queue=None):
+        if self.__closed == True:
+            self.__write(slot, report_text, funct, args, report_queue)
+            return
+
+        with self.__lock:
+            self.__start()
+            is_waiting = slot in self.__pending
+            self.__pending[slot] = (report_text, funct, args, report_queue)
+
+        if is_waiting == False:
+            self.__slots.put(slot) # blocks while the writer is too far behind
+
+    # Submit Changes
+    # queues funct(changes, *args) to be run by the writer for a slot, where changes is a dict
+    # if the slot already has changes waiting, they are merged with these, newer values winning
+    def submit_changes(self, slot, report_text, funct, changes, *args, report_queue=None):
+        if self.__closed == True:
+            self.__write(slot, report_text, funct, (changes,) + args, report_queue)
+            return
+
+        with self.__lock:
+            self.__start()
+            waiting = self.__pending.get(slot)
+            is_waiting = waiting != None
+            if is_waiting == True and waiting[1] == funct:
+                merged = dict(waiting[2][0])
+                merged.update(changes)
+                changes = merged
+            self.__pending[slot] = (report_text, funct, (changes,) + args, report_queue)
+
+        if is_waiting == False:
+            self.__slots.put(slot) # blocks while the writer is too far behind
+
+    # Flush
+    # waits until every submitted write is on disk
+    def flush(self):
+        self.__slots.join()
+
+    # Close
+    # writes everything still waiting, then stops the writer thread
+    # writes submitted after closing are done straight away on the thread which submits them
+    def close(self):
+        self.__closed = True
+        if self.__thread.is_alive() == False:
+            return
+
+        self.__slots.put(self._STOP)
+        self.__thread.join()
+
+    # starts the writer thread if it has not started yet, while holding the lock
+    def __start(self):
+        if self.__started == False:
+            self.__started = True
+            self.__thread.start()
+
+    # writer thread loop
+    def __run(self):
+        while True:
+            slot = self.__slots.get()
+            if slot is self._STOP:
+                self.__slots.task_done()
+                return
+
+            with self.__lock:
+                report_text, funct, args, report_queue = self.__pending.pop(slot)
+
+            try:
+                self.__write(slot, report_text, funct, args, report_queue)
+            finally:
+                self.__slots.task_done()
+
+    # runs one write, reporting how it went to the window
+    def __write(self, slot, report_text, funct, args, report_queue):
+        if report_queue == None:
+            report_queue = self.command_queue
+
+        try:
+            funct(*args)
+            if report_text != None:
+                report_queue.put(f"{self.report_command}{report_text}")
+        except Exception as error:
+            errormanager.log_error(error)
+            report_queue.put(f"{self.report_command}Could not write \"{slot}\": {error}")
+
+# Snapshot
+# copies a classed object cheaply so it can be written while the original keeps changing
+# lists and dicts are copied, everything else is shared since it cannot change
+def snapshot(classed_object):
+    result = classed_object.__class__.__new__(classed_object.__class__)
+    for key, value in vars(classed_object).items():
+        result.__dict__[key] = copy_value(value)
+    return result
+
+# types that never need copying
+_IMMUTABLE_TYPES = { str, int, float, bool, type(None), tuple }
+
+# Copy Value
+# copies the lists and dicts inside a value, sharing everything else
+def copy_value(value):
+    if isinstance(value, list):
+        result = list(value)
+        if _IMMUTABLE_TYPES.issuperset(map(type, result)) == False:
+            for index, item in enumerate(result):
+                result[index] = copy_value(item)
+        return result
+    if isinstance(value, dict):
+        result = dict(value)
+        if _IMMUTABLE_TYPES.issuperset(map(type, result.values())) == False:
+            for key, item in result.items():
+                result[key] = copy_value(item)
+        return result
+    return value
@@ -0,0 +1,189 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+import copy
+
+# Schema
+# a registry of the data structs which are read from and written to files
+# each struct's member variables are worked out once, from a default object of it,
+# and compiled into a loader and a dumper which every read and write of that struct then uses
+#
+# loading a struct skips its __init__, checks every member variable against its default's type,
+# and fills in defaults for member variables which are missing or the wrong type
+# member variables a default struct doesn't have, such as ones added to a world as it is played,
+# are kept as they are when loaded, and written along with the rest
+
+# Compiled Schema
+# the member variables of one struct, and the loader and dumper compiled for it
+class CompiledSchema():
+    __slots__ = ( "class_type", "fields", "field_set", "defaults", "checks", "load", "dump" )
+
+    def __init__(self, class_type):
+        default_members = vars(class_type())
+
+        self.class_type = class_type
+        self.fields = tuple(default_members.keys())
+        self.field_set = frozenset(self.fields)
+        self.defaults = dict(default_members)
+        self.checks = { key : _type_check(value) for key, value in default_members.items() }
+
+        # Load: builds a struct from a dict of member variables without running its __init__
+        # Dump: returns a dict of the struct's member variables to be written, in order
+        self.load = self.__compile_loader()
+        self.dump = self.__compile_dumper()
+
+    # Apply
+    # sets the member variables from a dict of changes onto an existing struct
+    # wrongly typed changes to known member variables are skipped, and unknown ones are set unchecked
+    def apply(self, classed_object, changes):
+        for key, value in changes.items():
+            if key not in self.checks or self.is_valid(key, value) == True:
+                setattr(classed_object, key, value)
+
+    # Is Valid
+    # returns True if a value can be held by a member variable
+    def is_valid(self, key, value):
+        accepted_types = self.checks[key]
+        if accepted_types == None or type(value) in accepted_types:
+            return True
+        if type(value) is bool:
+            return False # bools never pass as numbers
+        return isinstance(value, tuple(accepted_types))
+
+    # Default
+    # returns a fresh copy of a member variable's default value
+    def default(self, key):
+        value = self.defaults[key]
+        if type(value) in _IMMUTABLE_TYPES:
+            return value
+        return copy.deepcopy(value)
+
+    # returns a value read for a member variable which failed its fast type check
+    # subclasses of the accepted types are kept, anything else is replaced by the default
+    def _fallback(self, key, value):
+        if value is not _MISSING and self.is_valid(key, value) == True:
+            return value
+        return self.default(key)
+
+    # writes the source of a loader specialized to this struct's member variables, and compiles it
+    # every member variable gets its own lookup and type check, with no loop or per-key dispatch
+    def __compile_loader(self):
+        items = []
+        type_names = {} # each accepted type is given its own name in the loader's scope
+
+        for key in self.fields:
+            if self.checks[key] == None:
+                items.append(f"{key!r} : value if (value := get({key!r}, _MISSING)) is not _MISSING else _default({key!r})")
+                continue
+
+            type_checks = []
+            for accepted_type in _sorted_types(self.checks[key]):
+                type_name = type_names.setdefault(accepted_type, f"_type_{len(type_names)}")
+                type_checks.append(f"value_type is {type_name}")
+            items.append(f"{key!r} : value if (value_type := type(value := get({key!r}, _MISSING))) is {type_checks[0][len('value_type is '):]}"
+                + "".join(f" or {type_check}" for type_check in type_checks[1:]) + f" else _fallback({key!r}, value)")
+
+        lines = [ "def load(member_variables):",
+            "    get = member_variables.get",
+            "    state = {",
+            "        " + ",\n        ".join(items),
+            "    }",
+            # member variables outside the schema are kept unchecked
+            "    if (member_variables.keys() <= _field_set) == False:",
+            "        for key, value in member_variables.items():",
+            "            if key not in state:",
+            "                state[key] = value" ]
+        lines.append("    new_object = _new(_class_type)")
+        if getattr(self.class_type, "__setstate__", None) != getattr(object, "__setstate__", None):
+            # structs which track their own state are handed their member variables through __setstate__
+            lines.append("    new_object.__setstate__(state)")
+        else:
+            lines.append("    new_object.__dict__.update(state)")
+        lines.append("    return new_object")
+
+        scope = { type_name : accepted_type for accepted_type, type_name in type_names.items() }
+        return self.__compile("\n".join(lines), "load", scope)
+
+    # writes the source of a dumper specialized to this struct's member variables, and compiles it
+    # structs holding just the schema's member variables are written in its order,
+    # and any others are written with every member variable they hold
+    def __compile_dumper(self):
+        items = ", ".join(f"{key!r} : members[{key!r}]" for key in self.fields)
+        lines = [ "def dump(classed_object):",
+            "    members = classed_object.__dict__",
+            "    if len(members) == _field_count:",
+            "        try:",
+            f"            return {{ {items} }}",
+            "        except KeyError:",
+            "            pass",
+            "    return dict(members)" ]
+
+        return self.__compile("\n".join(lines), "dump", {})
+
+    def __compile(self, source, funct_name, scope):
+        scope.update({ "_MISSING" : _MISSING, "_new" : object.__new__, "_class_type" : self.class_type,
+            "_field_set" : self.field_set, "_field_count" : len(self.fields), "_default" : self.default, "_fallback" : self._fallback })
+        exec(compile(source, f"<schema {self.class_type.__qualname__}.{funct_name}>", "exec"), scope)
+        return scope[funct_name]
+
+# compiled schemas by struct type
+_schemas = {}
+
+# Register
+# compiles the schema of a struct, which must be constructable without arguments
+# returns the compiled schema
+def register(class_type):
+    compiled = CompiledSchema(class_type)
+    _schemas[class_type] = compiled
+    return compiled
+
+# Schema For
+# returns the compiled schema of a struct, compiling it the first time a struct is seen
+def schema_for(class_type):
+    compiled = _schemas.get(class_type)
+    if compiled == None:
+        compiled = register(class_type)
+    return compiled
+
+# Load
+# builds a struct of class_type from a dict of member variables
+def load(member_variables, class_type):
+    return schema_for(class_type).load(member_variables)
+
+# Dump
+# returns the dict of member variables to write for a struct
+def dump(classed_object):
+    return schema_for(type(classed_object)).dump(classed_object)
+
+# Apply
+# sets a dict of changed member variables onto a struct
+def apply(classed_object, changes):
+    schema_for(type(classed_object)).apply(classed_object, changes)
+
+# marks a member variable missing from a file
+_MISSING = object()
+
+# default values which can be shared rather than copied
+_IMMUTABLE_TYPES = { str, int, float, bool, type(None), tuple }
+
+# returns the set of types accepted for a member variable, from its default value
+# returns None if any type is accepted
+def _type_check(default_value):
+    default_type = type(default_value)
+
+    if default_value is None:
+        return None # member variables which start empty can hold anything
+    if default_type is bool:
+        return frozenset([ bool ]) # True and False are ints, but ints are not True and False
+    if default_type is int or default_type is float:
+        return frozenset([ int, float ]) # json does not keep 1.0 apart from 1
+    if isinstance(default_value, list):
+        return frozenset([ list ])
+    if isinstance(default_value, dict):
+        return frozenset([ dict ])
+    return frozenset([ default_type ])
+
+# accepted types in a fixed order, so compiled loaders come out the same every run
+def _sorted_types(accepted_types):
+    return sorted(accepted_types, key=lambda accepted_type: accepted_type.__name__)
@@ -0,0 +1,223 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+import zlib
+import multiprocessing
+
+import errormanager
+import filemanager
+import hibernation
+
+# Session Router
+# spreads games over a pool of worker processes, so command handlers run on every core rather than under one lock
+# each session sticks to the worker its id hashes to, unless it is migrated to another,
+# which hands over the player's world and mode as session data between turns
+
+HEALTH_TIMEOUT = 5.0 # seconds a worker has to answer a health check before it is restarted
+IDLE_CHECK_INTERVAL = 10.0 # seconds a quiet worker waits on requests before checking for idle games again
+
+# requests handled by a worker: (request, payload)
+START = "start" # session id -> text shown
+SEND = "send" # list of (session id, line) -> list of text shown, None for sessions which have ended
+CLOSE = "close" # session id -> None
+EXPORT = "export" # session id -> session data, or None if it can't be taken now
+IMPORT = "import" # (session id, session data) -> text shown
+PING = "ping" # None -> PING
+
+# Worker Main
+# plays the games of one worker process, answering requests from the router until the pipe closes
+# setup, if given, is called first, to prepare the process in ways that must happen inside it
+# games idle past idle_timeout, or beyond max_resident, hibernate to disk until they are next played
+def _worker_main(connection, project_root, setup, max_resident, idle_timeout):
+    filemanager.PROJECT_ROOT = project_root
+    errormanager.forget_error_log() # whether forked or spawned, errors go through this process's own writer thread
+    if setup != None:
+        setup()
+
+    store = hibernation.SessionStore(max_resident, idle_timeout)
+    while True:
+        # idle games hibernate between requests, and every so often while no requests come
+        store.hibernate_idle()
+        if connection.poll(IDLE_CHECK_INTERVAL) == False:
+            continue
+
+        try:
+            request, payload = connection.recv()
+        except EOFError:
+            break
+
+        if request == SEND:
+            reply = [ store.send(session_id, line) for session_id, line in payload ]
+        elif request == START:
+            reply = store.start(payload)
+        elif request == IMPORT:
+            session_id, session_data = payload
+            reply = store.start(session_id, session_data)
+        elif request == EXPORT:
+            reply = store.export(payload)
+        elif request == CLOSE:
+            store.close(payload)
+            reply = None
+        else:
+            reply = PING
+
+        connection.send(reply)
+
+    store.close_all()
+
+# Worker
+# a worker process and the router's end of its pipe
+class Worker():
+    def __init__(self, context, project_root, setup, max_resident, idle_timeout):
+        self.connection, worker_connection = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(worker_connection, project_root, setup, max_resident, idle_timeout))
+        self.process.daemon = True
+        self.process.start()
+        worker_connection.close()
+
+    def request(self, request, payload=None):
+        self.connection.send((request, payload))
+        return self.connection.recv()
+
+    def stop(self):
+        self.connection.close()
+        self.process.join(HEALTH_TIMEOUT)
+        if self.process.is_alive() == True:
+            self.process.terminate()
+            self.process.join()
+
+class SessionRouter():
+    # setup is called in each worker process as it starts, and must be a module level function
+    # max_resident and idle_timeout are per worker, see hibernation
+    def __init__(self, worker_count=None, setup=None, start_method=None,
+            max_resident=hibernation.MAX_RESIDENT, idle_timeout=hibernation.IDLE_TIMEOUT):
+        if worker_count == None:
+            worker_count = multiprocessing.cpu_count()
+        self.__context = multiprocessing.get_context(start_method)
+        self.__setup = setup
+        self.__max_resident = max_resident
+        self.__idle_timeout = idle_timeout
+        self.__workers = [ self.__start_worker() for index in range(worker_count) ]
+
+        # session id -> index of the worker playing it
+        self.__placements = {}
+
+    def __len__(self):
+        return len(self.__placements)
+
+    def __start_worker(self):
+        return Worker(self.__context, filemanager.PROJECT_ROOT, self.__setup, self.__max_resident, self.__idle_timeout)
+
+    # Route
+    # returns the index of the worker a session id belongs on
+    def route(self, session_id):
+        return zlib.crc32(session_id.encode("utf-8")) % len(self.__workers)
+
+    # Worker Of
+    # returns the index of the worker playing a session, or None if it isn't being played
+    def worker_of(self, session_id):
+        return self.__placements.get(session_id)
+
+    # Start
+    # starts a game for a session on its worker, returning the text it showed
+    def start(self, session_id):
+        index = self.route(session_id)
+        text = self.__workers[index].request(START, session_id)
+        self.__placements[session_id] = index
+        return text
+
+    # Send
+    # plays one line of a session, returning the text it showed
+    # returns None if the session isn't being played, or has just ended
+    def send(self, session_id, line):
+        return self.send_many([ (session_id, line) ])[0]
+
+    # Send Many
+    # plays one line each of many sessions, returning the text each showed in the same order
+    # the lines for each worker are sent together, so every worker plays its share at once
+    # sessions on a worker which has died show None, and are reported lost by the next check_workers
+    def send_many(self, session_lines):
+        batches = {}
+        for position, (session_id, line) in enumerate(session_lines):
+            index = self.__placements.get(session_id)
+            if index == None:
+                continue
+            batches.setdefault(index, []).append((position, session_id, line))
+
+        sent = []
+        for index, batch in batches.items():
+            try:
+                self.__workers[index].connection.send((SEND, [ (session_id, line) for position, session_id, line in batch ]))
+            except (EOFError, OSError):
+                continue
+            sent.append((index, batch))
+
+        # every worker sent a batch has its reply read, so none is left in its pipe for a later request
+        shown = [ None ] * len(session_lines)
+        for index, batch in sent:
+            try:
+                replies = self.__workers[index].connection.recv()
+            except (EOFError, OSError):
+                continue
+            for (position, session_id, line), text in zip(batch, replies):
+                shown[position] = text
+                if text == None:
+                    self.__placements.pop(session_id, None)
+        return shown
+
+    # Close
+    # ends a session's game
+    def close(self, session_id):
+        index = self.__placements.pop(session_id, None)
+        if index != None:
+            self.__workers[index].request(CLOSE, session_id)
+
+    # Migrate
+    # moves a session to another worker, carrying its world and mode over as session data
+    # returns False if the session isn't being played, or is partway through a question
+    def migrate(self, session_id, worker_index):
+        index = self.__placements.get(session_id)
+        if index == None:
+            return False
+        if index == worker_index:
+            return True
+
+        session_data = self.__workers[index].request(EXPORT, session_id)
+        if session_data == None:
+            return False
+
+        # the player has already seen where they are, so the page shown on import is not passed on
+        self.__workers[worker_index].request(IMPORT, (session_id, session_data))
+        self.__placements[session_id] = worker_index
+        return True
+
+    # Check Workers
+    # pings every worker, restarting any which have died or don't answer in time
+    # returns the ids of sessions lost with restarted workers
+    def check_workers(self, timeout=HEALTH_TIMEOUT):
+        lost = []
+        for index, worker in enumerate(self.__workers):
+            if worker.process.is_alive() == True:
+                try:
+                    worker.connection.send((PING, None))
+                    if worker.connection.poll(timeout) == True and worker.connection.recv() == PING:
+                        continue
+                except (EOFError, OSError):
+                    pass
+
+            worker.stop()
+            self.__workers[index] = self.__start_worker()
+            for session_id, placed_index in list(self.__placements.items()):
+                if placed_index == index:
+                    del self.__placements[session_id]
+                    lost.append(session_id)
+        return lost
+
+    # Shutdown
+    # ends every game and stops the workers
+    def shutdown(self):
+        for worker in self.__workers:
+            worker.stop()
+        self.__workers = []
+        self.__placements = {}
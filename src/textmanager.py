@@ -2,7 +2,11 @@
 # 06-10-2024
 # Brian Morris
 
-import sys
+import threading
+from collections import OrderedDict
+
+import namemanager
+import outputchannel
 
 ALPHABET = {
     'A' : 'a', 'B' : 'b', 'C' : 'c', 'D' : 'd', 'E' : 'e',
@@ -17,28 +21,80 @@ END_MARKER = "-------------------"
 
 DEFAULT_LINE_WIDTH = 9
 
-MAX_NAME_LENGTH = 15
+# rendered lists and dicts remembered by the layout
+LAYOUT_CACHE_SIZE = 64
+
+MAX_NAME_LENGTH = namemanager.MAX_NAME_LENGTH
 
 # Text Manager
 # Performs operations on strings
 # Handles console i/o
 
+# (type, contents, line_width, char_width, strip_tags) -> rendered text
+_layout_cache = OrderedDict()
+_layout_lock = threading.Lock() # games on other threads share the cache
+
+# Read Line Request
+# interactive flows are written as step generators, which yield READ_LINE whenever they wait on the user
+# and are sent back the line the user typed, so whatever drives them decides how to wait:
+# run_steps blocks this thread on the input handler, while a server can resume many games from one thread
+class ReadLineRequest():
+    __slots__ = ()
+
+READ_LINE = ReadLineRequest()
+
+# Blocking Call Request
+# step generators yield one of these for work which waits on the disk, and are sent back what it returns
+# run_steps makes the call on this thread, while a server makes it on a worker thread so other games play on
+class BlockingCall():
+    __slots__ = ("funct", "args")
+
+    def __init__(self, funct, args):
+        self.funct = funct
+        self.args = args
+
+# Call Steps
+# step generator which has whatever drives it call funct(*args), returning what the call returns
+def call_steps(funct, *args):
+    return (yield BlockingCall(funct, args))
+
+# Answer Call
+# makes a blocking call on this thread, sending its steps what it returned, or raising in them what it raised
+# returns the steps' next request
+def answer_call(steps, request):
+    try:
+        value = request.funct(*request.args)
+    except Exception as error:
+        return steps.throw(error)
+    return steps.send(value)
+
+# Run Steps
+# plays a step generator to the end on this thread, reading each line it waits on from the input handler
+# returns what the steps return
+def run_steps(steps, input_handler=None):
+    try:
+        request = next(steps)
+        while True:
+            if type(request) == BlockingCall:
+                request = answer_call(steps, request)
+            else:
+                request = steps.send(read_line(input_handler))
+    except StopIteration as stop:
+        return stop.value
+
 # Ask Yes or No
 # designed to prompt user with a yes or no question
 # and only accept 'yes' or 'no' answers
 # returning None if 'yes', 'no' if 'no', and 'quit' if 'quit' or 'back' or 'stop' are used
 def ask_yes_or_no(question, input_handler=None):
+    return run_steps(ask_yes_or_no_steps(question), input_handler)
+
+def ask_yes_or_no_steps(question):
     display_text(question)
     display_text("(Type \"quit\", \"back\", or \"stop\" to stop)")
 
     while(True):
-        user_input = None
-        if input_handler == None:
-            user_input = input(f"{PLAYER_TAG}")
-        else:
-            user_input = input_handler.get_input()
-
-        user_input = to_lower(user_input)
+        user_input = to_lower((yield READ_LINE))
 
         if user_input == "yes" or user_input == "y":
             return None
@@ -52,123 +108,157 @@ def ask_yes_or_no(question, input_handler=None):
 # Display Text
 # used to communicate information to the user in a common format
 # animated with a delay
-def display_text(text, strip_tags=False, line_width=DEFAULT_LINE_WIDTH):
-    text_lines = None
-    if isinstance(text, list):
-        text_lines = []
-        new_length = len(text)
-        current_index = 0
-
-        # just simply use anything less than line width
-        if new_length < line_width:
-            new_line = ""
-            for i in range(new_length):
-                new_line += f"{text[i]}, "
-            text_lines.append(new_line[:-2])
+# text is buffered on the output channel, and shown when the game next waits on the user
+def display_text(text, strip_tags=False, line_width=DEFAULT_LINE_WIDTH, char_width=None):
+    outputchannel.write_output(render_text(text, strip_tags, line_width, char_width))
+
+# Set Window Width
+# tells the layout how many characters fit on a line of the window showing the current output channel
+# lists are wrapped by character width while this is set, and by item count when it is None
+def set_window_width(char_width):
+    outputchannel.get_output().char_width = char_width
+
+# Render Text
+# lays out text as display_text would print it, wrapped to the current output channel's width
+# lists and dicts are remembered by their contents, so a listing that has not changed renders once
+def render_text(text, strip_tags=False, line_width=DEFAULT_LINE_WIDTH, char_width=None):
+    if char_width == None:
+        char_width = outputchannel.get_output().char_width
+
+    if isinstance(text, (list, dict)) == False:
+        return _render_lines(layout_lines(text, line_width, char_width, strip_tags), strip_tags)
+
+    try:
+        if isinstance(text, list) == True:
+            key = (list, tuple(text), line_width, char_width, strip_tags)
         else:
-            # take out all line_width lines
-            while new_length - line_width > line_width:
-                line = ""
-                for i in range(line_width):
-                    line += f"{text[current_index + i]}, "
-                text_lines.append(line)
-                current_index += line_width
-                new_length -= line_width
-            
-            # cut the rest in half
-            if new_length % line_width != 0:
-                new_length = new_length // 2
-                if new_length % 2 != 0:
-                    new_length += 1
-                # take that amount out
-                line = ""
-                for i in range(new_length + 1):
-                    line += f"{text[current_index + i]}, "
-                text_lines.append(line)
-                current_index += new_length + 1
-            
-            # add the rest
-            line = ""
-            for i in range(len(text) - current_index):
-                line += f"{text[current_index + i]}, "
-            text_lines.append(line[:-2])
+            key = (dict, tuple(text.items()), line_width, char_width, strip_tags)
+        with _layout_lock:
+            rendered = _layout_cache.get(key)
+            if rendered != None:
+                _layout_cache.move_to_end(key)
+                return rendered
+    except TypeError:
+        # contents which can't be hashed are laid out every time
+        return _render_lines(layout_lines(text, line_width, char_width, strip_tags), strip_tags)
+
+    rendered = _render_lines(layout_lines(text, line_width, char_width, strip_tags), strip_tags)
+    with _layout_lock:
+        _layout_cache[key] = rendered
+        if len(_layout_cache) > LAYOUT_CACHE_SIZE:
+            _layout_cache.popitem(last=False)
+    return rendered
+
+# Layout Lines
+# breaks text up into the lines display_text prints
+# lists are wrapped by line_width items, or by char_width characters if it is given
+def layout_lines(text, line_width=DEFAULT_LINE_WIDTH, char_width=None, strip_tags=False):
+    if isinstance(text, list):
+        items = [ f"{item}" for item in text ]
+        if char_width != None:
+            if strip_tags == False:
+                char_width -= len(TERMINAL_TAG)
+            return _wrap_by_width(items, char_width)
+        return _wrap_by_count(items, line_width)
     elif isinstance(text, dict):
         # break up display by key : value
-        text_lines = []
-        for key, line in text.items():
-            text_lines.append(f"{key}: {line}")
+        return [ f"{key}: {line}" for key, line in text.items() ]
     elif isinstance(text, str):
         # break up display by newline characters
-        text_lines = text.split('\n')
+        return text.split('\n')
     else:
         # text is not string, list, or dict
-        text_lines = [text]
+        return [text]
 
-    result = ""
-    if strip_tags == False:
-        for line in text_lines:
-            result += f"{TERMINAL_TAG}{line}\n"
-    else:
-        for line in text_lines:
-            result += f"{line}\n"
+# lists shorter than line_width fit on one line
+# otherwise full lines of line_width items are taken while more than two lines are left,
+# then a remainder that does not fill a line is cut in about half
+def _wrap_by_count(items, line_width):
+    item_count = len(items)
+    if item_count < line_width:
+        return [ ", ".join(items) ]
+
+    text_lines = []
+    current_index = 0
+    # take out all line_width lines
+    while item_count - line_width > line_width:
+        text_lines.append(", ".join(items[current_index:current_index + line_width]) + ", ")
+        current_index += line_width
+        item_count -= line_width
 
-    print(result, file=sys.stdout, flush=True, end="")
+    # cut the rest in half
+    if item_count % line_width != 0:
+        half_count = item_count // 2
+        if half_count % 2 != 0:
+            half_count += 1
+        # take that amount out
+        text_lines.append(", ".join(items[current_index:current_index + half_count + 1]) + ", ")
+        current_index += half_count + 1
+
+    # add the rest
+    text_lines.append(", ".join(items[current_index:]))
+    return text_lines
+
+# items are added to a line until the next one would run past char_width
+# an item too long for any line gets a line to itself
+def _wrap_by_width(items, char_width):
+    text_lines = []
+    line_start = 0
+    line_length = -2 # no separator before the first item
+    for index, item in enumerate(items):
+        item_length = len(item) + 2
+        # every line but the last keeps a trailing comma
+        if line_length + item_length + 1 > char_width and index != line_start:
+            text_lines.append(", ".join(items[line_start:index]) + ",")
+            line_start = index
+            line_length = -2
+        line_length += item_length
+
+    text_lines.append(", ".join(items[line_start:]))
+    return text_lines
+
+def _render_lines(text_lines, strip_tags):
+    if strip_tags == False:
+        return "".join([ f"{TERMINAL_TAG}{line}\n" for line in text_lines ])
+    return "".join([ f"{line}\n" for line in text_lines ])
 
 # Get Input
 # ensures user input is of valid type: words with characters a-z seperated by spaces
 # returns None, None if invalid values are used, or verb, noun if they are valid
 def get_input(input_handler=None, validate_chars=True):
+    return run_steps(get_input_steps(validate_chars), input_handler)
+
+def get_input_steps(validate_chars=True):
     # get arg_string from user
+    arg_string = yield READ_LINE
+
+    return parse_input(arg_string, validate_chars)
+
+# Read Line
+# shows all buffered text, then waits for a line from the user
+def read_line(input_handler=None):
+    outputchannel.flush_output()
     if input_handler==None:
-        arg_string = input(f"{PLAYER_TAG}")
-    else:
-        arg_string = input_handler.get_input()
+        return input(f"{PLAYER_TAG}")
+    return input_handler.get_input()
 
-    result = ""
-    # skip multiple spaces in a row
-    space_found = False
+# Parse Input
+# turns a line of input into words in one pass over the name manager's precomputed tables
+# validated lines may only use a-z, A-Z and spaces, and are lowered, other lines are split as they are
+# returns None, None if invalid values are used, or verb, nouns if they are valid
+def parse_input(arg_string, validate_chars=True):
+    if validate_chars == True:
+        clean_string = namemanager.lower_letters(arg_string)
+        if clean_string == None:
+            return None, None # invalid character found
+
+        # only spaces are left between words, so any run of them splits
+        words = clean_string.split()
+    else:
+        # skip multiple spaces in a row, and spaces at either end
+        words = [ word for word in arg_string.split(' ') if word != "" ]
 
-    for character in arg_string:
-        # skip all multiple spaces in a row
-        if space_found == True:
-            if character == ' ':
-                continue
-            else:
-                space_found = False
-        
-        if validate_chars == False:
-            result += character
-            if character == ' ':
-                space_found = True
-            continue
-
-        if character >= 'a' and character <= 'z':
-            # a-z are valid input
-            result += character
-        elif character >= 'A' and character <= 'Z':
-            # A-Z need to become a-z
-            result += to_lower(character)
-        elif character == ' ':
-            # first of potentially many spaces
-            result += ' '
-            space_found = True
-        else:
-            # invalid character returned
-            return None, None
-    
-    # strip ends of spaces
-    if len(result) != 0:
-        result = result.lstrip(' ')
-    if len(result) != 0:
-        result = result.rstrip(' ')
-        
     # test for missing result
-    if len(result) == 0:
-        return None, None
-        
-    # whatever is left is a clean user input string
-    # split based on spaces
-    words = result.split(' ')
     if len(words) == 0:
         return None, None
     
@@ -184,62 +274,10 @@ def get_input(input_handler=None, validate_chars=True):
 # safely limits name length and invalid character use
 # returns None if name contains invalid characters
 def clean_name(name_string):
-    result = ""
-    if name_string == None or len(name_string) == 0:
-        return None
-    
-    name_string = name_string.rstrip(' ')
-    name_string = name_string.lstrip(' ')
-
-    if name_string == None or len(name_string) == 0:
-        return None
-
-    # skip multiple spaces in a row
-    space_found = False
-
-    for character in name_string:
-        # skip all multiple spaces in a row
-        if space_found == True:
-            if character == ' ':
-                continue
-            else:
-                space_found = False
-            
-        if character >= 'a' and character <= 'z':
-            result += character
-        elif character >= 'A' and character <= 'Z':
-            result += to_lower(character)
-        elif character == ' ':
-            if result == "":
-                continue # skip all spaces at beginning
-
-            # first of potentially many spaces: files use ' '
-            result += ' '
-            space_found = True
-        else:
-            # invalid character returned
-            return None
-    
-        if len(result) >= MAX_NAME_LENGTH:
-            break
-    
-    return result
+    return namemanager.clean_name(name_string)
 
 # To Lower
 # Safely reduces A-Z to lower case
 # returns unmodified if not A-Z
 def to_lower(arg_string):
-    # perform recursive operation on objects of size > 1
-    if len(arg_string) != 1:
-        new_lower_input = ""
-        for character in arg_string:
-            new_lower_input += to_lower(character)
-        return new_lower_input
-        
-    # perform whichever operation is needed
-    for capital, lower_case in ALPHABET.items():
-        if arg_string == capital:
-            return lower_case
-    
-    # return unmodified value if no valid result was found
-    return arg_string
\ No newline at end of file
+    return namemanager.to_lower(arg_string)
@@ -0,0 +1,372 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+# Tracked State
+# a data struct which can remember which member variables changed since it was last marked clean
+# while it is tracking, lists and dicts assigned to it are tracked too, down to which of their entries changed
+# reading is untouched: only writes pay for tracking, and only while it is on
+#
+# a struct starts out not tracking, and its writes cost what they would on any other object
+# start_tracking moves it onto a subclass of its own class which records every write, and stop_tracking moves it back
+#
+# tracking lives in slots, so vars() still holds only the member variables
+# and the struct reads and writes through filemanager like any other classed object
+class TrackedState():
+    __slots__ = ( "_changed_fields", "_changed_entries" )
+
+    # marker for a container which changed as a whole, rather than by entry
+    WHOLE = None
+
+    # copies and pickles carry the member variables, and start clean
+    def __getstate__(self):
+        return dict(vars(self))
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.mark_clean()
+
+    # Is Tracking
+    # returns True if writes are being recorded
+    def is_tracking(self):
+        return False
+
+    # Start Tracking
+    # records every write from here on, wrapping the lists and dicts held so their changes are recorded too
+    # writes made while not tracking are never recorded, so tracking should start before the struct is played with
+    def start_tracking(self):
+        if self.is_tracking() == True:
+            return
+
+        members = self.__dict__
+        for key, value in members.items():
+            if isinstance(value, (list, dict)):
+                members[key] = _track(value, self, key, TrackedState.WHOLE)
+        object.__setattr__(self, "__class__", _tracked_class(type(self)))
+
+        # a struct never marked clean was never written, so all of it counts as changed
+        if hasattr(self, "_changed_fields") == False:
+            self.mark_all()
+
+    # Stop Tracking
+    # stops recording writes, unwrapping the lists and dicts held
+    # changes already recorded are kept
+    def stop_tracking(self):
+        if self.is_tracking() == False:
+            return
+
+        members = self.__dict__
+        for key, value in members.items():
+            if isinstance(value, (list, dict)):
+                members[key] = _untrack(value)
+        object.__setattr__(self, "__class__", type(self)._untracked_class)
+
+    # record a change to a member variable, or to one entry of it
+    def _mark(self, key, entry):
+        try:
+            changed_fields = self._changed_fields
+        except AttributeError:
+            # built without __init__ running first
+            self.mark_clean()
+            changed_fields = self._changed_fields
+
+        changed_fields.add(key)
+        if entry is TrackedState.WHOLE:
+            self._changed_entries[key] = TrackedState.WHOLE
+            return
+
+        entries = self._changed_entries.get(key, set())
+        if entries is not TrackedState.WHOLE:
+            entries.add(entry)
+            self._changed_entries[key] = entries
+
+    # Mark Clean
+    # forget every change, starting a new marker
+    def mark_clean(self):
+        object.__setattr__(self, "_changed_fields", set())
+        object.__setattr__(self, "_changed_entries", {})
+
+    # Mark Changed
+    # treat some member variables as changed, such as ones changed before a struct was written out and read back
+    def mark_changed(self, keys):
+        for key in keys:
+            self._mark(key, TrackedState.WHOLE)
+
+    # Mark All
+    # treat every member variable as changed
+    def mark_all(self):
+        self.mark_clean()
+        for key in vars(self).keys():
+            self._mark(key, TrackedState.WHOLE)
+
+    # Changed Fields
+    # returns the names of every member variable changed since the marker
+    def changed_fields(self):
+        return set(getattr(self, "_changed_fields", ()))
+
+    # Changed Entries
+    # returns a dict of member variable name : changed entries of it since the marker
+    # entries are list indexes or dict keys, or WHOLE if the variable changed as a whole
+    def changed_entries(self):
+        result = {}
+        for key, entries in getattr(self, "_changed_entries", {}).items():
+            if entries is TrackedState.WHOLE:
+                result[key] = TrackedState.WHOLE
+            else:
+                result[key] = set(entries)
+        return result
+
+    # Get Changes
+    # returns a dict of member variable name : value for every member variable changed since the marker
+    # variables which were deleted are left out
+    def get_changes(self):
+        result = {}
+        members = vars(self)
+        for key in getattr(self, "_changed_fields", ()):
+            if key in members:
+                result[key] = members[key]
+        return result
+
+# Tracking
+# what a tracked state does while it is tracking: every write records the member variable it changed
+# a tracking struct's class is made from its own class with this mixed in, by _tracked_class
+class _Tracking(TrackedState):
+    __slots__ = ()
+
+    def __setattr__(self, key, value):
+        if type(value) not in _PLAIN_TYPES and isinstance(value, (list, dict)):
+            value = _track(value, self, key, TrackedState.WHOLE)
+        object.__setattr__(self, key, value)
+        try:
+            self._changed_fields.add(key)
+            self._changed_entries[key] = TrackedState.WHOLE
+        except AttributeError:
+            self._mark(key, TrackedState.WHOLE)
+
+    def __delattr__(self, key):
+        object.__delattr__(self, key)
+        self._mark(key, TrackedState.WHOLE)
+
+    def __setstate__(self, state):
+        for key, value in state.items():
+            if type(value) not in _PLAIN_TYPES and isinstance(value, (list, dict)):
+                value = _track(value, self, key, TrackedState.WHOLE)
+            object.__setattr__(self, key, value)
+        self.mark_clean()
+
+    # copies and pickles are of the struct's own class, not tracking
+    def __reduce_ex__(self, protocol):
+        return (_rebuild, (self._untracked_class, self.__getstate__()))
+
+    def is_tracking(self):
+        return True
+
+# tracked state class -> its tracking class
+_tracked_classes = {}
+
+# returns the class a struct of class_type takes on while it is tracking, making it the first time
+# it adds no slots, so a struct can be moved onto it and back by setting its __class__
+def _tracked_class(class_type):
+    tracked_class = _tracked_classes.get(class_type)
+    if tracked_class == None:
+        # class_type comes first so the tracking class shares its layout, and _Tracking still comes before TrackedState
+        tracked_class = type(class_type.__name__, (class_type, _Tracking), {
+            "__slots__" : (),
+            "__module__" : class_type.__module__,
+            "__qualname__" : class_type.__qualname__,
+            "_untracked_class" : class_type })
+        _tracked_classes[class_type] = tracked_class
+    return tracked_class
+
+# Tracked List
+# a list which reports changes to the tracked state holding it
+class TrackedList(list):
+    __slots__ = ( "_owner", "_field", "_entry" )
+
+    def __init__(self, items, owner, field, entry):
+        list.__init__(self, items)
+        self._owner = owner
+        self._field = field
+        self._entry = entry
+
+    # report a change, by index if this list is the member variable itself
+    def _changed(self, index=TrackedState.WHOLE):
+        if self._entry is not TrackedState.WHOLE:
+            index = self._entry # nested lists report the entry of the member variable they sit in
+        self._owner._mark(self._field, index)
+
+    def _wrap(self, value, index):
+        if type(value) is list or type(value) is dict:
+            if self._entry is not TrackedState.WHOLE:
+                index = self._entry
+            return _track(value, self._owner, self._field, index)
+        return value
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            list.__setitem__(self, index, [ self._wrap(item, TrackedState.WHOLE) for item in value ])
+            self._changed()
+            return
+        list.__setitem__(self, index, self._wrap(value, index))
+        self._changed(index if index >= 0 else len(self) + index)
+
+    def __delitem__(self, index):
+        list.__delitem__(self, index)
+        self._changed()
+
+    def __iadd__(self, items):
+        self.extend(items)
+        return self
+
+    def __imul__(self, count):
+        list.__imul__(self, count)
+        self._changed()
+        return self
+
+    def append(self, value):
+        list.append(self, self._wrap(value, len(self)))
+        self._changed(len(self) - 1)
+
+    def extend(self, items):
+        list.extend(self, [ self._wrap(item, TrackedState.WHOLE) for item in items ])
+        self._changed()
+
+    def insert(self, index, value):
+        list.insert(self, index, self._wrap(value, TrackedState.WHOLE))
+        self._changed()
+
+    def pop(self, index=-1):
+        value = list.pop(self, index)
+        self._changed()
+        return value
+
+    def remove(self, value):
+        list.remove(self, value)
+        self._changed()
+
+    def clear(self):
+        list.clear(self)
+        self._changed()
+
+    def sort(self, *args, **kwargs):
+        list.sort(self, *args, **kwargs)
+        self._changed()
+
+    def reverse(self):
+        list.reverse(self)
+        self._changed()
+
+    # copies and pickles are plain lists
+    def __reduce_ex__(self, protocol):
+        return (list, (list(self),))
+
+# Tracked Dict
+# a dict which reports changes to the tracked state holding it
+class TrackedDict(dict):
+    __slots__ = ( "_owner", "_field", "_entry" )
+
+    def __init__(self, items, owner, field, entry):
+        dict.__init__(self, items)
+        self._owner = owner
+        self._field = field
+        self._entry = entry
+
+    # report a change, by key if this dict is the member variable itself
+    def _changed(self, key=TrackedState.WHOLE):
+        if self._entry is not TrackedState.WHOLE:
+            key = self._entry # nested dicts report the entry of the member variable they sit in
+        self._owner._mark(self._field, key)
+
+    def _wrap(self, value, key):
+        if type(value) is list or type(value) is dict:
+            if self._entry is not TrackedState.WHOLE:
+                key = self._entry
+            return _track(value, self._owner, self._field, key)
+        return value
+
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, key, self._wrap(value, key))
+        self._changed(key)
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self._changed(key)
+
+    def __ior__(self, items):
+        self.update(items)
+        return self
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return dict.__getitem__(self, key)
+
+    def pop(self, key, *default):
+        is_present = key in self
+        value = dict.pop(self, key, *default)
+        if is_present == True:
+            self._changed(key)
+        return value
+
+    def popitem(self):
+        key, value = dict.popitem(self)
+        self._changed(key)
+        return key, value
+
+    def clear(self):
+        dict.clear(self)
+        self._changed()
+
+    # copies and pickles are plain dicts
+    def __reduce_ex__(self, protocol):
+        return (dict, (dict(self),))
+
+# item types which never need tracking
+_PLAIN_TYPES = { str, int, float, bool, type(None), tuple }
+
+# wraps a list or dict, and every list or dict inside of it, so they report to owner
+# entry is the entry of the member variable the value sits in, or WHOLE for the member variable itself
+def _track(value, owner, field, entry):
+    if isinstance(value, list):
+        result = TrackedList((), owner, field, entry)
+        if _PLAIN_TYPES.issuperset(map(type, value)):
+            list.extend(result, value)
+        else:
+            list.extend(result, [ _track_item(item, owner, field, entry, index) for index, item in enumerate(value) ])
+        return result
+
+    result = TrackedDict((), owner, field, entry)
+    if _PLAIN_TYPES.issuperset(map(type, value.values())):
+        dict.update(result, value)
+    else:
+        for key, item in value.items():
+            dict.__setitem__(result, key, _track_item(item, owner, field, entry, key))
+    return result
+
+def _track_item(item, owner, field, entry, key):
+    if isinstance(item, (list, dict)):
+        if entry is TrackedState.WHOLE:
+            entry = key
+        return _track(item, owner, field, entry)
+    return item
+
+# builds a struct which isn't tracking from its member variables, for copies and pickles of tracking structs
+def _rebuild(class_type, state):
+    result = class_type.__new__(class_type)
+    result.__setstate__(state)
+    return result
+
+# returns a plain copy of a tracked list or dict, and of every list or dict inside of it
+def _untrack(value):
+    if isinstance(value, list):
+        if _PLAIN_TYPES.issuperset(map(type, value)):
+            return list(value)
+        return [ _untrack(item) if isinstance(item, (list, dict)) else item for item in value ]
+
+    if _PLAIN_TYPES.issuperset(map(type, value.values())):
+        return dict(value)
+    return { key : _untrack(item) if isinstance(item, (list, dict)) else item for key, item in value.items() }
@@ -0,0 +1,168 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+# Vocabulary
+# a trie over the words a mode understands
+# resolves unique prefixes to whole words, and suggests close words for typos
+
+# suggestions are at most this many edits away from what was typed
+MAX_EDIT_DISTANCE = 1
+
+MAX_SUGGESTIONS = 3
+
+# Node
+# one letter of the trie
+# word is set on the node that ends a word, and count is the number of words at or below the node
+class _Node():
+    __slots__ = ("children", "word", "count")
+
+    def __init__(self):
+        self.children = {}
+        self.word = None
+        self.count = 0
+
+class Vocabulary():
+    def __init__(self, words=None):
+        self.__root = _Node()
+        if words != None:
+            for word in words:
+                self.add(word)
+
+    def __len__(self):
+        return self.__root.count
+
+    def __contains__(self, word):
+        node = self.__find(word)
+        return node != None and node.word != None
+
+    # Add
+    # adds a word, doing nothing if it is already known
+    def add(self, word):
+        if word in self:
+            return
+
+        node = self.__root
+        node.count += 1
+        for letter in word:
+            child = node.children.get(letter)
+            if child == None:
+                child = _Node()
+                node.children[letter] = child
+            node = child
+            node.count += 1
+        node.word = word
+
+    # Remove
+    # removes a word, pruning letters no other word uses
+    def remove(self, word):
+        if word not in self:
+            return
+
+        node = self.__root
+        node.count -= 1
+        for letter in word:
+            child = node.children[letter]
+            child.count -= 1
+            if child.count == 0:
+                del node.children[letter]
+                return
+            node = child
+        node.word = None
+
+    def clear(self):
+        self.__root = _Node()
+
+    # Resolve
+    # returns the word typed, or the only word it is the start of
+    # returns None if no word, or more than one word, starts with it
+    def resolve(self, prefix):
+        node = self.__find(prefix)
+        if node == None:
+            return None
+        if node.word != None:
+            return node.word
+        if node.count != 1:
+            return None
+
+        # a single word lies below, so there is a single path to it
+        while node.word == None:
+            for child in node.children.values():
+                node = child
+        return node.word
+
+    # Complete
+    # returns up to max_suggestions words starting with prefix, in alphabetical order
+    def complete(self, prefix, max_suggestions=MAX_SUGGESTIONS):
+        node = self.__find(prefix)
+        if node == None:
+            return []
+
+        words = []
+        stack = [node]
+        while len(stack) != 0 and len(words) < max_suggestions:
+            node = stack.pop()
+            if node.word != None:
+                words.append(node.word)
+            # pushed in reverse so the lowest letter is taken first
+            for letter in sorted(node.children.keys(), reverse=True):
+                stack.append(node.children[letter])
+        return words
+
+    # Suggest
+    # returns up to max_suggestions known words at most max_distance edits from the word typed, closest first
+    # an edit is one letter wrong, missing, extra, or swapped with the next
+    # walks only the branches of the trie the word can reach with the edits it has left
+    def suggest(self, word, max_distance=MAX_EDIT_DISTANCE, max_suggestions=MAX_SUGGESTIONS):
+        found = {}
+        stack = [ (self.__root, 0, max_distance) ]
+        while len(stack) != 0:
+            node, index, edits = stack.pop()
+
+            # with no edits left, the rest of the word must be spelled out exactly
+            if edits == 0:
+                node = self.__find(word[index:], node)
+                if node != None and node.word != None and node.word != word:
+                    found.setdefault(node.word, max_distance)
+                continue
+
+            if index == len(word):
+                if node.word != None and node.word != word:
+                    distance = max_distance - edits
+                    if found.get(node.word, max_distance) >= distance:
+                        found[node.word] = distance
+                letter = None
+            else:
+                letter = word[index]
+                # letter is right
+                child = node.children.get(letter)
+                if child != None:
+                    stack.append((child, index + 1, edits))
+                # letter is extra
+                stack.append((node, index + 1, edits - 1))
+                # letter is swapped with the next
+                if index + 1 < len(word):
+                    child = node.children.get(word[index + 1])
+                    if child != None:
+                        child = child.children.get(letter)
+                        if child != None:
+                            stack.append((child, index + 2, edits - 1))
+
+            for child_letter, child in node.children.items():
+                # letter is missing
+                stack.append((child, index, edits - 1))
+                # letter is wrong
+                if letter != None and child_letter != letter:
+                    stack.append((child, index + 1, edits - 1))
+
+        suggestions = sorted([ (distance, found_word) for found_word, distance in found.items() ])
+        return [ found_word for distance, found_word in suggestions[:max_suggestions] ]
+
+    def __find(self, prefix, node=None):
+        if node == None:
+            node = self.__root
+        for letter in prefix:
+            node = node.children.get(letter)
+            if node == None:
+                return None
+        return node
@@ -2,19 +2,24 @@
 # 06-10-2024
 # Brian Morris
 
-from mode import Mode
+import schema
+import results
+import savewriter
+from mode import Mode, ModeTemplate
+from trackedstate import TrackedState
 
 # World Manager
 # handles interactions with an instance of world
 # delegates to party manager and encounter manager as needed
 class WorldManager():
-    # mode returns that translate to gamemanager actions
+    # world commands that translate to gamemanager actions
     GAME_COMMAND = "use command:"
     SAVE_SIGNATURE = "save world data"
     OPTION_SIGNATURE = "return to the options submenu" # recycle gamemanager options
 
     # WORLD class data struct stores all information about the world
-    class World():
+    # while journal saves are on it tracks which of its member variables change, so saves can write only those
+    class World(TrackedState):
         def __init__(self):
             # create the default world and fill it with the default objects
             self.cow_push_count = 0
@@ -28,10 +33,10 @@ class WorldManager():
             self.location = "A New Journey"
     
     def _save_funct(self, objects, targets=None):
-        return f"{self.GAME_COMMAND}{self.SAVE_SIGNATURE}"
+        return results.WorldCommand(self.SAVE_SIGNATURE)
 
     def _option_funct(self, objects, targets=None):
-        return f"{self.GAME_COMMAND}{self.OPTION_SIGNATURE}"
+        return results.WorldCommand(self.OPTION_SIGNATURE)
     
     def _do_stuff_funct(self, objects, targets=None):
         if targets:
@@ -63,8 +68,7 @@ class WorldManager():
                 return f"You can't open \"{targets[0]}\", but nice try..."
 
             self.world.containers = []
-            self.modes["only"].delete_object("box")
-            self.modes["only"].add_object("box", "An empty box", "What was inside is no longer there")
+            self._empty_box()
 
             return f"Inside of \"{targets[0]}\" there is..... {self.world.box_secret}"
         else:
@@ -72,12 +76,12 @@ class WorldManager():
     
     def _attack_funct(self, objects, targets=None):
         if targets:
+            if Mode.ALL_OBJECTS in targets:
+                return f"You fight the whole world and lose.\nEventually you get up and can try again."
+
             for target in targets:
                 if target not in objects.keys():
                     return f"There is no \"{target}\" here to attack..."
-            
-            if Mode.ALL_OBJECTS in targets:
-                return f"You fight the whole world and lose.\nEventually you get up and can try again."
 
             result = ""
             for target in targets:
@@ -89,9 +93,8 @@ class WorldManager():
                         result += f"\"{target}\" is already dead... Your cruelty knows no bounds.\n"
                     elif self.world.enemy_hp == 0:
                         result += f"\"{target}\" succumbs to your incredible violence. Congradulations, you win!\nYou can \"quit\" now, proud of your accomplishments.\n"
-                        self.modes["only"].delete_object("troll")
-                        self.modes["only"].add_object("corpse", "A dead troll.", "Proof of your victory over your enemy.")
                         self.world.enemies = ["corpse"]
+                        self._kill_troll()
                     else:
                         result += f"\"{target}\" cries out in pain...\n\"{self.world.enemy_reaction}\", they say.\n"
 
@@ -123,20 +126,30 @@ class WorldManager():
         else:
             return "You need to specify what you're trying to push..."
 
-    def _init_only_mode(self):
-        result = Mode("Welcome to the WORLD!! Look at all this awesome game that's definitely everywhere!")
-        result.add_command("save", self._save_funct, "Save the data you manipulated.")
-        result.add_command("options", self._option_funct, "Pause and mess with settings.")
-        result.add_command("use", self._do_stuff_funct, "Do fun game things with the stuff that's here. This is a game. I swear.")
-        result.add_command("open", self._open_funct, "Opens a container, if it is... a container...")
-        result.add_command("attack", self._attack_funct, "Hit a thing by flailing your fists!")
-        result.add_command("push", self._push_funct, "Does something... or DOES IT?!!!")
+    # changes to the world's objects, made as they happen and again when a world is loaded
+    # only these are held by each world's mode, the rest is shared through ONLY_MODE
+    def _empty_box(self):
+        self.modes["only"].delete_object("box")
+        self.modes["only"].add_object("box", "An empty box", "What was inside is no longer there")
+
+    def _kill_troll(self):
+        self.modes["only"].delete_object("troll")
+        self.modes["only"].add_object("corpse", "A dead troll.", "Proof of your victory over your enemy.")
+
+    # the world's mode is compiled once, and shared by every world manager
+    ONLY_MODE = ModeTemplate("Welcome to the WORLD!! Look at all this awesome game that's definitely everywhere!", [
+        ("save", _save_funct, "Save the data you manipulated."),
+        ("options", _option_funct, "Pause and mess with settings."),
+        ("use", _do_stuff_funct, "Do fun game things with the stuff that's here. This is a game. I swear."),
+        ("open", _open_funct, "Opens a container, if it is... a container..."),
+        ("attack", _attack_funct, "Hit a thing by flailing your fists!"),
+        ("push", _push_funct, "Does something... or DOES IT?!!!") ], [
+        ("cow", "It's a... cow!", "Rolls over if you push it enough."),
+        ("box", "An unassuming box.", "Contains a mystery! OR DOES IT?!!"),
+        ("troll", "Enemy spotted!", "Attack it, dummy!") ])
 
-        result.add_object("cow", "It's a... cow!", "Rolls over if you push it enough.")
-        result.add_object("box", "An unassuming box.", "Contains a mystery! OR DOES IT?!!")
-        result.add_object("troll", "Enemy spotted!", "Attack it, dummy!")
-
-        return result
+    def _init_only_mode(self):
+        return self.ONLY_MODE.new_mode(self)
 
     # initializes world state with default world variables
     def __init__(self):
@@ -144,6 +157,7 @@ class WorldManager():
         self.modes = {}
         self.user_name = None
         self.world = self.World()
+        self.tracking = False # only journal saves need to know what changed
         
         # initialize modes
         self.modes = {}
@@ -153,9 +167,32 @@ class WorldManager():
     def name(self, user_name):
         self.user_name = user_name
     
+    # Track Changes
+    # turns tracking of which world member variables change on or off, for this world and any loaded after it
+    # writes to a world cost more while it is tracked, so only journal saves turn it on
+    def track_changes(self, is_tracking):
+        self.tracking = is_tracking
+        if self.world == None:
+            return
+        if is_tracking == True:
+            self.world.start_tracking()
+        else:
+            self.world.stop_tracking()
+
     # load in world data
+    # the world's mode is brought up to date with the objects the world has changed
     def load(self, data):
         self.world = data
+        if self.world == None:
+            return
+        self.world.mark_clean()
+        if self.tracking == True:
+            self.world.start_tracking()
+
+        if "box" not in self.world.containers:
+            self._empty_box()
+        if "troll" not in self.world.enemies:
+            self._kill_troll()
 
     # load in a string representing the location of the player
     def get_location_title(self):
@@ -171,4 +208,19 @@ class WorldManager():
     
     # return all data relavant for save/load operations
     def get_world_data(self):
-        return self.world
\ No newline at end of file
+        return self.world
+    
+    # get copies of every member variable of the world that changed since the last save or load
+    # the world then starts tracking changes from here
+    def get_world_changes(self):
+        changes = {}
+        for key, value in self.world.get_changes().items():
+            changes[key] = savewriter.copy_value(value)
+        self.world.mark_clean()
+        return changes
+
+# worlds are read from saves
+schema.register(WorldManager.World)
+
+# commands may still return GAME_COMMAND followed by a signature
+results.register_prefix(WorldManager.GAME_COMMAND, results.WorldCommand)
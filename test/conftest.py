@@ -0,0 +1,37 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+import os
+import sys
+import shutil
+import tempfile
+
+import pytest
+
+# tests import the game from src, and the old functions it replaced from the benchmarks that time them
+TEST_FOLDER = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(TEST_FOLDER, os.pardir, "src"))
+sys.path.insert(0, os.path.join(TEST_FOLDER, os.pardir, "benchmarks"))
+
+import filemanager
+
+# Project Root
+# a fresh copy of the project for one test, so its saves and settings start over
+@pytest.fixture
+def project_root():
+    root = tempfile.mkdtemp()
+    source = os.path.join(TEST_FOLDER, os.pardir)
+    shutil.copytree(os.path.join(source, filemanager.SOURCE_PATH), os.path.join(root, filemanager.SOURCE_PATH))
+    shutil.copy(os.path.join(source, filemanager.MAIN_SHELL), root)
+    os.makedirs(os.path.join(root, filemanager.DATA_PATH, filemanager.SAVES_PATH))
+
+    previous_root = filemanager.PROJECT_ROOT
+    filemanager.PROJECT_ROOT = root
+    filemanager.rescan_files()
+    try:
+        yield root
+    finally:
+        filemanager.PROJECT_ROOT = previous_root
+        filemanager.rescan_files()
+        shutil.rmtree(root)
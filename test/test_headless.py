@@ -0,0 +1,57 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+import queue
+
+import filemanager
+import outputchannel
+import headless
+from gamemanager import GameManager
+
+# Headless Tests
+# a headless game shows the same text as a windowed one, less the lines typed to end each page
+
+# the window answers each page break with an enter, marked here by None
+SCRIPT = [ None, None, None, "new", "bob", "yes", None, "look", "look box", "lok bx", "push cow", "attack troll",
+    "options", None, "back", None, "help", "quit", "yes", None, "quit" ]
+
+# plays a game the way the window does, typing through every page break
+def windowed_text(lines):
+    output = outputchannel.CapturedOutput()
+    token = outputchannel.set_output(output)
+    try:
+        game = GameManager(headless.LineInput(lines, headless.HeadlessCommands()), queue.Queue(), True)
+        game.run()
+        game.close_files()
+    finally:
+        outputchannel.reset_output(token)
+    return output.take_text()
+
+def headless_text(lines):
+    output = outputchannel.CapturedOutput()
+    token = outputchannel.set_output(output)
+    try:
+        headless.run_lines(lines)
+    finally:
+        outputchannel.reset_output(token)
+    return output.take_text()
+
+def test_headless_matches_windowed(project_root):
+    windowed = windowed_text([ line if line != None else "" for line in SCRIPT ])
+    # the second game is also the first to open the project
+    filemanager.delete_file(filemanager.CURRENT_CONFIG)
+    played = headless_text([ line for line in SCRIPT if line != None ])
+    assert played == windowed
+
+# the python api shows each command's text as it is sent
+def test_headless_game(project_root):
+    game = headless.HeadlessGame()
+    game.start()
+    game.send("new")
+    game.send("bob")
+    assert "Starting adventure!!!" in game.send("yes")
+    assert "cow" in game.send("look")
+    assert "Goodbye!" in game.send("quit") + game.send("yes") + game.send("quit")
+    assert game.running == False
+    assert game.send("look") == None
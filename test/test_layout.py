@@ -0,0 +1,95 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+import random
+
+import textmanager
+import outputchannel
+from mode import Mode
+from bench_layout import legacy_render, legacy_look, random_word
+
+# Layout Tests
+# the layout engine against a copy of the old display_text on lists, dicts and strings,
+# and its cache against listings that change
+
+FUZZ_LISTS = 500
+
+def sample_texts():
+    generator = random.Random(14)
+    samples = [ "", "one line", "two\nlines", "\n", 7, None, {}, { "box" : "An unassuming box.", "troll" : None } ]
+    for sample in range(FUZZ_LISTS):
+        samples.append([ random_word(generator) for i in range(generator.randint(0, 120)) ])
+    for sample in range(50):
+        samples.append({ random_word(generator) : random_word(generator) for i in range(generator.randint(0, 20)) })
+    return samples
+
+def test_layout_matches_old_display_text():
+    for text in sample_texts():
+        for line_width in range(2, 14):
+            for strip_tags in [ False, True ]:
+                assert textmanager.render_text(text, strip_tags, line_width) == legacy_render(text, strip_tags, line_width), (text, line_width)
+
+# wrapping by width keeps every item, in order, and only overflows for an item too long for any line
+def test_layout_by_width_keeps_items():
+    for text in sample_texts():
+        if isinstance(text, list) == False:
+            continue
+        for char_width in [ 20, 40, 80 ]:
+            lines = textmanager.layout_lines(text, char_width=char_width, strip_tags=True)
+            assert ", ".join(lines).replace(",,", ",") == ", ".join(text)
+            for line in lines:
+                assert len(line) <= char_width or ", " not in line
+
+def test_look_renders_as_before():
+    generator = random.Random(15)
+    room = Mode("A crowded room.")
+    objects = { Mode.ALL_OBJECTS : None }
+    for i in range(200):
+        name = f"{random_word(generator)}{i}"
+        room.add_object(name, "Something in the way.")
+        objects[name] = "Something in the way."
+
+    assert textmanager.render_text(room.run_command(Mode.LOOK_COMMAND)) == legacy_render(legacy_look(objects))
+
+# a listing changed in place is laid out again, rather than shown as it was
+def test_changed_listing_is_laid_out_again():
+    listing = [ "cow", "box" ]
+    first = textmanager.render_text(listing)
+    listing.append("troll")
+    assert textmanager.render_text(listing) == legacy_render([ "cow", "box", "troll" ])
+    assert first == legacy_render([ "cow", "box" ])
+
+    details = { "box" : "A box." }
+    textmanager.render_text(details)
+    details["box"] = "An open box."
+    assert textmanager.render_text(details) == legacy_render({ "box" : "An open box." })
+
+# listings holding things that can't be hashed are laid out without the cache
+def test_unhashable_listing():
+    listing = [ [ "cow" ], { "box" : None } ]
+    assert textmanager.render_text(listing) == legacy_render(listing)
+
+# each output channel keeps the width of its own window
+def test_window_width_per_channel():
+    listing = [ random_word(random.Random(16)) * 3 for i in range(40) ]
+    narrow = outputchannel.CapturedOutput()
+    wide = outputchannel.CapturedOutput()
+
+    token = outputchannel.set_output(narrow)
+    try:
+        textmanager.set_window_width(30)
+        narrow_text = textmanager.render_text(listing)
+    finally:
+        outputchannel.reset_output(token)
+
+    token = outputchannel.set_output(wide)
+    try:
+        wide_text = textmanager.render_text(listing)
+    finally:
+        outputchannel.reset_output(token)
+
+    assert narrow.char_width == 30
+    assert wide.char_width == None
+    assert wide_text == legacy_render(listing)
+    assert narrow_text != wide_text
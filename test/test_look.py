@@ -0,0 +1,37 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+import random
+
+from mode import Mode
+from bench_look import Room, legacy_look, legacy_help
+
+# Look and Help Tests
+# the keyed look and help against copies of the old scanning ones, in rooms that change as they are looked at
+
+CHECKED_QUERIES = 1000
+
+def test_look_and_help_match_old_scans():
+    generator = random.Random(17)
+    for object_count in [ 0, 1, 5, 40 ]:
+        room = Room(object_count, generator)
+        for query in range(CHECKED_QUERIES):
+            # change the room now and then
+            if generator.random() < 0.1:
+                room.delete(f"thing{generator.randrange(object_count + 1)}")
+            if generator.random() < 0.1:
+                room.add(f"thing{generator.randrange(object_count + 5)}", "Changed.", generator.choice([ None, "A new hint." ]))
+
+            targets = room.random_targets(generator)
+            look = room.mode.run_command(Mode.LOOK_COMMAND, targets)
+            expected = legacy_look(room.objects, targets)
+            # an empty room used to list nothing when looked at without targets
+            if expected != [] or look != "There is nothing here...":
+                assert look == expected, targets
+
+            help_results = room.mode.run_command(Mode.HELP_COMMAND, targets)
+            expected = legacy_help(room.objects, room.commands, room.hints, targets)
+            assert help_results == expected, targets
+            if isinstance(expected, dict) == True:
+                assert list(help_results) == list(expected), targets
@@ -0,0 +1,69 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+import pytest
+
+import headless
+import results
+from mode import ModeTemplate
+from gamemanager import GameManager
+from worldmanager import WorldManager
+from bench_modes import built_mode
+
+# Mode Tests
+# modes made from shared templates answer as modes built command by command do, and keep their changes to themselves
+
+QUERIES = [ ("help", None), ("help", [ "all" ]), ("help", [ "push", "cow", "nothing" ]), ("look", None), ("look", [ "all" ]),
+    ("look", [ "box", "cow" ]), ("back", None), ("quit", None) ]
+WORDS = [ "pu", "lok", "hlp", "opt", "c", "bx", "trol", "nothing" ]
+
+# everything a mode answers to the queries, and how it resolves and suggests the words
+def answers(mode):
+    shown = [ mode.prompt ]
+    for verb, nouns in QUERIES:
+        result = mode.run_command(verb, nouns)
+        if type(result) == results.ChangeMode:
+            result = result.signature
+        shown.append(result)
+    for word in WORDS:
+        shown.append((mode.resolve_command(word), mode.suggest_commands(word), mode.resolve_object(word), mode.suggest_objects(word)))
+    return shown
+
+# a command which tries to change the objects it is handed
+def change_objects(owner, objects, targets=None):
+    objects["box"] = "A box changed for everyone."
+
+def test_templates_answer_as_built_modes(project_root):
+    game = GameManager(None, headless.HeadlessCommands(), False)
+    for template, owner in [ (GameManager.MAIN_MENU, game), (GameManager.OPTION_MENU, game), (WorldManager.ONLY_MODE, game.world_state) ]:
+        assert answers(template.new_mode(owner)) == answers(built_mode(template, owner))
+
+# one world's changes stay in its own mode
+def test_world_changes_stay_in_their_mode():
+    changed = WorldManager()
+    untouched = WorldManager()
+    changed.world.enemy_hp = 1
+    changed.modes["only"].run_command("open", [ "box" ])
+    changed.modes["only"].run_command("attack", [ "troll" ])
+
+    assert answers(untouched.modes["only"]) == answers(WorldManager.ONLY_MODE.new_mode(untouched))
+    assert changed.modes["only"].run_command("look", None) == [ "cow", "box", "corpse" ]
+
+# commands are handed their mode's objects read only, so one session can't change them for every other
+def test_shared_objects_are_read_only():
+    template = ModeTemplate("A test.", [ ("change", change_objects, None) ], [ ("box", "A box.", None) ])
+    with pytest.raises(TypeError):
+        template.new_mode(None).run_command("change", None)
+    assert template.new_mode(None).run_command("look", [ "all" ]) == { "box" : "A box." }
+
+# a loaded world's mode shows the changes its world was saved with
+def test_loaded_world_shows_its_changes():
+    changed = WorldManager()
+    changed.world.enemy_hp = 1
+    changed.modes["only"].run_command("open", [ "box" ])
+    changed.modes["only"].run_command("attack", [ "troll" ])
+
+    loaded = WorldManager()
+    loaded.load(changed.get_world_data())
+    assert answers(loaded.modes["only"]) == answers(changed.modes["only"])
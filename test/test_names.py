@@ -0,0 +1,25 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+import namemanager
+from bench_names import PLAYER_NAMES, fuzz_names, legacy_to_lower, legacy_clean_name, legacy_normalize, legacy_slug
+
+# Name Normalization Tests
+# the name manager against copies of the old to_lower, clean_name and hyphen loops
+
+FUZZ_NAMES = 5000
+
+def test_names_match_old_functions():
+    for name in PLAYER_NAMES + fuzz_names(FUZZ_NAMES):
+        assert namemanager.to_lower(name) == legacy_to_lower(name), name
+        assert namemanager.clean_name(name) == legacy_clean_name(name), name
+        assert namemanager.normalize_name(name) == legacy_normalize(name), name
+        assert namemanager.slug_name(name) == legacy_slug(name), name
+
+def test_repeated_names_are_cached():
+    namemanager.normalize_name.cache_clear()
+    for repeat in range(3):
+        for name in PLAYER_NAMES:
+            namemanager.normalize_name(name)
+    assert namemanager.normalize_name.cache_info().hits == 2 * len(PLAYER_NAMES)
@@ -0,0 +1,45 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+import textmanager
+import outputchannel
+from bench_output import TURNS, look_turn
+
+# Output Channel Tests
+# text buffered per turn reaches the frontend as it would written straight through, in fewer writes
+
+REPEATS = 50
+
+# plays every turn into a frontend, returning each write it was handed
+def play_turns(buffer_size):
+    writes = []
+    token = outputchannel.set_output(outputchannel.OutputChannel(writes.append, buffer_size))
+    try:
+        for repeat in range(REPEATS):
+            for turn in TURNS:
+                turn()
+                # the game waits on the user at the end of every turn
+                outputchannel.flush_output()
+    finally:
+        outputchannel.reset_output(token)
+    return writes
+
+def test_buffered_output_matches_unbuffered():
+    unbuffered = play_turns(1)
+    buffered = play_turns(outputchannel.OUTPUT_BUFFER_SIZE)
+    assert "".join(buffered) == "".join(unbuffered)
+    assert len(buffered) == REPEATS * len(TURNS)
+    assert len(unbuffered) > len(buffered)
+
+# headless runs read the same text back without sys.stdout
+def test_captured_output():
+    captured = outputchannel.CapturedOutput()
+    token = outputchannel.set_output(captured)
+    try:
+        look_turn()
+    finally:
+        outputchannel.reset_output(token)
+    assert captured.take_text() == textmanager.render_text([ "cow", "box", "troll", "corpse", "potato", "sword", "lamp", "door", "rug", "chest" ]) + \
+        textmanager.render_text("There is nothing like \"dragon\" here.\nTry typing \"look\" to see what is around.")
+    assert captured.take_text() == ""
@@ -0,0 +1,74 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+import pytest
+
+import results
+import headless
+from mode import Mode
+from gamemanager import GameManager
+from worldmanager import WorldManager
+from bench_results import legacy_dispatch, typed_dispatch
+
+# Results Tests
+# legacy string returns are read as the results they stood for, and results are handled by their type
+
+LEGACY_CASES = [
+    (f"{Mode.CHANGE_MODE}options", results.ChangeMode, "options"),
+    (f"{WorldManager.GAME_COMMAND}{WorldManager.SAVE_SIGNATURE}", results.WorldCommand, WorldManager.SAVE_SIGNATURE),
+    ("\n", results.Silent, None),
+    ("You open the box.", results.Text, "You open the box."),
+    # too short to carry a signature, so it was always shown as text
+    (f"{Mode.CHANGE_MODE}x", results.Text, f"{Mode.CHANGE_MODE}x"),
+    ([ "box", "key" ], results.Listing, [ "box", "key" ]),
+    ({ "box" : None }, results.Listing, { "box" : None }) ]
+
+@pytest.mark.parametrize("mode_return, result_type, value", LEGACY_CASES)
+def test_legacy_returns(mode_return, result_type, value):
+    result = results.to_result(mode_return)
+    assert type(result) == result_type
+    if value != None:
+        assert getattr(result, result_type.__slots__[0]) == value
+
+# a typed result is never read again, even when its text looks like a prefix
+def test_typed_results_are_kept():
+    text = results.Text(f"{Mode.CHANGE_MODE}{Mode.QUIT_SIGNATURE}")
+    assert results.to_result(text) is text
+
+# None is kept to mean the command was not understood
+def test_none_is_kept():
+    assert results.to_result(None) == None
+
+# results read from the same string are handed out again, so none of them can be changed
+def test_results_cant_be_changed():
+    result = results.to_result("You open the box.")
+    assert results.to_result("You open the box.") is result
+    with pytest.raises(AttributeError):
+        result.text = "You close the box."
+    with pytest.raises(AttributeError):
+        del result.text
+    assert results.to_result("You open the box.").text == "You open the box."
+
+# the old prefix checks and dispatch on the result type handle the same returns the same way
+def test_dispatch_matches_prefix_checks():
+    legacy_counts = { "text" : 0, "world" : 0, "change" : 0 }
+    typed_counts = { "text" : 0, "world" : 0, "change" : 0 }
+    for mode_return, result_type, value in LEGACY_CASES:
+        legacy_dispatch(mode_return, legacy_counts)
+        typed_dispatch(mode_return, typed_counts)
+        typed_dispatch(results.to_result(mode_return), typed_counts)
+    assert { key : count * 2 for key, count in legacy_counts.items() } == typed_counts
+
+class LoudText(results.Text):
+    __slots__ = ()
+
+class Unknown(results.Result):
+    __slots__ = ()
+
+# results derived from a handled type are handled as that type, and results of no known type have no handler
+def test_handlers_by_type(project_root):
+    game = GameManager(None, headless.HeadlessCommands(), False)
+    assert game._result_handler(LoudText) == GameManager.show_text
+    assert game._result_handler(results.Text) == GameManager.show_text
+    assert game._result_handler(Unknown) == None
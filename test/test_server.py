@@ -0,0 +1,53 @@
+# Text Adventure
+# 06-10-2024
+# Brian Morris
+
+import asyncio
+
+import filemanager
+import gameserver
+from bench_server import connect, close_server
+
+# Game Server Tests
+# players on one server share its saves without losing each other's, and can't change what the others share
+
+# plays lines as one player, returning the text of the last turn
+async def play(port, lines):
+    client = await connect(port)
+    await client.read_turn()
+    text = None
+    for line in lines:
+        text, elapsed = await client.send(line)
+    await client.close()
+    return text
+
+async def play_together(players):
+    server = gameserver.GameServer()
+    listener = await server.start_tcp()
+    port = listener.sockets[0].getsockname()[1]
+    try:
+        return await asyncio.gather(*[ play(port, lines) for lines in players ])
+    finally:
+        await close_server(server, listener)
+
+def test_players_share_saves(project_root):
+    asyncio.run(play_together([
+        [ "new", "ann", "yes", "push cow", "save", "quit", "yes", "quit" ],
+        [ "new", "bob", "yes", "save", "quit", "yes", "quit" ] ]))
+
+    catalog = filemanager.read_catalog()
+    assert sorted(catalog.saves.keys()) == [ "ann", "bob" ]
+    assert filemanager.locate_file("ann") != None
+    assert filemanager.locate_file("bob") != None
+
+def test_players_cant_change_shared_files(project_root):
+    wiped, reset, changed = asyncio.run(play_together([
+        [ "options", "wipe" ],
+        [ "options", "reset" ],
+        [ "options", "set welcome no", "back", "quit" ] ]))
+
+    assert "other players share it" in wiped
+    assert "other players share them" in reset
+    # options last only as long as the player is connected
+    config = filemanager.read_data(filemanager.CURRENT_CONFIG, gameserver.GameManager.Configuration)
+    assert config.display_welcome == True